@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Benchmark agent memory recall at task start.
+
+Fills a throwaway AgentMemory with N memories (default 10,000) of random
+embeddings spread over the last year, then times the load of the float16
+vectors and recall under a token budget.
+
+    python benchmarks/bench_agent_memory.py [--memories 10000] [--dim 768] [--budget 800]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lifai.modules.agent_workspace.memory_store import AgentMemory
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--memories', type=int, default=10_000)
+    parser.add_argument('--dim', type=int, default=768)
+    parser.add_argument('--budget', type=int, default=800)
+    parser.add_argument('--runs', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        memory = AgentMemory(Path(tmp_dir))
+        start = time.perf_counter()
+        for offset in range(0, args.memories, 1000):
+            count = min(1000, args.memories - offset)
+            entries = [{'kind': 'fact', 'text': f"memory {offset + i} " + 'word ' * 40} for i in range(count)]
+            memory.add(entries, rng.standard_normal((count, args.dim)), 'bench')
+        # Spread creation times over the last year so recency weighting matters
+        now = time.time()
+        memory.conn.execute("UPDATE memories SET created_at = ? - (id * 37 % 365) * 86400", (now,))
+        memory.conn.commit()
+        print(f"Stored {args.memories:,} memories in {time.perf_counter() - start:.1f}s: {memory.stats()}")
+
+        reopened = AgentMemory(Path(tmp_dir))
+        start = time.perf_counter()
+        reopened.load()
+        print(f"Load (float16 -> float32 working copy): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        timings = []
+        for query in rng.standard_normal((args.runs, args.dim)):
+            start = time.perf_counter()
+            reopened.recall(query + reopened.matrix[rng.integers(reopened.count)] * 20, args.budget)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f"\nrecall budget={args.budget}: p50 {statistics.median(timings):.2f} ms, "
+              f"p95 {p95:.2f} ms, max {timings[-1]:.2f} ms")
+
+if __name__ == '__main__':
+    main()
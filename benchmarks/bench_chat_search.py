@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Benchmark chat history search over a generated archive.
+
+Builds a throwaway ChatSessionStore with N messages (default 1,000,000)
+spread over sessions, then times ChatSessionStore.search for common, rare,
+multi-term and prefix queries.
+
+    python benchmarks/bench_chat_search.py [--messages 1000000] [--db path]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lifai.modules.AI_chat.session_store import ChatSessionStore
+
+COMMON_WORDS = (
+    "the model response text please help with this file error log update "
+    "python code data query result window settings prompt chat message"
+).split()
+RARE_WORDS = [f"term{i:05d}" for i in range(20000)]
+
+def generate_archive(store: ChatSessionStore, total: int, per_session: int = 500, seed: int = 42):
+    rng = random.Random(seed)
+    written = 0
+    start = time.perf_counter()
+    while written < total:
+        session_id = store.create_session(title=f"Session {written // per_session}")
+        count = min(per_session, total - written)
+        messages = []
+        for i in range(count):
+            words = rng.choices(COMMON_WORDS, k=rng.randint(8, 40))
+            words.append(rng.choice(RARE_WORDS))
+            messages.append({'text': ' '.join(words), 'is_user': i % 2 == 0})
+        store.append_messages(session_id, messages)
+        written += count
+        if written % 100000 == 0:
+            print(f"  {written:,} messages ({time.perf_counter() - start:.1f}s)")
+    return time.perf_counter() - start
+
+def time_query(store: ChatSessionStore, query: str, runs: int):
+    timings = []
+    results = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        results = len(store.search(query))
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return statistics.median(timings), p95, timings[-1], results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=1_000_000)
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--db', help="reuse/keep the archive at this path")
+    args = parser.parse_args()
+
+    tmp_dir = None
+    if args.db:
+        db_path = Path(args.db)
+    else:
+        tmp_dir = tempfile.TemporaryDirectory()
+        db_path = Path(tmp_dir.name) / 'bench_chat.db'
+
+    store = ChatSessionStore(db_path)
+    existing = store.conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+    if existing < args.messages:
+        print(f"Generating {args.messages - existing:,} messages...")
+        elapsed = generate_archive(store, args.messages - existing)
+        print(f"Generated in {elapsed:.1f}s")
+    print(f"Archive: {store.conn.execute('SELECT COUNT(*) FROM messages').fetchone()[0]:,} messages, "
+          f"FTS5={'on' if store.fts_enabled else 'off'}, {os.path.getsize(db_path) / 1e6:.0f} MB")
+
+    queries = ["python", "term01234", "error log", "python term01234", "wind*", "windo*", "file update result"]
+    print(f"\n{'query':<22}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'hits':>8}")
+    for query in queries:
+        p50, p95, worst, hits = time_query(store, query, args.runs)
+        print(f"{query:<22}{p50:>10.2f}{p95:>10.2f}{worst:>10.2f}{hits:>8}")
+
+    store.close()
+    if tmp_dir:
+        tmp_dir.cleanup()
+
+if __name__ == '__main__':
+    main()
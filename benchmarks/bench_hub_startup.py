@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Benchmark hub startup: time to first paint, memory, and input-to-paint latency.
+
+Each run starts the hub the way run.py does, in a fresh process, and
+reports the wall time from launching the process to the hub's first paint,
+the process's resident memory at that point, and the latency from posting
+a key press (Tab, which moves focus) to the next paint once startup has
+settled. The hub is left without closing, so its settings file is not
+rewritten.
+
+    python benchmarks/bench_hub_startup.py [--runs 5] [--keys 20]
+
+Set QT_QPA_PLATFORM=offscreen to run without a display.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def rss_mb() -> float:
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    # Peak rather than current, where /proc isn't available (KB on Linux, bytes on macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+def child(keys: int):
+    sys.path.append(ROOT)
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QEvent, QObject, QTimer, Qt
+    from PyQt6.QtGui import QKeyEvent
+
+    qt_app = QApplication.instance() or QApplication(sys.argv)
+    from lifai.core.app_hub import LifAiHub
+    hub = LifAiHub()
+    result = {'latencies_ms': []}
+    state = {'posted': None}
+
+    def finish():
+        print('RESULT ' + json.dumps(result), flush=True)
+        # Skip closeEvent, which saves the settings file
+        os._exit(0)
+
+    def press_key():
+        if len(result['latencies_ms']) >= keys:
+            finish()
+        state['posted'] = time.perf_counter()
+        target = QApplication.focusWidget() or hub
+        QApplication.postEvent(target, QKeyEvent(QEvent.Type.KeyPress, Qt.Key.Key_Tab,
+                                                 Qt.KeyboardModifier.NoModifier))
+        # A key that repaints nothing counts as missed
+        QTimer.singleShot(1000, lambda posted=state['posted']: missed(posted))
+
+    def missed(posted):
+        if state['posted'] == posted:
+            state['posted'] = None
+            result.setdefault('missed', 0)
+            result['missed'] += 1
+            result['latencies_ms'].append(None)
+            QTimer.singleShot(50, press_key)
+
+    class PaintWatcher(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint:
+                now = time.perf_counter()
+                if 'painted_at' not in result:
+                    result['painted_at'] = time.time()
+                    result['rss_mb'] = rss_mb()
+                    # Let deferred startup work (prompt watcher, model lists) run first
+                    QTimer.singleShot(1000, press_key)
+                elif state['posted'] is not None:
+                    result['latencies_ms'].append((now - state['posted']) * 1000)
+                    state['posted'] = None
+                    QTimer.singleShot(50, press_key)
+            return False
+
+    watcher = PaintWatcher()
+    qt_app.installEventFilter(watcher)
+    QTimer.singleShot(30000, finish)
+    hub.run()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--keys', type=int, default=20)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.keys)
+        return
+
+    startups, memory, latencies = [], [], []
+    for run in range(args.runs):
+        launched = time.time()
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', '--keys', str(args.keys)],
+                                cwd=ROOT, capture_output=True, text=True, timeout=120).stdout
+        line = next((line for line in output.splitlines() if line.startswith('RESULT ')), None)
+        if line is None:
+            print(f"run {run + 1}: the hub did not start")
+            continue
+        result = json.loads(line[len('RESULT '):])
+        startups.append((result['painted_at'] - launched) * 1000)
+        memory.append(result['rss_mb'])
+        latencies.extend(value for value in result['latencies_ms'] if value is not None)
+        print(f"run {run + 1}: first paint {startups[-1]:.0f} ms, RSS {memory[-1]:.0f} MB"
+              + (f", {result['missed']} keys without a repaint" if result.get('missed') else ''))
+
+    if not startups:
+        return
+    print(f"{'launch to first paint':>24}: median {statistics.median(startups):.0f} ms, max {max(startups):.0f} ms")
+    print(f"{'RSS at first paint':>24}: median {statistics.median(memory):.0f} MB")
+    if latencies:
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"{'key press to paint':>24}: p50 {statistics.median(latencies):.2f} ms, p95 {p95:.2f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Benchmark loading and rendering the prompt library.
+
+Writes N templates (default 1,000) as a JSON prompt store and as the legacy
+saved_prompts.py module, then times PromptStore.load (parse + compile every
+template) against exec() of the module, and per-call rendering against
+str.format.
+
+    python benchmarks/bench_prompt_store.py [--prompts 1000] [--runs 20]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lifai.config.prompt_store import PromptStore, write_prompt_file
+
+def make_templates(count: int):
+    body = "Act as a professional editor. Review the text below and improve clarity, tone and structure. " * 8
+    return {f"Prompt {i:04d}": f"{body}\n\nInput text:\n{{text}}\n\nProvide the result only. ({i})" for i in range(count)}
+
+def timed(func, runs: int):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), max(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--prompts', type=int, default=1000)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    templates = make_templates(args.prompts)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = os.path.join(tmp_dir, 'prompts.json')
+        legacy_path = os.path.join(tmp_dir, 'saved_prompts.py')
+        write_prompt_file(json_path, templates)
+        with open(legacy_path, 'w', encoding='utf-8') as f:
+            f.write("llm_prompts = {\n")
+            for name, template in templates.items():
+                f.write(f"    \"{name}\": \"\"\"{template}\"\"\",\n")
+            f.write("}\n")
+        print(f"{args.prompts:,} templates, {os.path.getsize(json_path) / 1024:.0f} KB as JSON")
+
+        def load_legacy():
+            namespace = {}
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                exec(f.read(), namespace)
+
+        p50, worst = timed(load_legacy, args.runs)
+        print(f"{'exec saved_prompts.py':>28}: p50 {p50:7.2f} ms, max {worst:7.2f} ms")
+        p50, worst = timed(lambda: PromptStore(json_path).load(), args.runs)
+        print(f"{'PromptStore.load (compiled)':>28}: p50 {p50:7.2f} ms, max {worst:7.2f} ms")
+
+        store = PromptStore(json_path).load()
+        text = "Some selected text to improve. " * 20
+        names = list(templates)
+        p50, _ = timed(lambda: [templates[name].format(text=text) for name in names], args.runs)
+        print(f"\n{'str.format':>28}: {p50 * 1000 / len(names):7.2f} us per render")
+        p50, _ = timed(lambda: [store.render(name, text=text) for name in names], args.runs)
+        print(f"{'CompiledPrompt.render':>28}: {p50 * 1000 / len(names):7.2f} us per render")
+
+        p50, worst = timed(store.save, args.runs)
+        print(f"\n{'PromptStore.save (atomic)':>28}: p50 {p50:7.2f} ms, max {worst:7.2f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Benchmark knowledge base retrieval over a generated vector index.
+
+Builds a throwaway VectorIndex with N chunks (default 100,000) of clustered
+random embeddings, then times top-k search and measures recall against an
+exact scan of the same vectors.
+
+    python benchmarks/bench_rag_search.py [--chunks 100000] [--dim 768] [--nprobe 24]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lifai.modules.rag.vector_index import VectorIndex
+
+def clustered_vectors(rng, count: int, dim: int, centers: np.ndarray, spread: float = 0.8) -> np.ndarray:
+    """Embedding-like data: points scattered around unit-length topic centers"""
+    topics = rng.integers(0, len(centers), size=count)
+    noise = rng.standard_normal((count, dim)).astype(np.float32) * (spread / np.sqrt(dim))
+    return (centers[topics] + noise).astype(np.float32)
+
+def build_index(index: VectorIndex, total: int, dim: int, rng, centers, per_file: int = 200) -> float:
+    start = time.perf_counter()
+    for number, offset in enumerate(range(0, total, per_file)):
+        count = min(per_file, total - offset)
+        vectors = clustered_vectors(rng, count, dim, centers)
+        texts = [f"chunk {offset + i}" for i in range(count)]
+        index.replace_file(f"/bench/file{number:06d}.txt", f"{number:064x}", 0, 0.0, texts, vectors, 'bench')
+    if index.needs_rebuild():
+        index.rebuild()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chunks', type=int, default=100_000)
+    parser.add_argument('--dim', type=int, default=768)
+    parser.add_argument('--topics', type=int, default=1000)
+    parser.add_argument('--nprobe', type=int, default=VectorIndex.DEFAULT_NPROBE)
+    parser.add_argument('--runs', type=int, default=200)
+    parser.add_argument('-k', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    centers = rng.standard_normal((args.topics, args.dim)).astype(np.float32)
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index = VectorIndex(Path(tmp_dir))
+        print(f"Building index with {args.chunks:,} chunks of dim {args.dim}...")
+        elapsed = build_index(index, args.chunks, args.dim, rng, centers)
+        print(f"Built in {elapsed:.1f}s: {index.stats()}")
+
+        queries = clustered_vectors(rng, args.runs, args.dim, centers)
+        vectors = np.asarray(index.vectors[:index.count])
+        timings = []
+        recall = []
+        for query in queries:
+            start = time.perf_counter()
+            results = index.search(query, args.k, nprobe=args.nprobe)
+            timings.append((time.perf_counter() - start) * 1000)
+
+            normalized = query / np.linalg.norm(query)
+            kth_best = np.partition(vectors @ normalized, -args.k)[-args.k]
+            found = np.array([result['score'] for result in results])
+            recall.append((found >= kth_best - 1e-6).sum() / args.k)
+
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f"\nsearch k={args.k} nprobe={args.nprobe}: p50 {statistics.median(timings):.2f} ms, "
+              f"p95 {p95:.2f} ms, max {timings[-1]:.2f} ms, recall@{args.k} {np.mean(recall):.3f}")
+        index.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark SearXNG result page parsing.
+
+Times the previous approach (BeautifulSoup with html.parser over the whole
+page and a cascade of CSS selectors) against the precompiled extractor in
+searxng_parser, and checks that both find the same results. Uses saved
+result pages from --pages (e.g. "Save page as" from a browser, HTML only)
+or, by default, generated pages in SearXNG's simple theme markup.
+
+    python benchmarks/bench_searxng_parse.py [--pages DIR] [--results 20] [--runs 50]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lifai.modules.agent_workspace.searxng_parser import parse_results_html, parse_results_soup
+
+WORDS = ("search engine privacy result page query python install guide release notes "
+         "performance benchmark review documentation tutorial example forum answer").split()
+
+def sentence(rng, words: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+def generated_page(rng, results: int) -> str:
+    """A page shaped like SearXNG's simple theme: head assets, form, results, sidebar"""
+    head = ''.join(f'<link rel="stylesheet" href="/static/themes/simple/css/{i}.css">' for i in range(10))
+    head += '<style>' + '.x{color:#333;margin:0 auto;padding:1rem}' * 800 + '</style>'
+    articles = []
+    for i in range(results):
+        url = f"https://site{i}.example.org/{sentence(rng, 3).replace(' ', '/')}?id={i}&amp;lang=en"
+        articles.append(
+            f'<article class="result result-default category-general">'
+            f'<a href="{url}" class="url_header" rel="noreferrer"><div class="url_wrapper">'
+            f'<span class="url_o1">site{i}.example.org</span></div></a>'
+            f'<h3><a href="{url}" rel="noreferrer">{sentence(rng, 4)} '
+            f'<span class="highlight">query</span> {sentence(rng, 3)}</a></h3>'
+            f'<p class="content">{sentence(rng, 30)} <span class="highlight">query</span> {sentence(rng, 10)}</p>'
+            f'<div class="engines"><span>duckduckgo</span><span>brave</span>'
+            f'<a href="https://web.archive.org/web/{url}" class="cache_link">cached</a></div>'
+            f'</article>'
+        )
+    sidebar = ''.join(f'<li><a href="/search?q={sentence(rng, 2)}">{sentence(rng, 3)}</a></li>' for _ in range(30))
+    return (
+        f'<!DOCTYPE html><html><head><title>query - SearXNG</title>{head}</head><body>'
+        f'<form id="search" method="GET" action="/search"><input name="q" value="query"></form>'
+        f'<div id="results" class="only_template_images"><div id="sidebar"><ul>{sidebar}</ul></div>'
+        f'<div id="urls" role="main">{"".join(articles)}</div></div>'
+        f'<footer><p>Powered by searxng</p>{sentence(rng, 200)}</footer></body></html>'
+    )
+
+def time_parser(parse, pages, count: int, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        for page in pages:
+            start = time.perf_counter()
+            parse(page, count)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=Path, help='directory of saved SearXNG result pages (*.html)')
+    parser.add_argument('--results', type=int, default=20, help='results per generated page')
+    parser.add_argument('--runs', type=int, default=50)
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = [path.read_text(encoding='utf-8', errors='replace') for path in sorted(args.pages.glob('*.htm*'))]
+        if not pages:
+            parser.error(f"No .html files in {args.pages}")
+    else:
+        rng = random.Random(42)
+        pages = [generated_page(rng, args.results) for _ in range(5)]
+    print(f"{len(pages)} pages, {statistics.mean(len(page) for page in pages) / 1024:.0f} KB average")
+
+    count = 1000
+    for page in pages:
+        before = parse_results_soup(page, count)
+        after = parse_results_html(page, count)
+        if [result['link'] for result in before] != [result['link'] for result in after]:
+            print(f"warning: extractors disagree ({len(before)} vs {len(after)} results)")
+
+    for name, parse in (("BeautifulSoup, full page", parse_results_soup),
+                        ("compiled extractor", parse_results_html)):
+        timings = sorted(time_parser(parse, pages, count, args.runs))
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f"{name:>25}: p50 {statistics.median(timings):7.2f} ms, p95 {p95:7.2f} ms per page")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from lifai.config.prompt_store import PromptStore
+from lifai.utils.logger_utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+ADDED = 'added'
+UPDATED = 'updated'
+REMOVED = 'removed'
+RENAMED = 'renamed'
+
+@dataclass(frozen=True)
+class PromptChange:
+    """One change to the prompt library.
+
+    ``index`` is the prompt's position in the library after the change
+    (``None`` for removals). ``version`` increases by one per change, so a
+    subscriber that sees a gap knows it missed something and can resync.
+    """
+    kind: str
+    name: str
+    version: int
+    index: Optional[int] = None
+    old_name: Optional[str] = None
+
+class PromptRegistry:
+    """Publishes changes to the prompt library as fine-grained events.
+
+    Subscribers are called with the list of ``PromptChange`` events of one
+    update, on the thread that made it, and apply just that delta (see
+    ``apply_to_combo``) instead of rebuilding their prompt lists.
+    """
+
+    def __init__(self, store: PromptStore):
+        self.store = store
+        self.version = 0
+        self.lock = threading.RLock()
+        self.subscribers: List[Callable[[List[PromptChange]], None]] = []
+        self.file_prompts: Dict[str, List[str]] = {}
+
+    def subscribe(self, callback: Callable[[List[PromptChange]], None]):
+        if callback not in self.subscribers:
+            self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[List[PromptChange]], None]):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def names(self) -> List[str]:
+        return self.store.names()
+
+    def diff(self, old: Dict[str, str], new: Dict[str, str]) -> List[tuple]:
+        """(kind, name, old_name) changes turning ``old`` into ``new``.
+
+        A prompt that disappears while a new one with the identical template
+        appears is reported as a rename.
+        """
+        removed = [name for name in old if name not in new]
+        added = [name for name in new if name not in old]
+        changes = []
+        for name in list(added):
+            match = next((old_name for old_name in removed if old[old_name] == new[name]), None)
+            if match is not None:
+                removed.remove(match)
+                added.remove(name)
+                changes.append((RENAMED, name, match))
+        changes.extend((REMOVED, name, None) for name in removed)
+        changes.extend((ADDED, name, None) for name in added)
+        changes.extend((UPDATED, name, None) for name in new if name in old and old[name] != new[name])
+        return changes
+
+    def replace_all(self, templates: Dict[str, str], save: bool = True) -> List[PromptChange]:
+        """Make ``templates`` the library and publish what changed"""
+        with self.lock:
+            old = dict(self.store.templates)
+            changes = self.diff(old, templates)
+            if not changes and list(old) == list(templates):
+                return []
+            self.store.replace_all(templates)
+            if save:
+                self.store.save()
+            return self._publish(changes)
+
+    def update(self, templates: Dict[str, str], removed: List[str] = (), save: bool = True) -> List[PromptChange]:
+        """Add or update ``templates`` and drop ``removed``, keeping other prompts"""
+        with self.lock:
+            merged = {name: template for name, template in self.store.templates.items() if name not in removed}
+            merged.update(templates)
+            return self.replace_all(merged, save=save)
+
+    def apply_file(self, path: str, templates: Optional[Dict[str, str]]) -> List[PromptChange]:
+        """Take in the prompts of one shared prompt file (``None`` if it was deleted).
+
+        Prompts the file no longer contains are removed; shared prompts are
+        kept out of the library file. A shared prompt overrides a local
+        prompt of the same name, which is still saved and comes back when
+        the shared prompt is removed.
+        """
+        templates = templates or {}
+        with self.lock:
+            store = self.store
+            removed = [name for name in self.file_prompts.pop(path, [])
+                       if name not in templates and store.external.get(name) == path]
+            restored = {}
+            for name in removed:
+                store.external.pop(name, None)
+                if name in store.shadowed:
+                    restored[name] = store.shadowed.pop(name)
+            for name in templates:
+                if name not in store.external and name in store.templates:
+                    store.shadowed[name] = store.templates[name]
+                store.external[name] = path
+            if templates:
+                self.file_prompts[path] = list(templates)
+            return self.update({**restored, **templates}, [name for name in removed if name not in restored],
+                               save=False)
+
+    def _publish(self, changes: List[tuple]) -> List[PromptChange]:
+        if not changes:
+            # Only the order changed; open lists keep theirs until the next restart
+            return []
+        names = self.store.names()
+        positions = {name: i for i, name in enumerate(names)}
+        # Removals first, then the rest in library order, so indexes are valid when applied in sequence
+        changes = sorted(changes, key=lambda change: (change[0] != REMOVED, positions.get(change[1], -1)))
+        events = []
+        for kind, name, old_name in changes:
+            self.version += 1
+            events.append(PromptChange(kind, name, self.version, positions.get(name), old_name))
+        logger.info(f"Prompt library v{self.version}: " + ', '.join(f"{e.kind} '{e.name}'" for e in events))
+
+        for callback in list(self.subscribers):
+            try:
+                callback(events)
+            except Exception as e:
+                logger.error(f"Error notifying prompt update: {e}")
+        return events
+
+def apply_to_combo(combo, changes: List[PromptChange], names: List[str], version: int) -> int:
+    """Apply prompt changes to a combo box of prompt names, keeping its selection.
+
+    ``version`` is the last version the combo has seen; if ``changes`` don't
+    follow on from it, the combo is rebuilt from ``names``. Returns the new
+    version.
+    """
+    if not changes:
+        return version
+    if changes[0].version != version + 1:
+        current = combo.currentText()
+        combo.clear()
+        combo.addItems(names)
+        index = combo.findText(current)
+        combo.setCurrentIndex(max(index, 0))
+        return changes[-1].version
+
+    for change in changes:
+        if change.kind == REMOVED:
+            index = combo.findText(change.name)
+            if index >= 0:
+                combo.removeItem(index)
+        elif change.kind == RENAMED:
+            index = combo.findText(change.old_name)
+            if index >= 0:
+                combo.setItemText(index, change.name)
+        elif change.kind == ADDED:
+            combo.insertItem(min(change.index, combo.count()), change.name)
+    return changes[-1].version
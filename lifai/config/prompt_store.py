@@ -0,0 +1,211 @@
+import ast
+import json
+import os
+import re
+import tempfile
+import threading
+from typing import Dict, List, Optional
+from lifai.utils.logger_utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+ALLOWED_PLACEHOLDERS = frozenset({'text'})
+REQUIRED_PLACEHOLDERS = frozenset({'text'})
+STORE_VERSION = 1
+
+# {{ and }} are escaped braces (as in str.format); {name} is a placeholder
+TOKEN_RE = re.compile(r'\{\{|\}\}|\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+class PromptError(ValueError):
+    """A prompt template or prompt file that can't be used"""
+
+class CompiledPrompt:
+    """A template parsed once into literal parts and placeholders.
+
+    Rendering is a join over precomputed parts, and unlike ``str.format``
+    braces that don't form a known placeholder (JSON examples, code) are
+    kept as they are instead of raising.
+    """
+    __slots__ = ('name', 'template', 'placeholders', 'parts')
+
+    def __init__(self, name: str, template: str, strict: bool = True):
+        self.name = name
+        self.template = template
+        # Literal text and placeholder names alternate: [literal, name, literal, ..., literal]
+        parts = []
+        literal = []
+        position = 0
+        for match in TOKEN_RE.finditer(template):
+            literal.append(template[position:match.start()])
+            position = match.end()
+            field = match.group(1)
+            if field is None:
+                literal.append(match.group(0)[0])
+            elif field in ALLOWED_PLACEHOLDERS:
+                parts.append(''.join(literal))
+                parts.append(field)
+                literal = []
+            elif strict:
+                raise PromptError(f"Prompt '{name}' uses unknown placeholder {{{field}}}; "
+                                  f"available: {', '.join('{%s}' % p for p in sorted(ALLOWED_PLACEHOLDERS))}")
+            else:
+                literal.append(match.group(0))
+        literal.append(template[position:])
+        parts.append(''.join(literal))
+
+        self.parts = tuple(parts)
+        self.placeholders = tuple(parts[1::2])
+        missing = REQUIRED_PLACEHOLDERS - set(self.placeholders)
+        if missing and strict:
+            raise PromptError(f"Prompt '{name}' must contain " + ', '.join('{%s}' % p for p in sorted(missing)))
+
+    def render(self, **values) -> str:
+        parts = self.parts
+        if len(parts) == 3:
+            # The common case: one {text} between a prefix and a suffix
+            return parts[0] + str(values[parts[1]]) + parts[2]
+        return ''.join(str(values[part]) if i % 2 else part for i, part in enumerate(parts))
+
+    def __repr__(self):
+        return f"CompiledPrompt({self.name!r}, placeholders={self.placeholders})"
+
+def parse_python_prompts(source: str) -> Dict[str, str]:
+    """Read the ``llm_prompts = {...}`` dict of a legacy prompts module without executing it"""
+    tree = ast.parse(source)
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and any(isinstance(target, ast.Name) and target.id == 'llm_prompts'
+                                                 for target in node.targets)):
+            try:
+                prompts = ast.literal_eval(node.value)
+            except ValueError as e:
+                raise PromptError(f"llm_prompts must be a plain dict of strings: {e}")
+            if not isinstance(prompts, dict) or not all(isinstance(k, str) and isinstance(v, str)
+                                                       for k, v in prompts.items()):
+                raise PromptError("llm_prompts must map prompt names to template strings")
+            return prompts
+    raise PromptError("No llm_prompts dict found")
+
+def read_prompt_file(path: str) -> Dict[str, str]:
+    """Templates from a prompt file: the JSON store format, an editor export, or a legacy .py module"""
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    if path.endswith('.py'):
+        return parse_python_prompts(source)
+    try:
+        data = json.loads(source)
+    except ValueError as e:
+        raise PromptError(f"Invalid JSON in {os.path.basename(path)}: {e}")
+    prompts = data.get('prompts', data.get('templates')) if isinstance(data, dict) else None
+    if not isinstance(prompts, dict) or not all(isinstance(k, str) and isinstance(v, str)
+                                               for k, v in prompts.items()):
+        raise PromptError(f"{os.path.basename(path)} has no prompts mapping")
+    return prompts
+
+def write_prompt_file(path: str, templates: Dict[str, str]):
+    """Write templates as JSON atomically: a temp file in the same directory replaces the target"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.prompts-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'version': STORE_VERSION, 'prompts': templates}, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class PromptStore:
+    """The prompt library: templates in a JSON file, compiled on load.
+
+    ``templates`` is an ordered name -> template dict that callers may read
+    directly; changes go through ``set``/``remove``/``replace_all`` so the
+    compiled renderers stay in sync, and ``save`` writes the file atomically.
+    If the JSON file doesn't exist yet, a legacy ``saved_prompts.py`` is
+    migrated (parsed with ``ast``, never executed). Prompts listed in
+    ``external`` (name -> source file) come from the shared prompt folder
+    and are not written to the library file. A shared prompt that replaced
+    a local one keeps the local template in ``shadowed``; that is what gets
+    saved, and it comes back when the shared prompt goes away.
+    """
+
+    def __init__(self, path: str, legacy_path: Optional[str] = None, defaults: Optional[Dict[str, str]] = None):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.defaults = defaults or {}
+        self.lock = threading.RLock()
+        self.templates: Dict[str, str] = {}
+        self.compiled: Dict[str, CompiledPrompt] = {}
+        self.external: Dict[str, str] = {}
+        self.shadowed: Dict[str, str] = {}
+
+    def load(self) -> 'PromptStore':
+        with self.lock:
+            templates = None
+            try:
+                if os.path.exists(self.path):
+                    templates = read_prompt_file(self.path)
+                elif self.legacy_path and os.path.exists(self.legacy_path):
+                    templates = read_prompt_file(self.legacy_path)
+                    write_prompt_file(self.path, templates)
+                    logger.info(f"Migrated {self.legacy_path} to {self.path}")
+            except (OSError, PromptError, SyntaxError) as e:
+                logger.error(f"Error loading prompts from {self.path}: {e}")
+            self._replace(templates if templates is not None else dict(self.defaults))
+        return self
+
+    def _replace(self, templates: Dict[str, str]):
+        compiled = {}
+        for name, template in templates.items():
+            try:
+                compiled[name] = CompiledPrompt(name, template)
+            except PromptError as e:
+                # Keep the prompt usable; unknown placeholders are rendered literally
+                logger.warning(str(e))
+                compiled[name] = CompiledPrompt(name, template, strict=False)
+        self.templates.clear()
+        self.templates.update(templates)
+        self.compiled = compiled
+
+    def names(self) -> List[str]:
+        return list(self.templates)
+
+    def get(self, name: str) -> Optional[CompiledPrompt]:
+        return self.compiled.get(name)
+
+    def render(self, name: str, **values) -> str:
+        prompt = self.compiled.get(name)
+        if prompt is None:
+            raise KeyError(f"Unknown prompt '{name}'")
+        return prompt.render(**values)
+
+    def set(self, name: str, template: str) -> CompiledPrompt:
+        """Add or update a prompt; raises PromptError for an invalid template"""
+        prompt = CompiledPrompt(name, template)
+        with self.lock:
+            self.templates[name] = template
+            self.compiled[name] = prompt
+        return prompt
+
+    def remove(self, name: str):
+        with self.lock:
+            self.templates.pop(name, None)
+            self.compiled.pop(name, None)
+            self.external.pop(name, None)
+            self.shadowed.pop(name, None)
+
+    def replace_all(self, templates: Dict[str, str]):
+        with self.lock:
+            self._replace(dict(templates))
+            for name in [name for name in self.external if name not in self.templates]:
+                del self.external[name]
+            for name in [name for name in self.shadowed if name not in self.external]:
+                del self.shadowed[name]
+
+    def save(self):
+        with self.lock:
+            write_prompt_file(self.path, {name: self.shadowed.get(name, template)
+                                          for name, template in self.templates.items()
+                                          if name not in self.external or name in self.shadowed})
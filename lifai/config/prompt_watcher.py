@@ -0,0 +1,187 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+from typing import Dict, Optional, Set
+from PyQt6.QtCore import QObject, pyqtSignal
+from lifai.config.prompt_store import PromptError, read_prompt_file
+from lifai.utils.logger_utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+PROMPT_FILE_SUFFIXES = ('.json', '.py')
+
+def is_prompt_file(name: str) -> bool:
+    # Editors and atomic writers use hidden temp files; only the final name counts
+    return name.endswith(PROMPT_FILE_SUFFIXES) and not name.startswith(('.', '~'))
+
+class InotifySource:
+    """Changed file names in a directory from Linux inotify (through libc, no extra dependency)"""
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_DELETE_SELF = 0x400
+    IN_MOVE_SELF = 0x800
+    IN_IGNORED = 0x8000
+    IN_NONBLOCK = os.O_NONBLOCK
+    IN_CLOEXEC = 0o2000000
+    EVENT = struct.Struct('iIII')
+
+    def __init__(self, directory: str):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = (self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_FROM | self.IN_MOVED_TO |
+                self.IN_CREATE | self.IN_DELETE | self.IN_DELETE_SELF | self.IN_MOVE_SELF)
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"inotify_add_watch failed for {directory}")
+        self.directory_gone = False
+
+    def poll(self, timeout: float) -> Set[str]:
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        names = set()
+        offset = 0
+        while offset + self.EVENT.size <= len(data):
+            _, mask, _, length = self.EVENT.unpack_from(data, offset)
+            offset += self.EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += length
+            if mask & (self.IN_DELETE_SELF | self.IN_MOVE_SELF | self.IN_IGNORED):
+                self.directory_gone = True
+            elif name:
+                names.add(name)
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingSource:
+    """Changed file names in a directory by comparing modification times and sizes"""
+
+    def __init__(self, directory: str, interval: float = 0.5):
+        self.directory = directory
+        self.interval = interval
+        self.seen = self._scan()
+        self.directory_gone = False
+
+    def _scan(self) -> Dict[str, tuple]:
+        try:
+            with os.scandir(self.directory) as entries:
+                return {entry.name: (entry.stat().st_mtime_ns, entry.stat().st_size)
+                        for entry in entries if entry.is_file()}
+        except OSError:
+            return {}
+
+    def poll(self, timeout: float) -> Set[str]:
+        time.sleep(min(timeout, self.interval))
+        current = self._scan()
+        changed = {name for name in current.keys() | self.seen.keys() if current.get(name) != self.seen.get(name)}
+        self.seen = current
+        return changed
+
+    def close(self):
+        pass
+
+class PromptFolderWatcher(QObject):
+    """Watches a folder of prompt files and reports each changed file's prompts.
+
+    Uses inotify on Linux and polls elsewhere. Events are collected on a
+    background thread and debounced: a file is re-read once it has been
+    quiet for ``DEBOUNCE`` seconds, or at the latest ``MAX_DELAY`` seconds
+    after its first event, so a burst of writes costs one parse. Only the
+    files that changed are parsed, on the watcher thread; the result is
+    delivered through ``file_changed`` on the thread that owns the watcher
+    (``None`` when the file was deleted). Files that fail to parse, such as
+    half-written ones, are skipped until their next change.
+    """
+    file_changed = pyqtSignal(str, object)      # path, templates or None
+
+    DEBOUNCE = 0.3
+    MAX_DELAY = 0.8
+
+    def __init__(self, directory: str, parent=None):
+        super().__init__(parent)
+        self.directory = os.path.abspath(directory)
+        self.stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name='prompt-watcher', daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+
+    def _open_source(self):
+        if hasattr(select, 'select') and os.name == 'posix' and os.uname().sysname == 'Linux':
+            try:
+                return InotifySource(self.directory)
+            except (OSError, AttributeError) as e:
+                logger.warning(f"inotify unavailable ({e}); polling {self.directory}")
+        return PollingSource(self.directory)
+
+    def _load(self, name: str):
+        path = os.path.join(self.directory, name)
+        if not os.path.exists(path):
+            self.file_changed.emit(path, None)
+            return
+        try:
+            templates = read_prompt_file(path)
+        except (OSError, PromptError, SyntaxError) as e:
+            logger.warning(f"Skipping prompt file {name}: {e}")
+            return
+        self.file_changed.emit(path, templates)
+
+    def _run(self):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            source = self._open_source()
+        except OSError as e:
+            logger.error(f"Can't watch prompt folder {self.directory}: {e}")
+            return
+        logger.info(f"Watching {self.directory} for prompt files with {type(source).__name__}")
+
+        for name in sorted(os.listdir(self.directory)):
+            if is_prompt_file(name):
+                self._load(name)
+
+        pending = {}        # name -> (first event, last event)
+        try:
+            while not self.stopped.is_set():
+                now = time.monotonic()
+                timeout = min((min(last + self.DEBOUNCE, first + self.MAX_DELAY) - now
+                               for first, last in pending.values()), default=0.5)
+                for name in source.poll(max(timeout, 0.01)):
+                    if is_prompt_file(name):
+                        now = time.monotonic()
+                        first, _ = pending.get(name, (now, now))
+                        pending[name] = (first, now)
+
+                if source.directory_gone:
+                    logger.warning(f"Prompt folder {self.directory} went away; polling for it")
+                    source.close()
+                    source = PollingSource(self.directory)
+
+                now = time.monotonic()
+                for name, (first, last) in list(pending.items()):
+                    if now - last >= self.DEBOUNCE or now - first >= self.MAX_DELAY:
+                        del pending[name]
+                        self._load(name)
+        finally:
+            source.close()
@@ -1,4 +1,6 @@
 import os
+from lifai.config.prompt_store import PromptStore
+from lifai.config.prompt_registry import PromptRegistry
 
 # Default prompts
 default_prompts = {
@@ -96,18 +98,12 @@ Provide only the rewrite version without your commonts.
 When rewrite your response, make sure you are aware of the input text type. If it is an email format, you will response with an email. If it is a message, you will respond message. So on and so forth."""
 }
 
-# Try to load saved prompts, fall back to defaults if not found
-saved_prompts_file = os.path.join(os.path.dirname(__file__), 'saved_prompts.py')
-try:
-    if os.path.exists(saved_prompts_file):
-        namespace = {}
-        with open(saved_prompts_file, 'r', encoding='utf-8') as f:
-            exec(f.read(), namespace)
-        llm_prompts = namespace.get('llm_prompts', default_prompts)
-    else:
-        llm_prompts = default_prompts.copy()
-except Exception:
-    llm_prompts = default_prompts.copy()
-
-# Get options from llm_prompts keys
-improvement_options = list(llm_prompts.keys())
\ No newline at end of file
+# Load the prompt library, falling back to defaults if there is none.
+# A legacy saved_prompts.py is converted to prompts.json on first load.
+PROMPTS_FILE = os.path.join(os.path.dirname(__file__), 'prompts.json')
+LEGACY_PROMPTS_FILE = os.path.join(os.path.dirname(__file__), 'saved_prompts.py')
+prompt_store = PromptStore(PROMPTS_FILE, legacy_path=LEGACY_PROMPTS_FILE, defaults=default_prompts).load()
+llm_prompts = prompt_store.templates
+
+# Changes to the library go through the registry, which notifies the open windows
+prompt_registry = PromptRegistry(prompt_store)
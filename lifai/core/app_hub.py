@@ -1,9 +1,13 @@
-import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
+from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
+                            QGroupBox, QLabel, QComboBox, QPushButton,
+                            QPlainTextEdit, QMessageBox)
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QTextCharFormat, QColor, QTextCursor
 import logging
 import os
 import sys
 import json
+from collections import deque
 from datetime import datetime
 
 # Add project root to Python path
@@ -12,110 +16,174 @@ sys.path.append(project_root)
 
 from lifai.utils.ollama_client import OllamaClient
 from lifai.utils.lmstudio_client import LMStudioClient
-from lifai.modules.text_improver.improver import TextImproverWindow
-from lifai.modules.floating_toolbar.toolbar import FloatingToolbarModule
 from lifai.core.toggle_switch import ToggleSwitch
-from lifai.modules.prompt_editor.editor import PromptEditorWindow
-from lifai.modules.AI_chat.ai_chat import ChatWindow
-from lifai.modules.agent_workspace.workspace import AgentWorkspaceWindow
-from lifai.modules.advagent.advagent_window import AdvAgentWindow
+from lifai.core.setting_var import SettingVar
+from lifai.core.module_registry import ModuleRegistry
+from lifai.utils.startup_profiler import profile_step
 
 logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class LogHandler(logging.Handler):
-    def __init__(self, text_widget: scrolledtext.ScrolledText):
+    """Shows log records in the hub's debug panel.
+
+    ``emit`` may be called from any thread (pynput listeners, QThreads,
+    worker pools) and only appends the formatted record to a queue; a timer
+    on the GUI thread moves queued records into the widget in batches. The
+    queue is bounded: when records arrive faster than they are shown, the
+    oldest are dropped and counted. The panel and ``lines`` keep the last
+    ``MAX_LINES`` records.
+    """
+    # Colors per log level
+    LEVEL_COLORS = (
+        (logging.ERROR, '#FF5252'),    # Red
+        (logging.WARNING, '#FFA726'),  # Orange
+        (logging.INFO, '#4CAF50'),     # Green
+        (logging.NOTSET, '#9E9E9E'),   # Gray
+    )
+    MAX_LINES = 5000
+    QUEUE_LIMIT = 10000
+    FLUSH_INTERVAL_MS = 100
+
+    def __init__(self, text_widget: QPlainTextEdit):
         super().__init__()
         self.text_widget = text_widget
-        
+        self.text_widget.setMaximumBlockCount(self.MAX_LINES)
+
         # Create a formatter
         self.formatter = logging.Formatter(
             '%(asctime)s - %(levelname)s - %(message)s',
             datefmt='%H:%M:%S'
         )
 
+        # deque appends and pops are atomic, so emit needs no lock
+        self.queue = deque(maxlen=self.QUEUE_LIMIT)
+        self.lines = deque(maxlen=self.MAX_LINES)
+        self.dropped = 0
+        self.reported_dropped = 0
+        self.dropped_label = None
+        self.formats = {}
+
+        self.flush_timer = QTimer(text_widget)
+        self.flush_timer.timeout.connect(self.flush_queue)
+        self.flush_timer.start(self.FLUSH_INTERVAL_MS)
+
     def emit(self, record):
-        msg = self.formatter.format(record)
-        self.text_widget.configure(state='normal')
-        
-        # Add color tags based on log level
-        if record.levelno >= logging.ERROR:
-            tag = 'error'
-            color = '#FF5252'  # Red
-        elif record.levelno >= logging.WARNING:
-            tag = 'warning'
-            color = '#FFA726'  # Orange
-        elif record.levelno >= logging.INFO:
-            tag = 'info'
-            color = '#4CAF50'  # Green
-        else:
-            tag = 'debug'
-            color = '#9E9E9E'  # Gray
-            
-        # Configure tag if it doesn't exist
-        if tag not in self.text_widget.tag_names():
-            self.text_widget.tag_configure(tag, foreground=color)
-        
-        # Insert the message with appropriate tag
-        self.text_widget.insert(tk.END, msg + '\n', tag)
-        self.text_widget.see(tk.END)  # Auto-scroll to bottom
-        self.text_widget.configure(state='disabled')
-
-class LifAiHub:
-    def __init__(self):
-        # Set DPI awareness for tkinter
-        if sys.platform == 'win32':
-            try:
-                from ctypes import windll
-                windll.shcore.SetProcessDpiAwareness(1)
-            except Exception as e:
-                logging.warning(f"Failed to set DPI awareness for tkinter: {e}")
-
-        self.root = tk.Tk()
-        
-        # Enable DPI scaling for tkinter
         try:
-            self.root.tk.call('tk', 'scaling', self.root.winfo_fpixels('1i')/72.0)
-        except Exception as e:
-            logging.warning(f"Failed to set tk scaling: {e}")
+            if len(self.queue) >= self.QUEUE_LIMIT:
+                self.dropped += 1
+            self.queue.append((self.formatter.format(record), record.levelno))
+        except Exception:
+            self.handleError(record)
+
+    def char_format(self, levelno: int) -> QTextCharFormat:
+        color = next(c for level, c in self.LEVEL_COLORS if levelno >= level)
+        if color not in self.formats:
+            char_format = QTextCharFormat()
+            char_format.setForeground(QColor(color))
+            self.formats[color] = char_format
+        return self.formats[color]
+
+    def flush_queue(self):
+        """Move queued records into the widget (GUI thread)"""
+        if self.dropped != self.reported_dropped:
+            self.reported_dropped = self.dropped
+            if self.dropped_label is not None:
+                self.dropped_label.setText(f"Dropped: {self.dropped:,}")
+        if not self.queue:
+            return
+        batch = []
+        try:
+            while True:
+                batch.append(self.queue.popleft())
+        except IndexError:
+            pass
+        # Only the newest records would survive the widget's line limit anyway
+        batch = batch[-self.MAX_LINES:]
+        self.lines.extend(batch)
+
+        scrollbar = self.text_widget.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+        cursor = QTextCursor(self.text_widget.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        for msg, levelno in batch:
+            if not cursor.atStart():
+                cursor.insertBlock()
+            cursor.insertText(msg, self.char_format(levelno))
+        cursor.endEditBlock()
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())  # Auto-scroll to bottom
+
+    def clear(self):
+        self.queue.clear()
+        self.lines.clear()
+        self.text_widget.clear()
+
+    def text(self) -> str:
+        return '\n'.join(msg for msg, _ in self.lines) + '\n'
+
+class LazyComboBox(QComboBox):
+    """Combo box that asks for its items right before the popup opens"""
+
+    def __init__(self, before_popup, parent=None):
+        super().__init__(parent)
+        self.before_popup = before_popup
+
+    def showPopup(self):
+        self.before_popup()
+        super().showPopup()
+
+class LifAiHub(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("LifAi Control Hub")
+        self.resize(600, 650)
 
-        self.root.title("LifAi Control Hub")
-        self.root.geometry("600x650")
-        
         # Configure background color
-        self.root.configure(bg='#ffffff')
-        self.style = ttk.Style()
-        self.style.configure('TFrame', background='#ffffff')
-        self.style.configure('TLabelframe', background='#ffffff')
-        self.style.configure('TLabelframe.Label', background='#ffffff')
-        
+        self.setStyleSheet("background-color: #ffffff;")
+
         # Initialize clients
-        self.ollama_client = OllamaClient()
-        self.lmstudio_client = LMStudioClient()
-        
+        with profile_step('hub.clients'):
+            self.ollama_client = OllamaClient()
+            self.lmstudio_client = LMStudioClient()
+
         # Load last selected model and backend
         self.config_file = os.path.join(project_root, 'lifai', 'config', 'app_settings.json')
-        last_config = self.load_last_config()
-        
+        with profile_step('hub.load_last_config'):
+            last_config = self.load_last_config()
+
         # Shared settings
         self.settings = {
-            'model': tk.StringVar(value=last_config.get('last_model', '')),
-            'backend': tk.StringVar(value=last_config.get('backend', 'ollama')),
+            'model': SettingVar(last_config.get('last_model', '')),
+            'backend': SettingVar(last_config.get('backend', 'ollama')),
             'models_list': []
         }
-        
-        self.setup_ui()
-        self.modules = {}
-        self.initialize_modules()
-        
+        # Prompt files dropped into this folder are loaded while the app runs
+        self.shared_prompts_dir = last_config.get('shared_prompts_dir')
+        self.prompt_watcher = None
+        # JSON-lines log files under logs/ (set "file_logging": false to turn off)
+        self.file_logging_enabled = last_config.get('file_logging', True)
+        self.file_log_level = getattr(logging, str(last_config.get('file_log_level', 'INFO')).upper(), logging.INFO)
+        self.file_logging = None
+
+        self.models_loaded = False
+        with profile_step('hub.setup_ui'):
+            self.setup_ui()
+        if self.file_logging_enabled:
+            self.start_file_logging()
+        self.modules = ModuleRegistry()
+        with profile_step('hub.initialize_modules'):
+            self.initialize_modules()
+
         # Log initialization
         logging.info("LifAi Control Hub initialized")
-        
-        # Bind window close event
-        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
-        
+
         # Bind model selection change
-        self.settings['model'].trace_add('write', self.on_model_change)
-        self.settings['backend'].trace_add('write', self.on_backend_change)
+        self.settings['model'].changed.connect(self.on_model_change)
+        self.settings['backend'].changed.connect(self.on_backend_change)
+
+        # Start watching the shared prompt folder once the window is up
+        QTimer.singleShot(0, self.start_prompt_watcher)
 
     def load_last_config(self) -> dict:
         """Load the last configuration from config file"""
@@ -134,6 +202,12 @@ class LifAiHub:
                 'last_model': self.settings['model'].get(),
                 'backend': self.settings['backend'].get()
             }
+            if self.shared_prompts_dir:
+                config['shared_prompts_dir'] = self.shared_prompts_dir
+            if not self.file_logging_enabled:
+                config['file_logging'] = False
+            if self.file_log_level != logging.INFO:
+                config['file_log_level'] = logging.getLevelName(self.file_log_level)
             os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
             with open(self.config_file, 'w') as f:
                 json.dump(config, f)
@@ -153,177 +227,159 @@ class LifAiHub:
         """Get the currently active client based on backend selection"""
         return self.lmstudio_client if self.settings['backend'].get() == 'lmstudio' else self.ollama_client
 
+    def set_models_list(self, models_list):
+        """Replace the model dropdown contents, keeping the current selection if possible"""
+        current_model = self.settings['model'].get()
+        self.models_list = models_list
+
+        self.model_dropdown.blockSignals(True)
+        self.model_dropdown.clear()
+        self.model_dropdown.addItems(self.models_list)
+        self.model_dropdown.blockSignals(False)
+
+        # Try to keep the current selection if it still exists
+        if current_model in self.models_list:
+            self.model_dropdown.setCurrentText(current_model)
+        elif self.models_list:
+            self.model_dropdown.setCurrentIndex(0)
+            self.settings['model'].set(self.models_list[0])
+        else:
+            self.settings['model'].set('')
+
     def refresh_models(self):
         """Refresh the list of available models"""
         try:
-            current_model = self.settings['model'].get()
             client = self.get_active_client()
-            self.models_list = client.fetch_models()
-            self.model_dropdown['values'] = self.models_list
-            
-            # Try to keep the current selection if it still exists
-            if current_model in self.models_list:
-                self.settings['model'].set(current_model)
-            elif self.models_list:
-                self.settings['model'].set(self.models_list[0])
-            else:
-                self.settings['model'].set('')
-                
+            self.set_models_list(client.fetch_models())
+            self.models_loaded = True
             logging.info("Models list refreshed successfully")
         except Exception as e:
             logging.error(f"Error refreshing models: {e}")
-            messagebox.showerror("Error", f"Failed to refresh models: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to refresh models: {e}")
+
+    def ensure_models_loaded(self):
+        """Fetch the models list the first time it is needed"""
+        if not self.models_loaded:
+            self.refresh_models()
 
     def setup_ui(self):
+        layout = QVBoxLayout(self)
+
         # Settings panel with padding
-        self.settings_frame = ttk.LabelFrame(
-            self.root, 
-            text="Global Settings",
-            padding=10
-        )
-        self.settings_frame.pack(fill=tk.X, padx=10, pady=5)
-        
+        self.settings_frame = QGroupBox("Global Settings")
+        settings_layout = QVBoxLayout(self.settings_frame)
+        layout.addWidget(self.settings_frame)
+
         # Backend selection container
-        backend_container = ttk.Frame(self.settings_frame)
-        backend_container.pack(fill=tk.X, expand=True, pady=(0, 5))
-        
+        backend_container = QHBoxLayout()
+        settings_layout.addLayout(backend_container)
+
         # Backend label
-        backend_label = ttk.Label(backend_container, text="Backend:")
-        backend_label.pack(side=tk.LEFT, padx=(0, 5))
-        
+        backend_container.addWidget(QLabel("Backend:"))
+
         # Backend selection
-        self.backend_dropdown = ttk.Combobox(
-            backend_container,
-            textvariable=self.settings['backend'],
-            values=['ollama', 'lmstudio'],
-            state='readonly'
-        )
-        self.backend_dropdown.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
-        
-        # Bind backend selection change
-        self.settings['backend'].trace_add('write', self.on_backend_change)
-        
+        self.backend_dropdown = QComboBox()
+        self.backend_dropdown.addItems(['ollama', 'lmstudio'])
+        self.backend_dropdown.setCurrentText(self.settings['backend'].get())
+        self.backend_dropdown.currentTextChanged.connect(self.settings['backend'].set)
+        backend_container.addWidget(self.backend_dropdown, 1)
+
         # Model selection container
-        model_container = ttk.Frame(self.settings_frame)
-        model_container.pack(fill=tk.X, expand=True)
-        
+        model_container = QHBoxLayout()
+        settings_layout.addLayout(model_container)
+
         # Model label
-        model_label = ttk.Label(model_container, text="Model:")
-        model_label.pack(side=tk.LEFT, padx=(0, 5))
-        
-        # Model selection with longer width
-        self.models_list = self.get_active_client().fetch_models()
-        self.model_dropdown = ttk.Combobox(
-            model_container, 
-            textvariable=self.settings['model'],
-            values=self.models_list,
-            state='readonly'
-        )
-        self.model_dropdown.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
-        
+        model_container.addWidget(QLabel("Model:"))
+
+        # Model selection with longer width. The backend is only queried when
+        # the dropdown is first opened, so startup does no network I/O.
+        self.model_dropdown = LazyComboBox(self.ensure_models_loaded)
+        self.model_dropdown.currentTextChanged.connect(self.settings['model'].set)
+        model_container.addWidget(self.model_dropdown, 1)
+        last_model = self.settings['model'].get()
+        self.set_models_list([last_model] if last_model else [])
+        if not last_model:
+            # Nothing to show yet: fetch once the event loop is running
+            QTimer.singleShot(0, self.ensure_models_loaded)
+
         # Refresh button
-        refresh_btn = ttk.Button(
-            model_container,
-            text="🔄 Refresh",
-            command=self.refresh_models,
-            width=10
-        )
-        refresh_btn.pack(side=tk.LEFT, padx=5)
-        
-        # Set initial model selection
-        if self.settings['model'].get() in self.models_list:
-            self.model_dropdown.set(self.settings['model'].get())
-        elif self.models_list:
-            self.model_dropdown.current(0)
-        
+        refresh_btn = QPushButton("🔄 Refresh")
+        refresh_btn.setFixedWidth(90)
+        refresh_btn.clicked.connect(self.refresh_models)
+        model_container.addWidget(refresh_btn)
+
         # Module controls
-        self.modules_frame = ttk.LabelFrame(
-            self.root, 
-            text="Module Controls",
-            padding=10
-        )
-        self.modules_frame.pack(fill=tk.X, padx=10, pady=5)
+        self.modules_frame = QGroupBox("Module Controls")
+        modules_layout = QVBoxLayout(self.modules_frame)
+        layout.addWidget(self.modules_frame)
 
         # Text Improver toggle
         #self.text_improver_toggle = ToggleSwitch(
-        #    self.modules_frame,
         #    "Text Improver Window",
         #    self.toggle_text_improver
         #)
-        #self.text_improver_toggle.pack(fill=tk.X, pady=5)
+        #modules_layout.addWidget(self.text_improver_toggle)
 
         # Floating Toolbar toggle
         self.toolbar_toggle = ToggleSwitch(
-            self.modules_frame,
             "Floating Toolbar",
             self.toggle_floating_toolbar
         )
-        self.toolbar_toggle.pack(fill=tk.X, pady=5)
+        modules_layout.addWidget(self.toolbar_toggle)
 
         # Prompt Editor toggle
         self.prompt_editor_toggle = ToggleSwitch(
-            self.modules_frame,
             "Prompt Editor",
             self.toggle_prompt_editor
         )
-        self.prompt_editor_toggle.pack(fill=tk.X, pady=5)
+        modules_layout.addWidget(self.prompt_editor_toggle)
 
         # AI Chat toggle
         #self.chat_toggle = ToggleSwitch(
-        #    self.modules_frame,
         #    "AI Chat",
         #    self.toggle_chat
         #)
-        #self.chat_toggle.pack(fill=tk.X, pady=5)
-        
+        #modules_layout.addWidget(self.chat_toggle)
+
         # Agent Workspace toggle
         #self.agent_workspace_toggle = ToggleSwitch(
-        #    self.modules_frame,
         #    "Agent Workspace",
         #    self.toggle_agent_workspace
         #)
-        #self.agent_workspace_toggle.pack(fill=tk.X, pady=5)
-        
+        #modules_layout.addWidget(self.agent_workspace_toggle)
+
         # Advanced Agent toggle
         #self.adv_agent_toggle = ToggleSwitch(
-        #    self.modules_frame,
         #    "Advanced Agent",
         #    self.toggle_adv_agent
         #)
-        #self.adv_agent_toggle.pack(fill=tk.X, pady=5)
-        
+        #modules_layout.addWidget(self.adv_agent_toggle)
+
         # Debug log panel
-        self.debug_frame = ttk.LabelFrame(
-            self.root,
-            text="Debug Logs",
-            padding=10
-        )
-        self.debug_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        
-        # Add scrolled text widget for logs
-        self.log_widget = scrolledtext.ScrolledText(
-            self.debug_frame,
-            height=10,
-            wrap=tk.WORD
-        )
-        self.log_widget.pack(fill=tk.BOTH, expand=True)
-        self.log_widget.configure(state='disabled')
-        
+        self.debug_frame = QGroupBox("Debug Logs")
+        self.debug_layout = QVBoxLayout(self.debug_frame)
+        layout.addWidget(self.debug_frame, 1)
+
+        # Add read-only text widget for logs
+        self.log_widget = QPlainTextEdit()
+        self.log_widget.setReadOnly(True)
+        self.debug_layout.addWidget(self.log_widget)
+
         # Configure logging to use our widget
         root_logger = logging.getLogger()
         root_logger.setLevel(logging.INFO)
-        
+
         # Remove existing handlers
         for handler in root_logger.handlers[:]:
             root_logger.removeHandler(handler)
-        
+
         # Add our custom handler
-        log_handler = LogHandler(self.log_widget)
-        root_logger.addHandler(log_handler)
-        
+        self.log_handler = LogHandler(self.log_widget)
+        root_logger.addHandler(self.log_handler)
+
         # Create log controls at the bottom
         self.create_log_controls()
-        
+
         # Add initial test logs
         logging.debug("Debug message test")
         logging.info("Info message test")
@@ -331,111 +387,149 @@ class LifAiHub:
         logging.error("Error message test")
 
     def create_log_controls(self):
-        control_frame = ttk.Frame(self.debug_frame)
-        control_frame.pack(fill=tk.X, pady=(5, 0))
-        
+        control_layout = QHBoxLayout()
+        self.debug_layout.addLayout(control_layout)
+
         # Log level selector
-        ttk.Label(control_frame, text="Log Level:").pack(side=tk.LEFT, padx=(0, 5))
-        self.log_level = tk.StringVar(value="INFO")
-        level_combo = ttk.Combobox(
-            control_frame,
-            textvariable=self.log_level,
-            values=["DEBUG", "INFO", "WARNING", "ERROR"],
-            state='readonly',
-            width=10
-        )
-        level_combo.pack(side=tk.LEFT, padx=5)
-        
+        control_layout.addWidget(QLabel("Log Level:"))
+        self.log_level = QComboBox()
+        self.log_level.addItems(["DEBUG", "INFO", "WARNING", "ERROR"])
+        self.log_level.setCurrentText("INFO")
+        control_layout.addWidget(self.log_level)
+
         # Bind log level change
-        level_combo.bind('<<ComboboxSelected>>', self.change_log_level)
-        
-        # Clear logs button
-        ttk.Button(
-            control_frame,
-            text="Clear Logs",
-            command=self.clear_logs
-        ).pack(side=tk.RIGHT, padx=5)
-        
+        self.log_level.currentTextChanged.connect(self.change_log_level)
+        control_layout.addStretch()
+
         # Save logs button
-        ttk.Button(
-            control_frame,
-            text="Save Logs",
-            command=self.save_logs
-        ).pack(side=tk.RIGHT, padx=5)
+        save_btn = QPushButton("Save Logs")
+        save_btn.clicked.connect(self.save_logs)
+        control_layout.addWidget(save_btn)
+
+        # Records dropped because they came in faster than the panel shows them
+        self.dropped_label = QLabel("")
+        self.dropped_label.setStyleSheet("color: gray")
+        self.log_handler.dropped_label = self.dropped_label
+        control_layout.addWidget(self.dropped_label)
 
-    def change_log_level(self, event=None):
-        level = getattr(logging, self.log_level.get())
-        logging.getLogger().setLevel(level)
-        logging.info(f"Log level changed to {self.log_level.get()}")
+        # Clear logs button
+        clear_btn = QPushButton("Clear Logs")
+        clear_btn.clicked.connect(self.clear_logs)
+        control_layout.addWidget(clear_btn)
+
+    def start_file_logging(self):
+        from lifai.utils.log_files import FileLogging
+        try:
+            self.file_logging = FileLogging(os.path.join(project_root, 'logs'), level=self.file_log_level).start()
+        except OSError as e:
+            logging.error(f"Can't write log files: {e}")
+            return
+        self.apply_log_levels()
+
+    def apply_log_levels(self):
+        """The panel shows the selected level; log files may record more detail"""
+        level = getattr(logging, self.log_level.currentText())
+        self.log_handler.setLevel(level)
+        file_level = self.file_log_level if self.file_logging else level
+        logging.getLogger().setLevel(min(level, file_level))
+
+    def change_log_level(self, *args):
+        self.apply_log_levels()
+        logging.info(f"Log level changed to {self.log_level.currentText()}")
 
     def clear_logs(self):
-        self.log_widget.configure(state='normal')
-        self.log_widget.delete(1.0, tk.END)
-        self.log_widget.configure(state='disabled')
+        self.log_handler.clear()
         logging.info("Logs cleared")
 
     def save_logs(self):
         try:
             # Create logs directory if it doesn't exist
             os.makedirs('logs', exist_ok=True)
-            
+
             # Generate filename with timestamp
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f'logs/lifai_log_{timestamp}.txt'
-            
-            # Save logs
+
+            # Save logs from the handler's buffer, including records not shown yet
+            self.log_handler.flush_queue()
             with open(filename, 'w', encoding='utf-8') as f:
-                f.write(self.log_widget.get(1.0, tk.END))
-            
+                f.write(self.log_handler.text())
+
             logging.info(f"Logs saved to {filename}")
         except Exception as e:
             logging.error(f"Failed to save logs: {e}")
 
     def initialize_modules(self):
-        # Initialize prompt editor first
-        self.modules['prompt_editor'] = PromptEditorWindow(
-            settings=self.settings
-        )
-        
-        # Initialize other modules
-        self.modules['text_improver'] = TextImproverWindow(
+        # Modules are created on first toggle; factories import their own dependencies
+        self.modules.register('prompt_editor', self.create_prompt_editor)
+        self.modules.register('text_improver', self.create_text_improver)
+        self.modules.register('floating_toolbar', self.create_floating_toolbar)
+        self.modules.register('chat', self.create_chat)
+        self.modules.register('agent_workspace', self.create_agent_workspace)
+        self.modules.register('adv_agent', self.create_adv_agent)
+
+        # Register prompt update callbacks as modules come to life
+        self.modules.add_create_hook(self.on_module_created)
+
+    def on_module_created(self, name, module):
+        if hasattr(module, 'update_prompts'):
+            from lifai.config.prompts import prompt_registry
+            prompt_registry.subscribe(module.update_prompts)
+
+    def start_prompt_watcher(self):
+        from lifai.config.prompt_watcher import PromptFolderWatcher
+        directory = self.shared_prompts_dir or os.path.join(project_root, 'lifai', 'config', 'shared_prompts')
+        self.prompt_watcher = PromptFolderWatcher(directory, parent=self)
+        # Files are parsed on the watcher thread; the registry is updated on this one
+        self.prompt_watcher.file_changed.connect(self.on_shared_prompt_file)
+        self.prompt_watcher.start()
+
+    def on_shared_prompt_file(self, path, templates):
+        from lifai.config.prompts import prompt_registry
+        try:
+            prompt_registry.apply_file(path, templates)
+        except Exception as e:
+            logging.error(f"Error loading shared prompts from {path}: {e}")
+
+    def create_prompt_editor(self):
+        from lifai.modules.prompt_editor.editor import PromptEditorWindow
+        return PromptEditorWindow(settings=self.settings)
+
+    def create_text_improver(self):
+        from lifai.modules.text_improver.improver import TextImproverWindow
+        return TextImproverWindow(
             settings=self.settings,
             ollama_client=self.get_active_client()
         )
-        
-        self.modules['floating_toolbar'] = FloatingToolbarModule(
+
+    def create_floating_toolbar(self):
+        from lifai.modules.floating_toolbar.toolbar import FloatingToolbarModule
+        return FloatingToolbarModule(
             settings=self.settings,
             ollama_client=self.get_active_client()
         )
 
-        # Initialize AI Chat module
-        self.modules['chat'] = ChatWindow(
+    def create_chat(self):
+        from lifai.modules.AI_chat.ai_chat import ChatWindow
+        return ChatWindow(
             settings=self.settings,
             ollama_client=self.get_active_client()
         )
 
-        # Initialize Agent Workspace module
-        self.modules['agent_workspace'] = AgentWorkspaceWindow(
+    def create_agent_workspace(self):
+        from lifai.modules.agent_workspace.workspace import AgentWorkspaceWindow
+        return AgentWorkspaceWindow(
             settings=self.settings,
             ollama_client=self.get_active_client()
         )
 
-        # Initialize Advanced Agent module
-        self.modules['adv_agent'] = AdvAgentWindow(
-            settings=self.settings
+    def create_adv_agent(self):
+        from lifai.modules.advagent.advagent_window import AdvAgentWindow
+        return AdvAgentWindow(
+            settings=self.settings,
+            ollama_client=self.ollama_client
         )
 
-        # Register prompt update callbacks
-        if hasattr(self.modules['text_improver'], 'update_prompts'):
-            self.modules['prompt_editor'].add_update_callback(
-                self.modules['text_improver'].update_prompts
-            )
-            
-        if hasattr(self.modules['floating_toolbar'], 'update_prompts'):
-            self.modules['prompt_editor'].add_update_callback(
-                self.modules['floating_toolbar'].update_prompts
-            )
-
     #def toggle_text_improver(self):
     #    if self.text_improver_toggle.get():
     #        self.modules['text_improver'].show()
@@ -473,23 +567,34 @@ class LifAiHub:
     #    else:
     #        self.modules['adv_agent'].hide()
 
-    def run(self):
+    def run(self) -> int:
         # Make sure the hub window stays on top
-        self.root.attributes('-topmost', True)
-        self.root.mainloop()
+        self.setWindowFlag(Qt.WindowType.WindowStaysOnTopHint, True)
+        self.show()
+        # Single event loop for the hub and every module window
+        return QApplication.instance().exec()
 
-    def on_closing(self):
+    def closeEvent(self, event):
         """Handle application closing"""
         # Save current model selection
         self.save_config()
-        
-        # Destroy all module windows
+
+        if self.prompt_watcher is not None:
+            self.prompt_watcher.stop()
+
+        # Destroy all module windows that were created
         for module in self.modules.values():
             if hasattr(module, 'destroy'):
                 module.destroy()
-        
-        self.root.destroy()
+
+        self.log_handler.flush_timer.stop()
+        logging.getLogger().removeHandler(self.log_handler)
+        if self.file_logging is not None:
+            self.file_logging.stop()
+        event.accept()
+        QApplication.instance().quit()
 
 if __name__ == "__main__":
+    qt_app = QApplication.instance() or QApplication(sys.argv)
     app = LifAiHub()
-    app.run() 
\ No newline at end of file
+    sys.exit(app.run())
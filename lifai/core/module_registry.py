@@ -0,0 +1,62 @@
+import time
+from typing import Any, Callable, Dict, List
+from lifai.utils.logger_utils import get_module_logger
+from lifai.utils.startup_profiler import profile_step
+
+logger = get_module_logger(__name__)
+
+class ModuleRegistry:
+    """Creates hub modules on first use instead of at startup.
+
+    Each module is registered with a factory that performs its own imports,
+    so heavy dependencies (pyqtgraph, bs4, markdown, pynput) are only
+    loaded when the user first enables the module.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._create_hooks: List[Callable[[str, Any], None]] = []
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        """Register a module factory under the given name"""
+        self._factories[name] = factory
+
+    def add_create_hook(self, callback: Callable[[str, Any], None]):
+        """Add a callback invoked with (name, module) after a module is created"""
+        self._create_hooks.append(callback)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def get(self, name: str) -> Any:
+        """Return the module instance, creating it on first access"""
+        if name not in self._instances:
+            if name not in self._factories:
+                raise KeyError(f"Unknown module: {name}")
+
+            start_time = time.perf_counter()
+            with profile_step(f'module.{name}'):
+                module = self._factories[name]()
+            self._instances[name] = module
+            logger.info(f"Module '{name}' initialized in {(time.perf_counter() - start_time) * 1000:.0f} ms")
+
+            for callback in self._create_hooks:
+                try:
+                    callback(name, module)
+                except Exception as e:
+                    logger.error(f"Error in module create hook for '{name}': {e}")
+        return self._instances[name]
+
+    def __getitem__(self, name: str) -> Any:
+        return self.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factories
+
+    def loaded(self) -> Dict[str, Any]:
+        """Modules that have been created so far"""
+        return dict(self._instances)
+
+    def values(self):
+        return list(self._instances.values())
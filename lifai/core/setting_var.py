@@ -0,0 +1,23 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class SettingVar(QObject):
+    """Observable string setting shared between the hub and its modules.
+
+    Mirrors the small part of the ``tk.StringVar`` API the modules rely on
+    (``get``/``set``) and notifies listeners through the ``changed`` signal.
+    """
+    changed = pyqtSignal(str)
+
+    def __init__(self, value: str = ''):
+        super().__init__()
+        self._value = value
+
+    def get(self) -> str:
+        return self._value
+
+    def set(self, value: str):
+        value = value or ''
+        if value != self._value:
+            self._value = value
+            self.changed.emit(value)
@@ -1,184 +1,127 @@
-import tkinter as tk
-from tkinter import ttk
-import logging
-import time
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel
+from PyQt6.QtCore import Qt, QRectF, QVariantAnimation, QEasingCurve
+from PyQt6.QtGui import QPainter, QColor, QFont
 
-class ToggleSwitch(ttk.Frame):
-    def __init__(self, parent, text, command=None, width=60, height=28):
+
+class _SwitchTrack(QWidget):
+    """Painted track and knob of the toggle switch"""
+
+    def __init__(self, switch, width: int, height: int):
+        super().__init__(switch)
+        self.switch = switch
+        self.setFixedSize(width, height)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.hover = False
+
+    def enterEvent(self, event):
+        self.hover = True
+        self.update()
+
+    def leaveEvent(self, event):
+        self.hover = False
+        self.update()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.switch._toggle()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        # Colors
+        if self.switch.get():
+            bg_color = '#34c759' if not self.hover else '#2fb350'  # Green
+        else:
+            bg_color = '#e9e9ea' if not self.hover else '#dedede'  # Gray
+
+        # Draw background (rounded rectangle)
+        radius = (self.height() - 4) / 2
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(bg_color))
+        painter.drawRoundedRect(QRectF(2, 2, self.width() - 4, self.height() - 4), radius, radius)
+
+        # Draw switch circle with a soft shadow
+        circle_diameter = self.height() - 8
+        circle_x = self.switch.circle_pos
+        painter.setBrush(QColor('#dddddd'))
+        painter.drawEllipse(QRectF(circle_x + 1, 5, circle_diameter, circle_diameter))
+        painter.setBrush(QColor('#ffffff'))
+        painter.drawEllipse(QRectF(circle_x, 4, circle_diameter, circle_diameter))
+
+
+class ToggleSwitch(QWidget):
+    def __init__(self, text, command=None, width=60, height=28, parent=None):
         super().__init__(parent)
-        
+
         # Variables
-        self.width = width
-        self.height = height
+        self.switch_width = width
+        self.switch_height = height
         self.command = command
-        self.enabled = tk.BooleanVar(value=False)
-        
-        # Animation variables
-        self.animation_running = False
-        self.animation_steps = 10
-        self.animation_speed = 16  # milliseconds per step (60fps)
-        
-        # Configure style for the switch
-        self.style = ttk.Style()
-        self.style.configure('Switch.TFrame', background='#ffffff')
-        self.style.configure('SwitchLabel.TLabel', 
-                           background='#ffffff',
-                           font=('Segoe UI', 10))
-        
-        # Main container
-        self.container = ttk.Frame(self, style='Switch.TFrame')
-        self.container.pack(fill=tk.X, padx=5, pady=2)
-        
-        # Label
-        self.label = ttk.Label(self.container, 
-                              text=text, 
-                              style='SwitchLabel.TLabel')
-        self.label.pack(side=tk.LEFT, padx=(5, 10))
-        
-        # Create canvas for custom switch
-        self.canvas = tk.Canvas(
-            self.container,
-            width=self.width,
-            height=self.height,
-            bg='#ffffff',
-            bd=0,
-            highlightthickness=0
-        )
-        self.canvas.pack(side=tk.RIGHT, padx=5)
-        
+        self.enabled = False
+
         # Current circle position
         self.circle_pos = 6  # Starting position
-        
-        # Draw initial switch state
-        self._draw_switch()
-        
-        # Bind events
-        self.canvas.bind('<Button-1>', self._toggle)
-        self.canvas.bind('<Enter>', self._on_enter)
-        self.canvas.bind('<Leave>', self._on_leave)
-
-    def _draw_switch(self, hover=False, circle_x=None):
-        self.canvas.delete('all')
-        
-        # Colors
-        if self.enabled.get():
-            bg_color = '#34c759' if not hover else '#2fb350'  # Green
-        else:
-            bg_color = '#e9e9ea' if not hover else '#dedede'  # Gray
-            
-        switch_color = '#ffffff'  # White
-        shadow_color = '#dddddd'  # Light gray for shadow
-        
-        # Draw background (rounded rectangle)
-        radius = self.height // 2
-        self.canvas.create_rounded_rect(
-            2, 2,
-            self.width - 2, self.height - 2,
-            radius,
-            fill=bg_color,
-            outline=''
-        )
-        
-        # Draw switch circle
-        circle_diameter = self.height - 8
-        circle_x = circle_x if circle_x is not None else self.circle_pos
-            
-        # Add shadow effect (multiple circles with decreasing opacity)
-        shadow_layers = 3
-        for i in range(shadow_layers):
-            offset = i * 0.5
-            self.canvas.create_oval(
-                circle_x + offset, 4 + offset,
-                circle_x + circle_diameter + offset, 4 + circle_diameter + offset,
-                fill=shadow_color,
-                outline=''
-            )
-        
-        # Draw main circle
-        self.canvas.create_oval(
-            circle_x, 4,
-            circle_x + circle_diameter, 4 + circle_diameter,
-            fill=switch_color,
-            outline=''
-        )
-
-    def _animate_switch(self, start_pos, end_pos):
+
+        # Animation (cubic easing, ~160ms like the old 10 x 16ms steps)
+        self.animation = QVariantAnimation(self)
+        self.animation.setDuration(160)
+        self.animation.setEasingCurve(QEasingCurve.Type.InOutCubic)
+        self.animation.valueChanged.connect(self._on_animation_step)
+        self.animation.finished.connect(self._on_animation_finished)
+        self._notify_on_finish = False
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(5, 2, 5, 2)
+
+        # Label
+        self.label = QLabel(text)
+        self.label.setFont(QFont('Segoe UI', 10))
+        layout.addWidget(self.label)
+        layout.addStretch()
+
+        # Custom switch
+        self.track = _SwitchTrack(self, width, height)
+        layout.addWidget(self.track)
+
+    @property
+    def animation_running(self) -> bool:
+        return self.animation.state() == QVariantAnimation.State.Running
+
+    def _end_pos(self, enabled: bool) -> float:
+        return self.switch_width - self.switch_height + 2 if enabled else 6
+
+    def _animate_switch(self, start_pos, end_pos, notify=True):
         if self.animation_running:
             return
-            
-        self.animation_running = True
-        steps = self.animation_steps
-        
-        # Add easing function for smoother animation
-        def ease_in_out(t):
-            # Cubic easing
-            t *= 2
-            if t < 1:
-                return 0.5 * t * t * t
-            t -= 2
-            return 0.5 * (t * t * t + 2)
-        
-        def animate_step(step):
-            if step <= steps:
-                progress = ease_in_out(step / steps)
-                current_pos = start_pos + (end_pos - start_pos) * progress
-                self._draw_switch(circle_x=current_pos)
-                self.after(self.animation_speed, lambda: animate_step(step + 1))
-            else:
-                self.circle_pos = end_pos
-                self._draw_switch()
-                self.animation_running = False
-                if self.command:
-                    self.command()
-        
-        animate_step(0)
-
-    def _toggle(self, event=None):
+        self._notify_on_finish = notify
+        self.animation.setStartValue(float(start_pos))
+        self.animation.setEndValue(float(end_pos))
+        self.animation.start()
+
+    def _on_animation_step(self, value):
+        self.circle_pos = value
+        self.track.update()
+
+    def _on_animation_finished(self):
+        self.circle_pos = self.animation.endValue()
+        self.track.update()
+        if self._notify_on_finish and self.command:
+            self.command()
+
+    def _toggle(self):
         if self.animation_running:
             return
-            
-        self.enabled.set(not self.enabled.get())
-        
-        # Calculate start and end positions
-        start_pos = self.circle_pos
-        end_pos = self.width - self.height + 2 if self.enabled.get() else 6
-        
-        # Start animation
-        self._animate_switch(start_pos, end_pos)
-
-    def _on_enter(self, event):
-        self._draw_switch(hover=True, circle_x=self.circle_pos)
-
-    def _on_leave(self, event):
-        self._draw_switch(hover=False, circle_x=self.circle_pos)
+
+        self.enabled = not self.enabled
+        self._animate_switch(self.circle_pos, self._end_pos(self.enabled))
 
     def get(self):
-        return self.enabled.get()
+        return self.enabled
 
     def set(self, value):
-        if value != self.enabled.get():
-            self.enabled.set(bool(value))
-            end_pos = self.width - self.height + 2 if value else 6
-            self._animate_switch(self.circle_pos, end_pos)
+        if bool(value) != self.enabled:
+            self.enabled = bool(value)
+            self._animate_switch(self.circle_pos, self._end_pos(self.enabled))
         else:
-            self._draw_switch()
-
-# Add rounded rectangle capability to Canvas
-def _create_rounded_rect(self, x1, y1, x2, y2, radius, **kwargs):
-    points = [
-        x1 + radius, y1,
-        x2 - radius, y1,
-        x2, y1,
-        x2, y1 + radius,
-        x2, y2 - radius,
-        x2, y2,
-        x2 - radius, y2,
-        x1 + radius, y2,
-        x1, y2,
-        x1, y2 - radius,
-        x1, y1 + radius,
-        x1, y1
-    ]
-    return self.create_polygon(points, smooth=True, **kwargs)
-
-tk.Canvas.create_rounded_rect = _create_rounded_rect
\ No newline at end of file
+            self.track.update()
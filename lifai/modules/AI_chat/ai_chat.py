@@ -1,93 +1,40 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, 
-                            QPushButton, QLabel, QScrollArea, QFrame,
-                            QFileDialog, QProgressBar)
-from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtGui import QFont, QColor, QPalette, QCloseEvent
+                            QPushButton, QFileDialog, QProgressBar, QComboBox,
+                            QAbstractItemView, QLineEdit, QListWidget, QListWidgetItem,
+                            QCheckBox)
+from PyQt6.QtCore import Qt, QThread
+from PyQt6.QtGui import QCloseEvent
 from typing import Dict
 import os
 from datetime import datetime
 from lifai.utils.ollama_client import OllamaClient
 from lifai.utils.logger_utils import get_module_logger
-import json
+from lifai.modules.AI_chat.transcript_view import ChatTranscriptModel, ChatTranscriptView
+from lifai.modules.AI_chat.session_store import ChatSessionStore
+from lifai.modules.AI_chat.context_manager import ConversationContext, SummaryWorker
+from lifai.modules.AI_chat.file_analysis import FileAnalysisWorker
+from lifai.utils.token_budget import REFUSE, WARN, get_token_budget
 from pathlib import Path
 
 logger = get_module_logger(__name__)
 
-class MessageBubble(QFrame):
-    def __init__(self, text: str, is_user: bool = True, parent=None):
-        super().__init__(parent)
-        self.setObjectName("messageBubble")
-        
-        # Main layout
-        main_layout = QHBoxLayout()
-        main_layout.setContentsMargins(10, 5, 10, 5)
-        self.setLayout(main_layout)
-        
-        # Message container
-        bubble_container = QFrame()
-        bubble_container.setObjectName("bubbleContainer")
-        bubble_layout = QHBoxLayout()
-        bubble_container.setLayout(bubble_layout)
-        
-        # Message text
-        message = QLabel(text)
-        message.setWordWrap(True)
-        message.setTextFormat(Qt.TextFormat.RichText)
-        message.setFont(QFont("Segoe UI", 10))
-        message.setObjectName("messageText")
-        bubble_layout.addWidget(message)
-        
-        # Style based on sender
-        if is_user:
-            bubble_container.setStyleSheet("""
-                QFrame#bubbleContainer {
-                    background-color: #DCF8C6;
-                    border-radius: 15px;
-                    padding: 10px;
-                    margin: 5px;
-                }
-                QLabel#messageText {
-                    color: #000000;
-                    background-color: transparent;
-                }
-            """)
-            main_layout.addWidget(bubble_container)
-            main_layout.addStretch()
-        else:
-            bubble_container.setStyleSheet("""
-                QFrame#bubbleContainer {
-                    background-color: #E8E8E8;
-                    border-radius: 15px;
-                    padding: 10px;
-                    margin: 5px;
-                }
-                QLabel#messageText {
-                    color: #000000;
-                    background-color: transparent;
-                }
-            """)
-            main_layout.addStretch()
-            main_layout.addWidget(bubble_container)
-        
-        # Set frame style
-        self.setStyleSheet("""
-            QFrame#messageBubble {
-                background-color: transparent;
-                border: none;
-            }
-        """)
-
 class ChatWindow(QWidget):
     def __init__(self, settings: Dict, ollama_client: OllamaClient):
         super().__init__(None)
         logger.info("Initializing AI Chat Window")
         self.settings = settings
         self.ollama_client = ollama_client
-        self.chat_history = []
+        self.session_id = None
+        self.has_older_messages = False
+        self.has_newer_messages = False
+        self.context = ConversationContext(count_tokens=self.count_tokens)
+        self.summary_worker = None
+        self.analysis_worker = None
         
-        # Create chat history directory
+        # Create chat history directory and session store
         self.history_dir = Path(__file__).parent / 'chat_history'
         self.history_dir.mkdir(exist_ok=True)
+        self.store = ChatSessionStore(self.history_dir / 'chat_sessions.db')
         
         # Setup UI first
         self.setup_ui()
@@ -105,45 +52,209 @@ class ChatWindow(QWidget):
         self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose, False)
         self.hide()
 
-    def save_chat_history(self):
-        """Save chat history to file"""
+    def load_chat_history(self):
+        """Import legacy history files and open the most recent session"""
         try:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f'chat_session_{timestamp}.json'
-            filepath = self.history_dir / filename
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.chat_history, f, ensure_ascii=False, indent=2)
-            
-            logger.info(f"Chat history saved to {filepath}")
-            
-            # Clean up old history files (keep last 10)
-            history_files = sorted(self.history_dir.glob('chat_session_*.json'))
-            if len(history_files) > 10:
-                for old_file in history_files[:-10]:
-                    old_file.unlink()
-                    
+            self.store.import_legacy_sessions(self.history_dir)
+            self.refresh_sessions()
+            session_id = self.store.latest_session_id() or self.store.create_session()
+            self.load_session(session_id)
         except Exception as e:
-            logger.error(f"Error saving chat history: {e}")
+            logger.error(f"Error loading chat history: {e}")
+
+    def refresh_sessions(self):
+        """Fill the session selector, newest first"""
+        self.session_combo.blockSignals(True)
+        self.session_combo.clear()
+        for session in self.store.list_sessions():
+            started = datetime.fromtimestamp(session['created_at']).strftime('%Y-%m-%d %H:%M')
+            title = session['title'] or "New chat"
+            self.session_combo.addItem(f"{started}  {title}", session['id'])
+        index = self.session_combo.findData(self.session_id)
+        if index >= 0:
+            self.session_combo.setCurrentIndex(index)
+        self.session_combo.blockSignals(False)
+
+    def load_session(self, session_id: int):
+        """Show the newest page of a session; older pages load on scroll"""
+        self.session_id = session_id
+        page = self.store.load_messages(session_id, limit=ChatSessionStore.PAGE_SIZE)
+        self.has_older_messages = len(page) == ChatSessionStore.PAGE_SIZE
+        self.has_newer_messages = False
+        self.transcript.delegate.highlight_id = None
+        self.transcript_model.set_messages(page)
+        self.transcript.scrollToBottom()
+        self.select_session(session_id)
+        self.reset_context(page)
+        logger.info(f"Loaded chat session {session_id}")
+
+    def select_session(self, session_id: int):
+        """Show the session in the selector without reloading it"""
+        index = self.session_combo.findData(session_id)
+        if index >= 0 and index != self.session_combo.currentIndex():
+            self.session_combo.blockSignals(True)
+            self.session_combo.setCurrentIndex(index)
+            self.session_combo.blockSignals(False)
+
+    def jump_to_message(self, session_id: int, message_id: int):
+        """Open a session around one message, e.g. a search result"""
+        half_page = ChatSessionStore.PAGE_SIZE // 2
+        before = self.store.load_messages(session_id, before_id=message_id + 1, limit=half_page)
+        after = self.store.load_messages(session_id, after_id=message_id, limit=half_page)
+
+        self.session_id = session_id
+        self.has_older_messages = len(before) == half_page
+        self.has_newer_messages = len(after) == half_page
+        self.transcript.delegate.highlight_id = message_id
+        self.transcript_model.set_messages(before + after)
+        self.select_session(session_id)
+        self.reset_context(self.store.load_messages(session_id, limit=ChatSessionStore.PAGE_SIZE))
+
+        row = self.transcript_model.row_of(message_id)
+        if row >= 0:
+            self.transcript.scrollTo(
+                self.transcript_model.index(row),
+                QAbstractItemView.ScrollHint.PositionAtCenter
+            )
+
+    def load_older_messages(self):
+        """Prepend the previous page when the user scrolls to the top"""
+        if not self.has_older_messages or self.transcript_model.rowCount() == 0:
+            return
+        oldest_id = self.transcript_model.message(0)['id']
+        page = self.store.load_messages(self.session_id, before_id=oldest_id,
+                                        limit=ChatSessionStore.PAGE_SIZE)
+        self.has_older_messages = len(page) == ChatSessionStore.PAGE_SIZE
+        if page:
+            self.transcript_model.prepend_messages(page)
+            # Keep the message that was at the top in place
+            self.transcript.scrollTo(
+                self.transcript_model.index(len(page)),
+                QAbstractItemView.ScrollHint.PositionAtTop
+            )
+
+    def reset_context(self, recent_messages):
+        """Rebuild the prompt context from the session's summary and newest page"""
+        summary, summary_upto = self.store.load_summary(self.session_id)
+        self.context.reset(recent_messages, summary, summary_upto)
+
+    def count_tokens(self, text: str) -> int:
+        """Tokens of ``text`` for the selected model, the same estimate the pre-flight check uses"""
+        return get_token_budget(self.ollama_client).count(text, self.settings['model'].get())
+
+    def generate(self, prompt: str, context_length: int = None, model: str = None):
+        """Generate a reply, asking Ollama for the window the prompt was sized for
+        (or the larger one already in use, so the model isn't reloaded)"""
+        model = model or self.settings['model'].get()
+        if isinstance(self.ollama_client, OllamaClient):
+            num_ctx = get_token_budget(self.ollama_client).use_window(model, context_length)
+            return self.ollama_client.generate_response(prompt=prompt, model=model, num_ctx=num_ctx)
+        return self.ollama_client.generate_response(prompt=prompt, model=model)
+
+    def retrieve_knowledge(self, query: str) -> str:
+        """Top matching knowledge base excerpts for the prompt"""
+        from lifai.modules.rag import get_knowledge_base, format_knowledge
 
-    def load_chat_history(self):
-        """Load most recent chat history"""
         try:
-            history_files = sorted(self.history_dir.glob('chat_session_*.json'))
-            if history_files:
-                latest_file = history_files[-1]
-                with open(latest_file, 'r', encoding='utf-8') as f:
-                    self.chat_history = json.load(f)
-                    
-                # Restore messages from history
-                for msg in self.chat_history:
-                    self.add_message(msg['text'], msg['is_user'], save_history=False)
-                    
-                logger.info(f"Chat history loaded from {latest_file}")
-                
+            results = get_knowledge_base().search(query, self.ollama_client, k=5)
         except Exception as e:
-            logger.error(f"Error loading chat history: {e}")
-            self.chat_history = []
+            logger.error(f"Knowledge base search failed: {e}")
+            return ''
+        return format_knowledge(results, self.context.knowledge_budget * 4)
+
+    def schedule_summary(self):
+        """Fold turns that fell out of the budget into the summary, off the GUI thread"""
+        if self.summary_worker is not None:
+            return
+        request = self.context.summary_request()
+        if request is None:
+            return
+        session_id = self.session_id
+        context_length = self.context.context_length
+        model = self.settings['model'].get()
+        self.summary_worker = SummaryWorker(
+            lambda prompt: self.generate(prompt, context_length, model),
+            request['prompt'], request['upto'], self
+        )
+        self.summary_worker.summary_ready.connect(
+            lambda summary, upto: self.on_summary_ready(session_id, summary, upto)
+        )
+        self.summary_worker.finished.connect(self.on_summary_finished)
+        # Keep the summary from competing with the UI and the user's next turn
+        self.summary_worker.start(QThread.Priority.LowestPriority)
+
+    def on_summary_ready(self, session_id: int, summary: str, upto: int):
+        self.store.save_summary(session_id, summary, upto)
+        if session_id == self.session_id:
+            self.context.apply_summary(summary, upto)
+        logger.debug(f"Conversation summary updated for session {session_id} up to message {upto}")
+
+    def on_summary_finished(self):
+        self.summary_worker = None
+        # A long backlog is folded over several requests
+        self.schedule_summary()
+
+    def load_newer_messages(self):
+        """Append the next page when a jumped-to session is scrolled to the bottom"""
+        if not self.has_newer_messages or self.transcript_model.rowCount() == 0:
+            return
+        newest_id = self.transcript_model.message(self.transcript_model.rowCount() - 1)['id']
+        page = self.store.load_messages(self.session_id, after_id=newest_id,
+                                        limit=ChatSessionStore.PAGE_SIZE)
+        self.has_newer_messages = len(page) == ChatSessionStore.PAGE_SIZE
+        self.transcript_model.extend_messages(page)
+
+    def on_transcript_scroll(self, value: int):
+        scrollbar = self.transcript.verticalScrollBar()
+        if value == scrollbar.minimum():
+            self.load_older_messages()
+        elif value == scrollbar.maximum():
+            self.load_newer_messages()
+
+    def search_history(self):
+        """Search all sessions and list the matching messages"""
+        query = self.search_input.text().strip()
+        self.search_results.clear()
+        if not query:
+            self.search_results.hide()
+            return
+        try:
+            results = self.store.search(query)
+        except Exception as e:
+            logger.error(f"Error searching chat history: {e}")
+            results = []
+
+        for result in results:
+            when = datetime.fromtimestamp(result['created_at']).strftime('%Y-%m-%d %H:%M')
+            title = result['title'] or "New chat"
+            snippet = ' '.join(result['snippet'].split())
+            item = QListWidgetItem(f"{when}  {title}\n    {snippet}")
+            item.setData(Qt.ItemDataRole.UserRole, (result['session_id'], result['id']))
+            self.search_results.addItem(item)
+        if not results:
+            self.search_results.addItem("No matches")
+        self.search_results.show()
+
+    def on_search_text_changed(self, text: str):
+        if not text:
+            self.search_results.clear()
+            self.search_results.hide()
+
+    def on_search_result_clicked(self, item: QListWidgetItem):
+        target = item.data(Qt.ItemDataRole.UserRole)
+        if target:
+            self.jump_to_message(*target)
+
+    def on_session_selected(self, index: int):
+        session_id = self.session_combo.itemData(index)
+        if session_id is not None and session_id != self.session_id:
+            self.load_session(session_id)
+
+    def new_session(self):
+        """Start a new chat session"""
+        self.session_id = self.store.create_session()
+        self.refresh_sessions()
+        self.load_session(self.session_id)
 
     def closeEvent(self, event: QCloseEvent):
         """Prevent window from closing when X is clicked"""
@@ -160,28 +271,41 @@ class ChatWindow(QWidget):
         layout = QVBoxLayout()
         self.setLayout(layout)
         
-        # Chat area with scroll
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        # Session selector
+        session_layout = QHBoxLayout()
+        self.session_combo = QComboBox()
+        self.session_combo.currentIndexChanged.connect(self.on_session_selected)
+        session_layout.addWidget(self.session_combo, 1)
         
-        # Container for messages
-        self.chat_container = QWidget()
-        self.chat_layout = QVBoxLayout()
-        self.chat_layout.setSpacing(10)
-        self.chat_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.chat_container.setLayout(self.chat_layout)
+        new_chat_btn = QPushButton("New Chat")
+        new_chat_btn.clicked.connect(self.new_session)
+        session_layout.addWidget(new_chat_btn)
         
-        # Set background color for chat container
-        self.chat_container.setStyleSheet("""
-            QWidget {
-                background-color: #FFFFFF;
-            }
-        """)
+        self.use_knowledge = QCheckBox("Use knowledge base")
+        self.use_knowledge.setToolTip("Add matching excerpts from the documents indexed in Agent Workspace")
+        session_layout.addWidget(self.use_knowledge)
+        layout.addLayout(session_layout)
+        
+        # Search across all sessions
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search all chats...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.returnPressed.connect(self.search_history)
+        self.search_input.textChanged.connect(self.on_search_text_changed)
+        layout.addWidget(self.search_input)
         
-        scroll.setWidget(self.chat_container)
-        layout.addWidget(scroll)
+        self.search_results = QListWidget()
+        self.search_results.setMaximumHeight(160)
+        self.search_results.itemClicked.connect(self.on_search_result_clicked)
+        self.search_results.hide()
+        layout.addWidget(self.search_results)
+        
+        # Chat transcript (model/view, only visible messages are painted)
+        self.transcript_model = ChatTranscriptModel(self)
+        self.transcript = ChatTranscriptView()
+        self.transcript.setModel(self.transcript_model)
+        self.transcript.verticalScrollBar().valueChanged.connect(self.on_transcript_scroll)
+        layout.addWidget(self.transcript)
         
         # Input area
         input_layout = QHBoxLayout()
@@ -229,10 +353,6 @@ class ChatWindow(QWidget):
             QWidget {
                 background-color: #F0F0F0;
             }
-            QScrollArea {
-                border: none;
-                background-color: #FFFFFF;
-            }
             QPushButton {
                 background-color: #128C7E;
                 color: white;
@@ -242,7 +362,7 @@ class ChatWindow(QWidget):
             QPushButton:hover {
                 background-color: #075E54;
             }
-            QTextEdit {
+            QTextEdit, QLineEdit, QListWidget {
                 border: 1px solid #128C7E;
                 border-radius: 5px;
                 padding: 5px;
@@ -260,19 +380,25 @@ class ChatWindow(QWidget):
 
     def add_message(self, text: str, is_user: bool = True, save_history: bool = True):
         """Add a message to the chat"""
-        bubble = MessageBubble(text, is_user)
-        self.chat_layout.addWidget(bubble)
-        
+        if self.has_newer_messages:
+            # Viewing an older part of the session; go back to its end first
+            self.load_session(self.session_id)
         if save_history:
-            self.chat_history.append({"text": text, "is_user": is_user})
-            self.save_chat_history()
+            # Only the new message is written to the session store
+            message = self.store.append_message(self.session_id, text, is_user)
+            self.context.add_turn(message)
+            if self.session_combo.currentText().endswith("New chat") and is_user:
+                self.refresh_sessions()
+        else:
+            message = {"id": None, "text": text, "is_user": is_user}
+        self.transcript_model.append_message(message)
         
         # Auto scroll to bottom
-        QWidget.repaint(self.chat_container)
-        scroll_area = self.chat_container.parent().parent()
-        if isinstance(scroll_area, QScrollArea):
-            scroll_bar = scroll_area.verticalScrollBar()
-            scroll_bar.setValue(scroll_bar.maximum())
+        self.transcript.scrollToBottom()
+        
+        if save_history and not is_user:
+            # Summarize between turns, after the reply is on screen
+            self.schedule_summary()
 
     def send_message(self):
         """Send a message to the AI"""
@@ -287,11 +413,25 @@ class ChatWindow(QWidget):
         self.add_message(text, True)
         
         try:
-            # Get AI response
-            response = self.ollama_client.generate_response(
-                prompt=text,
-                model=self.settings['model'].get()
+            # Recent turns plus the rolling summary, sized to the model's context
+            self.context.set_context_length(
+                self.ollama_client.get_context_length(self.settings['model'].get())
             )
+            knowledge = self.retrieve_knowledge(text) if self.use_knowledge.isChecked() else ''
+            prompt = self.context.build_prompt(text, knowledge)
+
+            # The history is sized to the budget, but the message itself may not fit
+            model = self.settings['model'].get()
+            response_tokens = self.context.context_length - self.context.prompt_budget
+            preflight = get_token_budget(self.ollama_client).check(prompt, model, response_tokens)
+            if preflight.action == REFUSE:
+                self.add_message(f"{preflight.message}. Shorten the message or upload the text as a file.",
+                                 False, save_history=False)
+                return
+            if preflight.action == WARN:
+                logger.warning(preflight.message)
+            response = self.generate(prompt, max(self.context.context_length, preflight.context_length))
+            get_token_budget(self.ollama_client).observe(model, prompt, self.ollama_client.last_response_stats)
             
             if response:
                 # Add AI response
@@ -304,48 +444,49 @@ class ChatWindow(QWidget):
             self.add_message(f"Error: {str(e)}", False)
 
     def upload_file(self):
-        """Handle file upload"""
+        """Analyze a file with a streaming map-reduce over its chunks"""
+        if self.analysis_worker is not None:
+            return
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             "Select File",
             "",
-            "Text Files (*.txt);;PDF Files (*.pdf);;All Files (*.*)"
+            "Documents (*.txt *.log *.md *.csv *.json *.pdf *.docx *.html *.htm);;"
+            "Text Files (*.txt *.log *.md);;PDF Files (*.pdf);;Word Documents (*.docx);;"
+            "Web Pages (*.html *.htm);;All Files (*.*)"
         )
         
         if file_path:
-            try:
-                self.progress_bar.show()
-                self.progress_bar.setValue(0)
-                
-                # Read file content
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                self.progress_bar.setValue(50)
-                
-                # Add file upload message
-                filename = os.path.basename(file_path)
-                self.add_message(f"📄 Uploaded: {filename}", True)
-                
-                # Process file content
-                prompt = f"Please analyze this file content:\n\n{content}"
-                response = self.ollama_client.generate_response(
-                    prompt=prompt,
-                    model=self.settings['model'].get()
-                )
-                
-                self.progress_bar.setValue(100)
-                
-                if response:
-                    self.add_message(response, False)
-                else:
-                    self.add_message("Sorry, I couldn't analyze the file.", False)
-                    
-            except Exception as e:
-                logger.error(f"Error processing file: {e}")
-                self.add_message(f"Error processing file: {str(e)}", False)
-            finally:
-                self.progress_bar.hide()
+            self.add_message(f"📄 Uploaded: {os.path.basename(file_path)}", True)
+            
+            model = self.settings['model'].get()
+            self.context.set_context_length(self.ollama_client.get_context_length(model))
+            context_length = self.context.context_length
+            self.analysis_worker = FileAnalysisWorker(
+                file_path,
+                lambda prompt: self.generate(prompt, context_length, model),
+                self.context.prompt_budget,
+                self.history_dir / 'extracted',
+                count_tokens=self.count_tokens,
+                parent=self
+            )
+            self.analysis_worker.progress.connect(self.progress_bar.setValue)
+            self.analysis_worker.status.connect(lambda text: self.add_message(text, False, save_history=False))
+            self.analysis_worker.analysis_ready.connect(lambda result: self.add_message(result, False))
+            self.analysis_worker.analysis_failed.connect(
+                lambda error: self.add_message(f"Error processing file: {error}", False)
+            )
+            self.analysis_worker.finished.connect(self.on_analysis_finished)
+            
+            self.upload_btn.setEnabled(False)
+            self.progress_bar.setValue(0)
+            self.progress_bar.show()
+            self.analysis_worker.start()
+
+    def on_analysis_finished(self):
+        self.analysis_worker = None
+        self.upload_btn.setEnabled(True)
+        self.progress_bar.hide()
 
     def show(self):
         """Show the window"""
@@ -358,6 +499,12 @@ class ChatWindow(QWidget):
 
     def destroy(self):
         """Clean up resources"""
+        for worker in (self.summary_worker, self.analysis_worker):
+            if worker is not None:
+                # Results arriving after the store is closed are dropped
+                worker.blockSignals(True)
+                worker.wait(3000)
+        self.store.close()
         super().destroy()
 
     def eventFilter(self, source, event):
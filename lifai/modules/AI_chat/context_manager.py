@@ -0,0 +1,165 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+from typing import Callable, Dict, List, Optional
+from lifai.utils.logger_utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token), for callers without a model"""
+    return len(text) // 4 + 1
+
+class ConversationContext:
+    """Builds chat prompts that fit the model's context window.
+
+    Recent turns are kept verbatim, newest first, until the budget is used
+    up. Turns that no longer fit are folded into a rolling summary by
+    ``SummaryWorker`` between user turns; until that happens they are simply
+    left out, so the prompt never grows with the length of the session.
+    Tokens are counted with ``count_tokens``; the chat passes the model's
+    calibrated ``TokenBudget.count`` so the history is sized with the same
+    estimate as the pre-flight check.
+    """
+    DEFAULT_CONTEXT_LENGTH = 4096
+    # Larger windows are allowed by many models but make every turn slower
+    MAX_CONTEXT_LENGTH = 8192
+    RESPONSE_RATIO = 0.25      # share of the window left for the reply
+    MAX_RESPONSE_TOKENS = 1024
+    SUMMARY_RATIO = 0.2        # share of the prompt budget for the summary
+    KNOWLEDGE_RATIO = 0.3      # share of the prompt budget for retrieved excerpts
+
+    def __init__(self, context_length: int = DEFAULT_CONTEXT_LENGTH,
+                 count_tokens: Optional[Callable[[str], int]] = None):
+        self.count_tokens = count_tokens or estimate_tokens
+        self.turns: List[Dict] = []
+        self.summary = ''
+        self.summary_upto = 0  # id of the last message folded into the summary
+        self.set_context_length(context_length)
+
+    def set_context_length(self, context_length: Optional[int]):
+        self.context_length = min(context_length or self.DEFAULT_CONTEXT_LENGTH, self.MAX_CONTEXT_LENGTH)
+        response_tokens = min(int(self.context_length * self.RESPONSE_RATIO), self.MAX_RESPONSE_TOKENS)
+        self.prompt_budget = self.context_length - response_tokens
+        self.summary_budget = int(self.prompt_budget * self.SUMMARY_RATIO)
+        self.knowledge_budget = int(self.prompt_budget * self.KNOWLEDGE_RATIO)
+
+    def reset(self, messages: List[Dict], summary: str = '', summary_upto: int = 0):
+        """Start from stored messages (oldest first) and a stored summary"""
+        self.summary = summary
+        self.summary_upto = summary_upto
+        self.turns = [dict(msg, tokens=self.count_tokens(msg['text'])) for msg in messages
+                      if msg.get('id') is not None and msg['id'] > summary_upto]
+
+    def add_turn(self, message: Dict):
+        if message.get('id') is None:
+            return
+        self.turns.append(dict(message, tokens=self.count_tokens(message['text'])))
+
+    @staticmethod
+    def _format_turn(turn: Dict) -> str:
+        return f"{'User' if turn['is_user'] else 'Assistant'}: {turn['text']}"
+
+    def _recent_start(self, budget: int) -> int:
+        """Index of the oldest turn that still fits in ``budget`` tokens"""
+        start = len(self.turns)
+        for index in range(len(self.turns) - 1, -1, -1):
+            budget -= self.turns[index]['tokens']
+            if budget < 0:
+                break
+            start = index
+        return start
+
+    def _recent_budget(self, reserved: int = 0) -> int:
+        summary_tokens = min(self.count_tokens(self.summary), self.summary_budget) if self.summary else 0
+        return max(self.prompt_budget - summary_tokens - reserved, 0)
+
+    def build_prompt(self, text: str, knowledge: str = '') -> str:
+        """Prompt for the next reply; ``text`` is the new user message.
+
+        The new message is expected to be the last turn already added.
+        ``knowledge`` holds retrieved excerpts, trimmed to ``knowledge_budget``.
+        """
+        knowledge = knowledge[:self.knowledge_budget * 4]
+        reserved = self.count_tokens(knowledge) if knowledge else 0
+        recent = self.turns[self._recent_start(self._recent_budget(reserved)):]
+        if not recent or recent[-1]['text'] != text:
+            # The new message did not fit or was not stored; send it on its own
+            recent = [{'text': text, 'is_user': True}]
+
+        if len(recent) == 1 and not self.summary and not knowledge:
+            return text
+
+        parts = []
+        if knowledge:
+            parts.append(f"Relevant excerpts from the knowledge base:\n{knowledge}")
+        if self.summary:
+            parts.append(f"Summary of the earlier conversation:\n{self.summary}")
+        if len(recent) > 1:
+            parts.append("Conversation:\n" + '\n\n'.join(self._format_turn(turn) for turn in recent[:-1]))
+        parts.append(f"User: {text}\n\nAssistant:")
+        return '\n\n'.join(parts)
+
+    def pending_turns(self) -> List[Dict]:
+        """Turns that no longer fit verbatim and are not summarized yet.
+
+        Room for a typical next message is reserved so the summary catches
+        up before a turn is dropped.
+        """
+        start = self._recent_start(self._recent_budget(reserved=self.summary_budget))
+        return self.turns[:start]
+
+    def needs_summary(self) -> bool:
+        return bool(self.pending_turns())
+
+    def summary_request(self) -> Optional[Dict]:
+        """Prompt that folds the oldest pending turns into the summary.
+
+        Input is capped at half the prompt budget; a long backlog is folded
+        over several requests.
+        """
+        pending = self.pending_turns()
+        if not pending:
+            return None
+        budget = self.prompt_budget // 2 - self.count_tokens(self.summary)
+        batch = []
+        for turn in pending:
+            if batch and budget - turn['tokens'] < 0:
+                break
+            budget -= turn['tokens']
+            batch.append(turn)
+
+        words = max(int(self.summary_budget * 0.75), 50)
+        prompt = (
+            f"Update the summary of a conversation between a user and an assistant. "
+            f"Keep facts, decisions, names and open questions. Use at most {words} words. "
+            f"Reply with the summary only.\n\n"
+            f"Current summary:\n{self.summary or '(none)'}\n\n"
+            f"New messages:\n" + '\n\n'.join(self._format_turn(turn)[:self.prompt_budget * 2] for turn in batch)
+        )
+        return {'prompt': prompt, 'upto': batch[-1]['id']}
+
+    def apply_summary(self, summary: str, upto: int):
+        """Replace the summary and drop the turns it now covers"""
+        if upto <= self.summary_upto:
+            return
+        # Models do not always respect the word limit
+        self.summary = summary.strip()[:self.summary_budget * 4]
+        self.summary_upto = upto
+        self.turns = [turn for turn in self.turns if turn['id'] > upto]
+
+class SummaryWorker(QThread):
+    """Generates a rolling summary off the GUI thread at low priority"""
+    summary_ready = pyqtSignal(str, int)
+
+    def __init__(self, generate: Callable[[str], Optional[str]], prompt: str, upto: int, parent=None):
+        super().__init__(parent)
+        self.generate = generate
+        self.prompt = prompt
+        self.upto = upto
+
+    def run(self):
+        try:
+            summary = self.generate(self.prompt)
+            if summary:
+                self.summary_ready.emit(summary, self.upto)
+        except Exception as e:
+            logger.error(f"Error summarizing conversation: {e}")
@@ -0,0 +1,168 @@
+import hashlib
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+from xml.etree import ElementTree
+from lifai.utils.logger_utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+PDF_PAGES_PER_TASK = 16
+# Below this page count the process start-up costs more than it saves
+PDF_PARALLEL_MIN_PAGES = 32
+
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+@dataclass
+class ExtractedDocument:
+    """Plain-text version of an uploaded document"""
+    text_path: str
+    kind: str
+    pages: int
+    seconds: float
+    cached: bool
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.seconds if self.seconds > 0 else 0.0
+
+    def describe(self) -> str:
+        if self.kind == 'text':
+            return ''
+        if self.cached:
+            return f"Using cached text of this {self.kind.upper()} ({self.pages} pages)"
+        return (f"Extracted {self.pages} pages from {self.kind.upper()} in {self.seconds:.1f} s "
+                f"({self.pages_per_second:.1f} pages/s)")
+
+def file_sha256(path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def document_kind(path: str) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix == '.pdf':
+        return 'pdf'
+    if suffix == '.docx':
+        return 'docx'
+    if suffix in ('.html', '.htm', '.xhtml'):
+        return 'html'
+    return 'text'
+
+def _pdf_reader(path: str):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise RuntimeError("Reading PDF files needs the pypdf package (pip install pypdf)")
+    return PdfReader(path)
+
+def _extract_pdf_pages(path: str, start: int, end: int) -> List[str]:
+    """Text of pages [start, end); runs in a worker process"""
+    reader = _pdf_reader(path)
+    pages = []
+    for index in range(start, end):
+        try:
+            pages.append(reader.pages[index].extract_text() or '')
+        except Exception as e:
+            pages.append(f"[Page {index + 1} could not be read: {e}]")
+    return pages
+
+def _extract_pdf(path: str, out, max_workers: int = None) -> int:
+    page_count = len(_pdf_reader(path).pages)
+    ranges = [(start, min(start + PDF_PAGES_PER_TASK, page_count))
+              for start in range(0, page_count, PDF_PAGES_PER_TASK)]
+
+    def write(pages: List[str], start: int):
+        for offset, text in enumerate(pages):
+            out.write(f"\n--- Page {start + offset + 1} ---\n{text}\n")
+
+    if page_count < PDF_PARALLEL_MIN_PAGES:
+        for start, end in ranges:
+            write(_extract_pdf_pages(path, start, end), start)
+        return page_count
+
+    workers = min(max_workers or os.cpu_count() or 1, len(ranges))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() yields in submission order, so pages are written in order
+        results = pool.map(_extract_pdf_pages, [path] * len(ranges),
+                           [start for start, _ in ranges], [end for _, end in ranges])
+        for (start, _), pages in zip(ranges, results):
+            write(pages, start)
+    return page_count
+
+def _extract_docx(path: str, out) -> int:
+    """Paragraph text of a .docx; pages are counted from Word's page breaks"""
+    with zipfile.ZipFile(path) as archive:
+        with archive.open('word/document.xml') as f:
+            pages = 1
+            for _, element in ElementTree.iterparse(f):
+                if element.tag == f'{WORD_NS}lastRenderedPageBreak':
+                    pages += 1
+                elif element.tag == f'{WORD_NS}br' and element.get(f'{WORD_NS}type') == 'page':
+                    pages += 1
+                elif element.tag == f'{WORD_NS}p':
+                    text = ''.join(node.text or '' for node in element.iter(f'{WORD_NS}t'))
+                    if text:
+                        out.write(text + '\n')
+                    # Paragraphs are written as they end; free the parsed tree
+                    element.clear()
+    return pages
+
+def _extract_html(path: str, out) -> int:
+    from bs4 import BeautifulSoup
+
+    with open(path, 'rb') as f:
+        soup = BeautifulSoup(f, 'html.parser')
+    for tag in soup(['script', 'style', 'noscript']):
+        tag.decompose()
+    text = soup.get_text('\n')
+    out.write(re.sub(r'\n\s*\n+', '\n\n', text).strip() + '\n')
+    return 1
+
+def extract_document(path: str, cache_dir: Path) -> ExtractedDocument:
+    """Convert a document to a UTF-8 text file, cached by content hash.
+
+    Plain text files are returned as they are. Other formats are extracted
+    once into ``cache_dir/<sha256>.txt``; uploading the same content again,
+    under any name, reuses that file.
+    """
+    kind = document_kind(path)
+    if kind == 'text':
+        return ExtractedDocument(path, kind, 0, 0.0, cached=False)
+
+    start_time = time.perf_counter()
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    digest = file_sha256(path)
+    text_path = cache_dir / f'{digest}.txt'
+    meta_path = cache_dir / f'{digest}.pages'
+    if text_path.exists() and meta_path.exists():
+        pages = int(meta_path.read_text() or 0)
+        logger.info(f"Using cached extraction of {path} ({digest[:12]})")
+        return ExtractedDocument(str(text_path), kind, pages, time.perf_counter() - start_time, cached=True)
+
+    partial_path = cache_dir / f'{digest}.txt.partial'
+    try:
+        with open(partial_path, 'w', encoding='utf-8') as out:
+            if kind == 'pdf':
+                pages = _extract_pdf(path, out)
+            elif kind == 'docx':
+                pages = _extract_docx(path, out)
+            else:
+                pages = _extract_html(path, out)
+    except Exception:
+        partial_path.unlink(missing_ok=True)
+        raise
+    os.replace(partial_path, text_path)
+    meta_path.write_text(str(pages))
+
+    result = ExtractedDocument(str(text_path), kind, pages, time.perf_counter() - start_time, cached=False)
+    logger.info(f"{result.describe()} ({path})")
+    return result
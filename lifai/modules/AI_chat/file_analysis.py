@@ -0,0 +1,269 @@
+import codecs
+import math
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from PyQt6.QtCore import QThread, pyqtSignal
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from lifai.modules.AI_chat.context_manager import estimate_tokens
+from lifai.modules.AI_chat.document_extract import extract_document
+from lifai.utils.token_budget import split_text
+from lifai.utils.logger_utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+MAP_PROMPT = """You are analyzing part {part} of about {total} of the file "{name}".
+Summarize what this part contains. List errors, warnings, anomalies, key facts
+and numbers, with line excerpts where useful. Be concise; if the part contains
+nothing notable, say so in one line.
+
+--- Part {part} ---
+{text}"""
+
+REDUCE_PROMPT = """Below are partial analyses of consecutive sections of the file "{name}".
+Merge them into one concise analysis that keeps every error, anomaly and key
+fact, removes repetition and keeps the order in which things happen.
+
+{text}"""
+
+FINAL_PROMPT = """Below are analyses of the file "{name}", in file order.
+Write the final analysis of the whole file: an overview of what it contains,
+then the most important findings (errors, anomalies, key facts) and anything
+that needs attention.
+
+{text}"""
+
+SINGLE_PROMPT = "Please analyze this file content:\n\n{text}"
+
+def iter_text_chunks(path: str, chunk_chars: int, block_size: int = 1 << 20,
+                     mmap_threshold: int = 8 << 20) -> Iterator[Tuple[str, int]]:
+    """Yield ``(text, bytes_read)`` chunks of about ``chunk_chars`` characters.
+
+    The file is decoded incrementally and chunks end at a line break where
+    possible, so memory use depends on the chunk size, not the file size.
+    Files above ``mmap_threshold`` are read through mmap.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        if size >= mmap_threshold:
+            source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            blocks = (source[offset:offset + block_size] for offset in range(0, size, block_size))
+        else:
+            source = None
+            blocks = iter(lambda: f.read(block_size), b'')
+
+        try:
+            buffer = ''
+            bytes_read = 0
+            for block in blocks:
+                bytes_read += len(block)
+                buffer += decoder.decode(block)
+                while len(buffer) >= chunk_chars:
+                    cut = buffer.rfind('\n', chunk_chars // 2, chunk_chars)
+                    cut = chunk_chars if cut < 0 else cut + 1
+                    yield buffer[:cut], bytes_read
+                    buffer = buffer[cut:]
+            buffer += decoder.decode(b'', final=True)
+            if buffer.strip():
+                yield buffer, bytes_read
+        finally:
+            if source is not None:
+                source.close()
+
+class StreamingReducer:
+    """Hierarchical reduce that runs while partial results stream in.
+
+    Results are grouped in file order; a group is reduced as soon as it
+    fills up, and the reduced text joins the next level. Only one partial
+    group per level is held, so memory stays flat however many chunks the
+    file has.
+    """
+
+    def __init__(self, reduce: Callable[[List[str]], str], fan_in: int, max_tokens: int,
+                 count_tokens: Callable[[str], int] = estimate_tokens):
+        self.reduce = reduce
+        self.fan_in = fan_in
+        self.max_tokens = max_tokens
+        self.count_tokens = count_tokens
+        self.levels: List[List[str]] = []
+
+    def add(self, text: str, level: int = 0):
+        if level == len(self.levels):
+            self.levels.append([])
+        group = self.levels[level]
+        # Reduce early if the next result would overflow the reduce prompt
+        if group and sum(map(self.count_tokens, group)) + self.count_tokens(text) > self.max_tokens:
+            self.levels[level] = []
+            self.add(self.reduce(group), level + 1)
+            group = self.levels[level]
+        group.append(text)
+        if len(group) >= self.fan_in:
+            self.levels[level] = []
+            self.add(self.reduce(group), level + 1)
+
+    def finish(self) -> List[str]:
+        """Fold the partial groups upwards; returns the top-level texts in order"""
+        level = 0
+        while level < len(self.levels) - 1:
+            group = self.levels[level]
+            self.levels[level] = []
+            if group:
+                self.add(group[0] if len(group) == 1 else self.reduce(group), level + 1)
+            level += 1
+        return self.levels[-1] if self.levels else []
+
+class FileAnalysisWorker(QThread):
+    """Map-reduce analysis of a document that may not fit in one prompt.
+
+    Chunks are sized to the model's prompt budget and analyzed concurrently
+    by a bounded thread pool; at most ``max_workers * 2`` chunks are read
+    ahead of the results, so a huge file never sits in memory. Tokens are
+    counted with ``count_tokens`` (the chat passes the model's calibrated
+    estimate): characters per token are measured on the start of the file
+    to size chunks, and a chunk that still doesn't fit is split further, so
+    dense text such as CJK or logs can't overflow the window.
+    """
+    progress = pyqtSignal(int)          # percent
+    status = pyqtSignal(str)
+    analysis_ready = pyqtSignal(str)
+    analysis_failed = pyqtSignal(str)
+
+    FAN_IN = 8
+    MAP_SHARE = 90   # percent of the progress bar used by the map phase
+    TEMPLATE_TOKENS = 200   # room for the prompt template around each chunk
+    SAMPLE_CHARS = 64 * 1024
+
+    def __init__(self, path: str, generate: Callable[[str], Optional[str]],
+                 prompt_budget: int, cache_dir: str, max_workers: int = 4,
+                 count_tokens: Optional[Callable[[str], int]] = None, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.cache_dir = cache_dir
+        self.name = os.path.basename(path)
+        self.generate = generate
+        self.max_workers = max_workers
+        self.count_tokens = count_tokens or estimate_tokens
+        self.chunk_tokens = max(prompt_budget - self.TEMPLATE_TOKENS, 500)
+        self.reduce_tokens = self.chunk_tokens
+        # About four characters per token until the file has been sampled
+        self.chunk_chars = self.chunk_tokens * 4
+        self.reduce_count = 0
+
+    def _calibrate(self, text_path: str):
+        """Size chunks by the characters per token of the start of the file"""
+        with open(text_path, 'r', encoding='utf-8', errors='replace') as f:
+            sample = f.read(self.SAMPLE_CHARS)
+        tokens = self.count_tokens(sample) if sample else 0
+        if tokens:
+            chars_per_token = min(len(sample) / tokens, 4.0)
+            self.chunk_chars = max(int(self.chunk_tokens * chars_per_token), 200)
+
+    def _fit(self, chunks):
+        """Split chunks that are denser than the sample so each fits the budget"""
+        for text, bytes_read in chunks:
+            if self.count_tokens(text) <= self.chunk_tokens:
+                yield text, bytes_read
+                continue
+            for piece in split_text(text, self.chunk_tokens, self.count_tokens):
+                yield piece, bytes_read
+
+    def _generate(self, prompt: str) -> str:
+        result = self.generate(prompt)
+        if not result:
+            raise RuntimeError("The model returned no response")
+        return result
+
+    def _map(self, part: int, total: int, text: str) -> str:
+        return self._generate(MAP_PROMPT.format(part=part, total=total, name=self.name, text=text))
+
+    def _reduce(self, texts: List[str]) -> str:
+        self.reduce_count += 1
+        joined = '\n\n'.join(f"--- Section {index} ---\n{text}" for index, text in enumerate(texts, 1))
+        return self._generate(REDUCE_PROMPT.format(name=self.name, text=joined))
+
+    def run(self):
+        try:
+            self.progress.emit(0)
+            # PDF, DOCX and HTML are converted to text first (cached by content hash)
+            document = extract_document(self.path, self.cache_dir)
+            if document.describe():
+                self.status.emit(document.describe())
+            size = os.path.getsize(document.text_path)
+            self._calibrate(document.text_path)
+            chunks = self._fit(iter_text_chunks(document.text_path, self.chunk_chars))
+
+            first = next(chunks, None)
+            if first is None:
+                self.analysis_failed.emit("The file is empty")
+                return
+            second = next(chunks, None)
+            if second is None:
+                # Fits in a single prompt
+                self.progress.emit(50)
+                self.analysis_ready.emit(self._generate(SINGLE_PROMPT.format(text=first[0])))
+                self.progress.emit(100)
+                return
+
+            # UTF-8 text has at least one byte per character, so this is an upper bound
+            total = max(math.ceil(size / self.chunk_chars), 2)
+            result = self._map_reduce(self._chain(first, second, chunks), size, total)
+            self.progress.emit(100)
+            self.analysis_ready.emit(result)
+        except Exception as e:
+            logger.error(f"Error analyzing file {self.path}: {e}")
+            self.analysis_failed.emit(str(e))
+
+    @staticmethod
+    def _chain(first, second, rest):
+        yield first
+        yield second
+        yield from rest
+
+    def _map_reduce(self, chunks, size: int, total: int) -> str:
+        reducer = StreamingReducer(self._reduce, self.FAN_IN, self.reduce_tokens, self.count_tokens)
+        results: Dict[int, str] = {}
+        next_to_reduce = 0
+        failed = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='file-analysis') as pool:
+            in_flight = {}
+            exhausted = False
+            part = 0
+            while in_flight or not exhausted:
+                # Read ahead only as far as the pool can work
+                while not exhausted and len(in_flight) < self.max_workers * 2:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    in_flight[pool.submit(self._map, part + 1, total, chunk[0])] = part
+                    part += 1
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = in_flight.pop(future)
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:
+                        logger.warning(f"Part {index + 1} of {self.name} could not be analyzed: {e}")
+                        results[index] = f"(Part {index + 1} could not be analyzed)"
+                        failed += 1
+
+                # Feed finished parts to the reducer in file order
+                while next_to_reduce in results:
+                    reducer.add(results.pop(next_to_reduce))
+                    next_to_reduce += 1
+                expected = part if exhausted else max(total, part)
+                self.progress.emit(int(self.MAP_SHARE * next_to_reduce / expected))
+
+        if failed == part:
+            raise RuntimeError("None of the file's parts could be analyzed")
+        logger.info(f"Analyzed {self.name} ({size} bytes) in {part} parts, "
+                    f"{self.reduce_count} reduce steps, {failed} failed")
+
+        remaining = reducer.finish()
+        joined = '\n\n'.join(f"--- Section {index} ---\n{text}" for index, text in enumerate(remaining, 1))
+        return self._generate(FINAL_PROMPT.format(name=self.name, text=joined))
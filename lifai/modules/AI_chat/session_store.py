@@ -0,0 +1,310 @@
+import json
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from lifai.utils.logger_utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+class ChatSessionStore:
+    """SQLite (WAL) store for chat sessions.
+
+    Adding a message inserts a single row instead of rewriting the session.
+    The database runs with ``synchronous=NORMAL``: every commit lands in the
+    write-ahead log, which survives an application crash, and the log is only
+    fsynced when it is checkpointed. ``sync_every`` bounds how many messages
+    can be lost on power failure by checkpointing after that many appends.
+
+    Messages are mirrored into an FTS5 index by triggers, so search stays
+    current as messages are added. Without FTS5 search falls back to LIKE.
+    """
+    PAGE_SIZE = 200
+    SEARCH_LIMIT = 50
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL DEFAULT '',
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+            text TEXT NOT NULL,
+            is_user INTEGER NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_messages_session ON messages(session_id, id);
+        CREATE TABLE IF NOT EXISTS legacy_imports (
+            filename TEXT PRIMARY KEY
+        );
+        CREATE TABLE IF NOT EXISTS session_summaries (
+            session_id INTEGER PRIMARY KEY REFERENCES sessions(id) ON DELETE CASCADE,
+            summary TEXT NOT NULL,
+            upto_id INTEGER NOT NULL
+        );
+    """
+
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE messages_fts USING fts5(
+            text, content='messages', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+        );
+        CREATE TRIGGER messages_fts_insert AFTER INSERT ON messages BEGIN
+            INSERT INTO messages_fts(rowid, text) VALUES (new.id, new.text);
+        END;
+        CREATE TRIGGER messages_fts_delete AFTER DELETE ON messages BEGIN
+            INSERT INTO messages_fts(messages_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        END;
+        CREATE TRIGGER messages_fts_update AFTER UPDATE OF text ON messages BEGIN
+            INSERT INTO messages_fts(messages_fts, rowid, text) VALUES ('delete', old.id, old.text);
+            INSERT INTO messages_fts(rowid, text) VALUES (new.id, new.text);
+        END;
+    """
+
+    def __init__(self, db_path: Path, sync_every: int = 20):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.sync_every = sync_every
+        self.unsynced = 0
+
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(self.SCHEMA)
+        self.fts_enabled = self._ensure_fts()
+        self.conn.commit()
+
+    def _ensure_fts(self) -> bool:
+        """Create the full-text index if needed; False if FTS5 is unavailable"""
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'messages_fts'"
+        ).fetchone()
+        if exists:
+            return True
+        try:
+            self.conn.executescript(self.FTS_SCHEMA)
+            # Index messages stored before the index existed
+            self.conn.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 not available, chat search will scan messages: {e}")
+            return False
+
+    @staticmethod
+    def _message(row) -> Dict:
+        return {
+            'id': row['id'],
+            'text': row['text'],
+            'is_user': bool(row['is_user']),
+            'created_at': row['created_at']
+        }
+
+    def create_session(self, title: str = '', created_at: float = None) -> int:
+        now = created_at or time.time()
+        cursor = self.conn.execute(
+            "INSERT INTO sessions (title, created_at, updated_at) VALUES (?, ?, ?)",
+            (title, now, now)
+        )
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def list_sessions(self) -> List[Dict]:
+        """All sessions, most recently updated first"""
+        rows = self.conn.execute(
+            "SELECT id, title, created_at, updated_at FROM sessions ORDER BY updated_at DESC, id DESC"
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def latest_session_id(self) -> Optional[int]:
+        row = self.conn.execute(
+            "SELECT id FROM sessions ORDER BY updated_at DESC, id DESC LIMIT 1"
+        ).fetchone()
+        return row['id'] if row else None
+
+    def append_message(self, session_id: int, text: str, is_user: bool) -> Dict:
+        """Append one message and return it with its id"""
+        now = time.time()
+        cursor = self.conn.execute(
+            "INSERT INTO messages (session_id, text, is_user, created_at) VALUES (?, ?, ?, ?)",
+            (session_id, text, int(is_user), now)
+        )
+        # Name the session after its first user message
+        self.conn.execute(
+            "UPDATE sessions SET updated_at = ?, "
+            "title = CASE WHEN title = '' AND ? THEN ? ELSE title END WHERE id = ?",
+            (now, int(is_user), text[:60].replace('\n', ' '), session_id)
+        )
+        self.conn.commit()
+
+        self.unsynced += 1
+        if self.unsynced >= self.sync_every:
+            self.sync()
+
+        return {'id': cursor.lastrowid, 'text': text, 'is_user': bool(is_user), 'created_at': now}
+
+    def append_messages(self, session_id: int, messages: List[Dict], created_at: float = None):
+        """Bulk insert messages (``text``/``is_user`` dicts) in one transaction"""
+        now = created_at or time.time()
+        self.conn.executemany(
+            "INSERT INTO messages (session_id, text, is_user, created_at) VALUES (?, ?, ?, ?)",
+            ((session_id, msg['text'], int(msg['is_user']), now) for msg in messages)
+        )
+        self.conn.execute("UPDATE sessions SET updated_at = ? WHERE id = ?", (now, session_id))
+        self.conn.commit()
+
+    def load_messages(self, session_id: int, before_id: int = None,
+                      limit: int = PAGE_SIZE, after_id: int = None) -> List[Dict]:
+        """Load a page of messages, oldest first.
+
+        By default this is the newest page older than ``before_id``; with
+        ``after_id`` it is the oldest page newer than that message.
+        """
+        if after_id is not None:
+            rows = self.conn.execute(
+                "SELECT * FROM messages WHERE session_id = ? AND id > ? ORDER BY id LIMIT ?",
+                (session_id, after_id, limit)
+            ).fetchall()
+            return [self._message(row) for row in rows]
+        if before_id is None:
+            rows = self.conn.execute(
+                "SELECT * FROM messages WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+                (session_id, limit)
+            ).fetchall()
+        else:
+            rows = self.conn.execute(
+                "SELECT * FROM messages WHERE session_id = ? AND id < ? ORDER BY id DESC LIMIT ?",
+                (session_id, before_id, limit)
+            ).fetchall()
+        return [self._message(row) for row in reversed(rows)]
+
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        """Turn free text into an FTS5 query matching all terms.
+
+        Terms ending in ``*`` are prefix matches (prefixes of 2-4 characters
+        are indexed); plain terms are matched exactly, which keeps queries
+        fast on large archives.
+        """
+        terms = re.findall(r'(\w+)(\*?)', query, flags=re.UNICODE)
+        return ' '.join(f'"{term}"{star}' for term, star in terms)
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT) -> List[Dict]:
+        """Search all sessions, newest matches first"""
+        if self.fts_enabled:
+            fts_query = self._fts_query(query)
+            if not fts_query:
+                return []
+            # Resolve the newest matches inside the index first; joining before
+            # the LIMIT makes SQLite walk every match of common terms
+            rows = self.conn.execute(
+                """
+                WITH hits AS (
+                    SELECT rowid AS id, snippet(messages_fts, 0, '[', ']', '…', 12) AS snippet
+                    FROM messages_fts
+                    WHERE messages_fts MATCH ?
+                    ORDER BY rowid DESC
+                    LIMIT ?
+                )
+                SELECT m.id, m.session_id, m.is_user, m.created_at, s.title, hits.snippet
+                FROM hits
+                JOIN messages m ON m.id = hits.id
+                JOIN sessions s ON s.id = m.session_id
+                ORDER BY m.id DESC
+                """,
+                (fts_query, limit)
+            ).fetchall()
+        else:
+            if not query.strip():
+                return []
+            rows = self.conn.execute(
+                """
+                SELECT m.id, m.session_id, m.is_user, m.created_at, s.title,
+                       substr(m.text, 1, 120) AS snippet
+                FROM messages m JOIN sessions s ON s.id = m.session_id
+                WHERE m.text LIKE ?
+                ORDER BY m.id DESC
+                LIMIT ?
+                """,
+                (f'%{query.strip()}%', limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def load_summary(self, session_id: int) -> Tuple[str, int]:
+        """Rolling summary of a session and the last message id it covers"""
+        row = self.conn.execute(
+            "SELECT summary, upto_id FROM session_summaries WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return (row['summary'], row['upto_id']) if row else ('', 0)
+
+    def save_summary(self, session_id: int, summary: str, upto_id: int):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO session_summaries (session_id, summary, upto_id) VALUES (?, ?, ?)",
+            (session_id, summary, upto_id)
+        )
+        self.conn.commit()
+
+    def count_messages(self, session_id: int) -> int:
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM messages WHERE session_id = ?", (session_id,)
+        ).fetchone()[0]
+
+    def sync(self):
+        """Checkpoint the WAL so appended messages are fsynced to disk"""
+        try:
+            self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            self.unsynced = 0
+        except sqlite3.Error as e:
+            logger.error(f"Error checkpointing chat store: {e}")
+
+    def close(self):
+        try:
+            self.conn.commit()
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Error closing chat store: {e}")
+
+    def import_legacy_sessions(self, history_dir: Path):
+        """Import the old chat_session_*.json snapshots once.
+
+        The old code wrote a full snapshot of the session on every message,
+        so a file whose messages are a prefix of the next file is an earlier
+        snapshot of the same session and is skipped.
+        """
+        files = sorted(Path(history_dir).glob('chat_session_*.json'))
+        imported = {row['filename'] for row in self.conn.execute("SELECT filename FROM legacy_imports")}
+        pending = [f for f in files if f.name not in imported]
+        if not pending:
+            return
+
+        snapshots = []
+        for path in files:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    snapshots.append((path, json.load(f)))
+            except Exception as e:
+                logger.error(f"Error reading legacy chat history {path}: {e}")
+
+        for index, (path, messages) in enumerate(snapshots):
+            if path.name in imported:
+                continue
+            next_messages = snapshots[index + 1][1] if index + 1 < len(snapshots) else None
+            is_prefix = next_messages is not None and next_messages[:len(messages)] == messages
+            if messages and not is_prefix:
+                created_at = path.stat().st_mtime
+                session_id = self.create_session(created_at=created_at)
+                self.append_messages(session_id, messages, created_at=created_at)
+                first_user = next((m['text'] for m in messages if m['is_user']), '')
+                self.conn.execute(
+                    "UPDATE sessions SET title = ?, updated_at = ? WHERE id = ?",
+                    (first_user[:60].replace('\n', ' '), created_at, session_id)
+                )
+            self.conn.execute("INSERT INTO legacy_imports (filename) VALUES (?)", (path.name,))
+        self.conn.commit()
+        logger.info(f"Imported {len(pending)} legacy chat history files")
@@ -0,0 +1,213 @@
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QRectF, QPointF
+from PyQt6.QtGui import (QFont, QColor, QPainter, QPalette, QPen, QTextDocument, QTextOption,
+                         QAbstractTextDocumentLayout)
+from collections import OrderedDict
+from typing import Dict, List
+
+class ChatTranscriptModel(QAbstractListModel):
+    """List model holding the chat messages shown in the transcript"""
+    IsUserRole = Qt.ItemDataRole.UserRole + 1
+    MessageRole = Qt.ItemDataRole.UserRole + 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._messages: List[Dict] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._messages)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        message = self._messages[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return message['text']
+        if role == self.IsUserRole:
+            return message['is_user']
+        if role == self.MessageRole:
+            return message
+        return None
+
+    def message(self, row: int) -> Dict:
+        return self._messages[row]
+
+    def append_message(self, message: Dict):
+        row = len(self._messages)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._messages.append(message)
+        self.endInsertRows()
+
+    def prepend_messages(self, messages: List[Dict]):
+        """Insert older messages at the top of the transcript"""
+        if not messages:
+            return
+        self.beginInsertRows(QModelIndex(), 0, len(messages) - 1)
+        self._messages[0:0] = messages
+        self.endInsertRows()
+
+    def extend_messages(self, messages: List[Dict]):
+        """Append a page of newer messages at the bottom of the transcript"""
+        if not messages:
+            return
+        row = len(self._messages)
+        self.beginInsertRows(QModelIndex(), row, row + len(messages) - 1)
+        self._messages.extend(messages)
+        self.endInsertRows()
+
+    def row_of(self, message_id: int) -> int:
+        """Row of the message with the given id, or -1"""
+        for row, message in enumerate(self._messages):
+            if message.get('id') == message_id:
+                return row
+        return -1
+
+    def set_messages(self, messages: List[Dict]):
+        self.beginResetModel()
+        self._messages = list(messages)
+        self.endResetModel()
+
+class MessageDelegate(QStyledItemDelegate):
+    """Paints chat bubbles and caches their measured heights.
+
+    Only rows the view asks about are laid out, and each message is measured
+    once per viewport width, so scrolling a long session stays cheap.
+    """
+    USER_COLOR = QColor('#DCF8C6')
+    AI_COLOR = QColor('#E8E8E8')
+    TEXT_COLOR = QColor('#000000')
+    HIGHLIGHT_COLOR = QColor('#128C7E')
+
+    OUTER_MARGIN_X = 10   # space between bubble and viewport edge
+    OUTER_MARGIN_Y = 5    # space between bubbles
+    PADDING = 10          # space between bubble edge and text
+    RADIUS = 15
+    MAX_WIDTH_RATIO = 0.75
+    DOCUMENT_CACHE_SIZE = 64
+
+    def __init__(self, view: QListView):
+        super().__init__(view)
+        self.view = view
+        self.font = QFont("Segoe UI", 10)
+        self._cache_width = None
+        self._size_cache: Dict[int, QSize] = {}
+        self._documents = OrderedDict()
+        # Id of the message to outline, e.g. a search result
+        self.highlight_id = None
+
+    def invalidate(self):
+        """Drop cached layouts, e.g. after the viewport width changed"""
+        self._size_cache.clear()
+        self._documents.clear()
+
+    def _max_text_width(self) -> float:
+        width = self.view.viewport().width()
+        if width != self._cache_width:
+            self._cache_width = width
+            self.invalidate()
+        bubble_width = width * self.MAX_WIDTH_RATIO - 2 * self.OUTER_MARGIN_X
+        return max(bubble_width - 2 * self.PADDING, 50)
+
+    @staticmethod
+    def _message(index) -> Dict:
+        # The model's own dict: data() hands out a fresh copy on every call, so
+        # only the stored object has an identity that can key the caches
+        return index.model().message(index.row())
+
+    def _document(self, message: Dict, max_width: float) -> QTextDocument:
+        """Laid-out text for a message, shared between sizeHint and paint"""
+        key = id(message)
+        document = self._documents.get(key)
+        if document is not None:
+            self._documents.move_to_end(key)
+            return document
+
+        document = QTextDocument()
+        document.setDefaultFont(self.font)
+        document.setDocumentMargin(0)
+        option = QTextOption()
+        option.setWrapMode(QTextOption.WrapMode.WrapAtWordBoundaryOrAnywhere)
+        document.setDefaultTextOption(option)
+        document.setPlainText(message['text'])
+        document.setTextWidth(max_width)
+        # Shrink short messages to their natural width
+        document.setTextWidth(min(document.idealWidth(), max_width))
+
+        self._documents[key] = document
+        if len(self._documents) > self.DOCUMENT_CACHE_SIZE:
+            self._documents.popitem(last=False)
+        return document
+
+    def sizeHint(self, option, index):
+        max_width = self._max_text_width()
+        message = self._message(index)
+        key = id(message)
+        size = self._size_cache.get(key)
+        if size is None:
+            document = self._document(message, max_width)
+            height = document.size().height() + 2 * self.PADDING + 2 * self.OUTER_MARGIN_Y
+            size = QSize(self._cache_width, int(height) + 1)
+            self._size_cache[key] = size
+        return size
+
+    def paint(self, painter: QPainter, option, index):
+        max_width = self._max_text_width()
+        message = self._message(index)
+        document = self._document(message, max_width)
+
+        text_size = document.size()
+        bubble_width = text_size.width() + 2 * self.PADDING
+        bubble_height = text_size.height() + 2 * self.PADDING
+        rect = option.rect
+        if message['is_user']:
+            x = rect.left() + self.OUTER_MARGIN_X
+        else:
+            x = rect.right() - self.OUTER_MARGIN_X - bubble_width
+        bubble = QRectF(x, rect.top() + self.OUTER_MARGIN_Y, bubble_width, bubble_height)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if self.highlight_id is not None and message.get('id') == self.highlight_id:
+            painter.setPen(QPen(self.HIGHLIGHT_COLOR, 2))
+        else:
+            painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.USER_COLOR if message['is_user'] else self.AI_COLOR)
+        painter.drawRoundedRect(bubble, self.RADIUS, self.RADIUS)
+
+        painter.translate(bubble.topLeft() + QPointF(self.PADDING, self.PADDING))
+        context = QAbstractTextDocumentLayout.PaintContext()
+        context.palette.setColor(QPalette.ColorRole.Text, self.TEXT_COLOR)
+        document.documentLayout().draw(painter, context)
+        painter.restore()
+
+class ChatTranscriptView(QListView):
+    """Virtualized transcript: only visible messages are laid out and painted"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setUniformItemSizes(False)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        # Lay out large transcripts in batches so the event loop keeps running
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(200)
+
+        self.delegate = MessageDelegate(self)
+        self.setItemDelegate(self.delegate)
+        self.setStyleSheet("""
+            QListView {
+                background-color: #FFFFFF;
+                border: none;
+            }
+        """)
+
+    def setModel(self, model):
+        super().setModel(model)
+        # Cached layouts are keyed by the stored message objects; drop them when messages
+        # go away, before a new message can reuse a freed object's id
+        model.modelReset.connect(self.delegate.invalidate)
+        model.rowsRemoved.connect(self.delegate.invalidate)
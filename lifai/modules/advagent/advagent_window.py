@@ -11,12 +11,17 @@ import logging
 import traceback
 
 from .performance_monitor import PerformanceMonitor
+from .metrics import MetricsSnapshot
 from lifai.utils.logger_utils import get_module_logger
+from lifai.utils.log_files import redact_headers
 
 logger = get_module_logger(__name__)
 
 class AdvAgentWindow(QMainWindow):
-    def __init__(self, settings: Dict):
+    # Request and response bodies are cut to this length in debug logs
+    LOG_BODY_CHARS = 2000
+
+    def __init__(self, settings: Dict, ollama_client=None):
         super().__init__()
         self.settings = settings
         
@@ -32,18 +37,18 @@ class AdvAgentWindow(QMainWindow):
         
         logger.info("Initializing Advanced Agent Window")
         logger.debug(f"Base URL: {self.base_url}")
-        logger.debug(f"Headers configured: {self.headers}")
+        logger.debug(f"Headers configured: {redact_headers(self.headers)}")
         
         self.setWindowTitle("Advanced Agent Interface")
         self.setGeometry(100, 100, 1400, 800)
         
-        # Initialize performance monitor
-        self.perf_monitor = PerformanceMonitor()
+        # Initialize performance monitor; it only runs while the window is shown
+        # Loaded model memory is read from the configured Ollama server
+        self.perf_monitor = PerformanceMonitor(ollama_url=getattr(ollama_client, 'base_url', None))
         self.perf_monitor.update_signal.connect(self.update_performance_display)
-        self.perf_monitor.start()
+        self.workspaces_loaded = False
         
         self.setup_ui()
-        self.load_workspaces()
 
     def setup_ui(self):
         """Setup the main UI components"""
@@ -112,13 +117,24 @@ class AdvAgentWindow(QMainWindow):
         metrics_layout.addWidget(QLabel("VRAM Usage:"))
         metrics_layout.addWidget(self.vram_bar)
         
+        # Backend process and loaded model metrics
+        system_rows = ("Backend CPU", "Backend Memory", "Loaded Models", "Model Memory (VRAM)", "Monitor Overhead")
+        self.system_metrics = QTableWidget(len(system_rows), 2)
+        self.system_metrics.setHorizontalHeaderLabels(["Metric", "Value"])
+        self.system_metrics.verticalHeader().setVisible(False)
+        for row, label in enumerate(system_rows):
+            self.system_metrics.setItem(row, 0, QTableWidgetItem(label))
+        metrics_layout.addWidget(QLabel("System:"))
+        metrics_layout.addWidget(self.system_metrics)
+        
         # Response Time Metrics
-        self.response_metrics = QTableWidget(3, 2)
+        response_rows = ("Min Response Time", "Max Response Time", "Avg Response Time",
+                         "p50 / p95 / p99", "Requests / min", "Errors / min")
+        self.response_metrics = QTableWidget(len(response_rows), 2)
         self.response_metrics.setHorizontalHeaderLabels(["Metric", "Value"])
         self.response_metrics.verticalHeader().setVisible(False)
-        self.response_metrics.setItem(0, 0, QTableWidgetItem("Min Response Time"))
-        self.response_metrics.setItem(1, 0, QTableWidgetItem("Max Response Time"))
-        self.response_metrics.setItem(2, 0, QTableWidgetItem("Avg Response Time"))
+        for row, label in enumerate(response_rows):
+            self.response_metrics.setItem(row, 0, QTableWidgetItem(label))
         metrics_layout.addWidget(QLabel("Response Times:"))
         metrics_layout.addWidget(self.response_metrics)
         
@@ -129,11 +145,12 @@ class AdvAgentWindow(QMainWindow):
         metrics_layout.addWidget(self.success_rate_bar)
         
         # Token Metrics
-        self.token_metrics = QTableWidget(2, 2)
+        self.token_metrics = QTableWidget(3, 2)
         self.token_metrics.setHorizontalHeaderLabels(["Metric", "Count"])
         self.token_metrics.verticalHeader().setVisible(False)
         self.token_metrics.setItem(0, 0, QTableWidgetItem("Tokens Sent"))
         self.token_metrics.setItem(1, 0, QTableWidgetItem("Tokens Received"))
+        self.token_metrics.setItem(2, 0, QTableWidgetItem("Received / s"))
         metrics_layout.addWidget(QLabel("Token Usage:"))
         metrics_layout.addWidget(self.token_metrics)
         
@@ -165,7 +182,7 @@ class AdvAgentWindow(QMainWindow):
             self.chat_display.append("Loading workspaces...")
             
             logger.debug(f"Request URL: {self.base_url}/api/v1/workspaces")
-            logger.debug(f"Request Headers: {self.headers}")
+            logger.debug(f"Request Headers: {redact_headers(self.headers)}")
             
             response = requests.get(
                 f"{self.base_url}/api/v1/workspaces",
@@ -173,8 +190,8 @@ class AdvAgentWindow(QMainWindow):
             )
             
             logger.debug(f"Response Status: {response.status_code}")
-            logger.debug(f"Response Headers: {response.headers}")
-            logger.debug(f"Response Body: {response.text}")
+            logger.debug(f"Response Headers: {redact_headers(response.headers)}")
+            logger.debug(f"Response Body: {response.text[:self.LOG_BODY_CHARS]}")
             
             if response.status_code == 200:
                 workspaces = response.json().get("workspaces", [])
@@ -226,8 +243,8 @@ class AdvAgentWindow(QMainWindow):
             }
             
             logger.debug(f"Request URL: {self.base_url}/api/v1/workspace/{workspace_slug}/chat")
-            logger.debug(f"Request Headers: {self.headers}")
-            logger.debug(f"Request Data: {data}")
+            logger.debug(f"Request Headers: {redact_headers(self.headers)}")
+            logger.debug(f"Request Data: {str(data)[:self.LOG_BODY_CHARS]}")
             
             response = requests.post(
                 f"{self.base_url}/api/v1/workspace/{workspace_slug}/chat",
@@ -238,9 +255,11 @@ class AdvAgentWindow(QMainWindow):
             end_time = time.time()
             response_time = end_time - start_time
             
-            logger.debug(f"Response Status: {response.status_code}")
-            logger.debug(f"Response Time: {response_time:.2f}s")
-            logger.debug(f"Response Body: {response.text}")
+            logger.info(f"Chat response {response.status_code} in {response_time:.2f}s",
+                        extra={'event': 'advagent_chat', 'workspace': workspace_slug,
+                               'status': response.status_code, 'duration_s': round(response_time, 4),
+                               'response_bytes': len(response.content)})
+            logger.debug(f"Response Body: {response.text[:self.LOG_BODY_CHARS]}")
             
             if response.status_code == 200:
                 result = response.json()
@@ -298,36 +317,75 @@ class AdvAgentWindow(QMainWindow):
         """Hide the window"""
         super().hide()
 
-    def update_performance_display(self, metrics: Dict):
-        """Update the performance display with new metrics"""
+    def showEvent(self, event):
+        """Start monitoring and load workspaces once the window is visible"""
+        super().showEvent(event)
+        self.perf_monitor.set_visible(True)
+        if not self.perf_monitor.isRunning():
+            self.perf_monitor.start()
+        if not self.workspaces_loaded:
+            self.workspaces_loaded = True
+            # Defer the HTTP call until the window has painted
+            QTimer.singleShot(0, self.load_workspaces)
+
+    def hideEvent(self, event):
+        """Sample system metrics rarely while hidden"""
+        super().hideEvent(event)
+        self.perf_monitor.set_visible(False)
+
+    def destroy(self):
+        """Clean up resources"""
+        if self.perf_monitor.isRunning():
+            self.perf_monitor.stop()
+        super().destroy()
+
+    def update_performance_display(self, snapshot: MetricsSnapshot):
+        """Update the performance display with a metrics snapshot"""
         try:
             # Update GPU metrics
-            self.gpu_util_bar.setValue(int(metrics.get('gpu_util', 0)))
-            if metrics.get('vram_total', 0) > 0:
-                vram_percentage = (metrics.get('vram_used', 0) / metrics.get('vram_total', 1)) * 100
+            system = snapshot.system
+            self.gpu_util_bar.setValue(int(system.get('gpu_util', 0)))
+            self.gpu_util_bar.setFormat("GPU Usage: %p%" if 'gpu_util' in system else "GPU Usage: n/a")
+            if system.get('vram_total', 0) > 0:
+                vram_percentage = (system.get('vram_used', 0) / system.get('vram_total', 1)) * 100
                 self.vram_bar.setValue(int(vram_percentage))
+            self.vram_bar.setFormat("VRAM Usage: %p%" if 'vram_total' in system else "VRAM Usage: n/a")
+            
+            # Update backend and monitor metrics; collectors that aren't available show n/a
+            values = (
+                f"{system['backend_cpu']:.0f}%" if 'backend_cpu' in system else "n/a",
+                f"{system['backend_rss_mb']:,.0f} MB" if 'backend_rss_mb' in system else "n/a",
+                f"{system['models_loaded']:.0f}" if 'models_loaded' in system else "n/a",
+                f"{system['model_memory_mb']:,.0f} MB ({system['model_vram_mb']:,.0f} MB)"
+                if 'model_memory_mb' in system else "n/a",
+                f"{system.get('collector_ms', 0):.1f} ms, {system.get('collector_cpu_percent', 0):.2f}% CPU",
+            )
+            for row, value in enumerate(values):
+                self.system_metrics.setItem(row, 1, QTableWidgetItem(value))
             
             # Update response time metrics
-            if hasattr(self, 'response_metrics'):
-                self.response_metrics.setItem(0, 1, QTableWidgetItem(f"{metrics.get('min_response_time', 0):.2f}s"))
-                self.response_metrics.setItem(1, 1, QTableWidgetItem(f"{metrics.get('max_response_time', 0):.2f}s"))
-                self.response_metrics.setItem(2, 1, QTableWidgetItem(f"{metrics.get('avg_response_time', 0):.2f}s"))
+            values = (
+                f"{snapshot.min:.2f}s",
+                f"{snapshot.max:.2f}s",
+                f"{snapshot.mean:.2f}s ± {snapshot.stddev:.2f}",
+                f"{snapshot.p50:.2f}s / {snapshot.p95:.2f}s / {snapshot.p99:.2f}s",
+                f"{snapshot.requests_per_minute:.1f}",
+                f"{snapshot.errors_per_minute:.1f}",
+            )
+            for row, value in enumerate(values):
+                self.response_metrics.setItem(row, 1, QTableWidgetItem(value))
             
             # Update success rate
-            if hasattr(self, 'success_rate_bar'):
-                success_rate = metrics.get('success_rate', 0)
-                self.success_rate_bar.setValue(int(success_rate))
+            self.success_rate_bar.setValue(int(snapshot.success_rate))
             
             # Update token metrics
-            if hasattr(self, 'token_metrics'):
-                self.token_metrics.setItem(0, 1, QTableWidgetItem(str(metrics.get('tokens_sent', 0))))
-                self.token_metrics.setItem(1, 1, QTableWidgetItem(str(metrics.get('tokens_received', 0))))
+            self.token_metrics.setItem(0, 1, QTableWidgetItem(str(snapshot.tokens_sent)))
+            self.token_metrics.setItem(1, 1, QTableWidgetItem(str(snapshot.tokens_received)))
+            self.token_metrics.setItem(2, 1, QTableWidgetItem(f"{snapshot.tokens_per_second:.1f}"))
             
             # Update response time graph
-            if hasattr(self, 'response_curve'):
-                response_times = metrics.get('response_times', [])
-                if response_times:
-                    self.response_curve.setData(list(response_times))
+            if snapshot.recent:
+                self.response_curve.setData(list(snapshot.recent))
             
         except Exception as e:
             logger.error(f"Error updating performance display: {e}")
\ No newline at end of file
@@ -0,0 +1,258 @@
+import ctypes
+import ctypes.util
+import os
+import sys
+import time
+from typing import Dict, List
+import requests
+from lifai.utils.logger_utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+class Collector:
+    """A source of system metrics for the performance monitor.
+
+    ``collect`` returns a flat dict of metric name to value. ``available``
+    is called once, on the monitor thread; a collector that can't work on
+    this machine is dropped and costs nothing after that. ``interval`` and
+    ``max_interval`` bound how often it is sampled (see ``CollectorSchedule``).
+    """
+    name = 'collector'
+    interval = 1.0
+    max_interval = 16.0
+
+    def available(self) -> bool:
+        return True
+
+    def collect(self) -> Dict[str, float]:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class ProcessCollector(Collector):
+    """CPU and resident memory of the local model backends (Ollama, LM Studio) from ``/proc``"""
+    name = 'processes'
+    PROC = '/proc'
+    # Process names are matched case-insensitively; Linux truncates them to 15 characters
+    PREFIXES = ('ollama',)
+    NAMES = frozenset({'lm studio', 'lm-studio', 'lmstudio', 'lms'})
+    RESCAN = 10.0
+
+    def __init__(self):
+        self.pids: List[int] = []
+        self.scanned_at = 0.0
+        self.cpu_times: Dict[int, int] = {}      # pid -> utime + stime in clock ticks
+        self.sampled_at = 0.0
+        self.ticks = 100
+        self.page_size = 4096
+
+    def available(self) -> bool:
+        if not os.path.isdir(os.path.join(self.PROC, 'self')):
+            return False
+        self.ticks = os.sysconf('SC_CLK_TCK')
+        self.page_size = os.sysconf('SC_PAGE_SIZE')
+        return True
+
+    def _matches(self, name: str) -> bool:
+        name = name.strip().lower()
+        return name in self.NAMES or name.startswith(self.PREFIXES)
+
+    def _scan(self) -> List[int]:
+        pids = []
+        for entry in os.listdir(self.PROC):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(os.path.join(self.PROC, entry, 'comm')) as f:
+                    if self._matches(f.read()):
+                        pids.append(int(entry))
+            except OSError:
+                continue
+        return pids
+
+    def _read(self, pid: int):
+        with open(os.path.join(self.PROC, str(pid), 'stat'), 'rb') as f:
+            # The command name may contain spaces; fields after it are fixed
+            fields = f.read().rpartition(b')')[2].split()
+        with open(os.path.join(self.PROC, str(pid), 'statm'), 'rb') as f:
+            resident_pages = int(f.read().split()[1])
+        return int(fields[11]) + int(fields[12]), resident_pages * self.page_size
+
+    def collect(self) -> Dict[str, float]:
+        now = time.monotonic()
+        if now - self.scanned_at >= self.RESCAN:
+            self.pids = self._scan()
+            self.scanned_at = now
+
+        cpu_times = {}
+        rss = 0
+        for pid in self.pids:
+            try:
+                cpu_times[pid], resident = self._read(pid)
+            except (OSError, IndexError, ValueError):
+                # Exited; look for its replacement on the next sample
+                self.scanned_at = 0.0
+                continue
+            rss += resident
+
+        elapsed = now - self.sampled_at
+        busy = sum(ticks - self.cpu_times[pid] for pid, ticks in cpu_times.items() if pid in self.cpu_times)
+        cpu = busy / self.ticks / elapsed * 100 if self.sampled_at and elapsed > 0 else 0.0
+        self.cpu_times = cpu_times
+        self.sampled_at = now
+        return {
+            'backend_processes': len(cpu_times),
+            'backend_cpu': cpu,     # percent of one core, like top
+            'backend_rss_mb': rss / 1024 / 1024,
+        }
+
+class OllamaModelsCollector(Collector):
+    """Models loaded by Ollama and the memory they use, from ``/api/ps``"""
+    name = 'ollama_ps'
+    interval = 2.0
+    max_interval = 30.0
+    TIMEOUT = 1.0
+
+    def __init__(self, base_url: str = "http://localhost:11434"):
+        self.base_url = base_url
+        self.session = requests.Session()
+
+    def collect(self) -> Dict[str, float]:
+        response = self.session.get(f"{self.base_url}/api/ps", timeout=self.TIMEOUT)
+        response.raise_for_status()
+        models = response.json().get('models') or []
+        return {
+            'models_loaded': len(models),
+            'model_memory_mb': sum(model.get('size', 0) for model in models) / 1024 / 1024,
+            'model_vram_mb': sum(model.get('size_vram', 0) for model in models) / 1024 / 1024,
+        }
+
+    def close(self):
+        self.session.close()
+
+class _NvmlUtilization(ctypes.Structure):
+    _fields_ = [('gpu', ctypes.c_uint), ('memory', ctypes.c_uint)]
+
+class _NvmlMemory(ctypes.Structure):
+    _fields_ = [('total', ctypes.c_ulonglong), ('free', ctypes.c_ulonglong), ('used', ctypes.c_ulonglong)]
+
+class NvmlCollector(Collector):
+    """Utilization and memory of the first NVIDIA GPU through NVML.
+
+    Calls the driver's library in-process with ctypes, which is much cheaper
+    than running ``nvidia-smi`` and needs no extra package. Without an
+    NVIDIA driver the collector is unavailable.
+    """
+    name = 'nvml'
+
+    def __init__(self, index: int = 0):
+        self.index = index
+        self.nvml = None
+        self.handle = ctypes.c_void_p()
+
+    def _load(self):
+        if sys.platform == 'win32':
+            candidates = ['nvml.dll', os.path.join(os.environ.get('ProgramFiles', r'C:\Program Files'),
+                                                   'NVIDIA Corporation', 'NVSMI', 'nvml.dll')]
+        else:
+            candidates = [ctypes.util.find_library('nvidia-ml') or 'libnvidia-ml.so.1']
+        for candidate in candidates:
+            try:
+                return ctypes.CDLL(candidate)
+            except OSError:
+                continue
+        return None
+
+    def available(self) -> bool:
+        nvml = self._load()
+        if nvml is None:
+            return False
+        try:
+            if nvml.nvmlInit_v2() != 0:
+                return False
+            if nvml.nvmlDeviceGetHandleByIndex_v2(self.index, ctypes.byref(self.handle)) != 0:
+                nvml.nvmlShutdown()
+                return False
+        except AttributeError:
+            return False
+        self.nvml = nvml
+        return True
+
+    def collect(self) -> Dict[str, float]:
+        utilization = _NvmlUtilization()
+        memory = _NvmlMemory()
+        if self.nvml.nvmlDeviceGetUtilizationRates(self.handle, ctypes.byref(utilization)) != 0 or \
+                self.nvml.nvmlDeviceGetMemoryInfo(self.handle, ctypes.byref(memory)) != 0:
+            raise RuntimeError("NVML query failed")
+        return {
+            'gpu_util': utilization.gpu,
+            'vram_used': memory.used / 1024 / 1024,
+            'vram_total': memory.total / 1024 / 1024,
+        }
+
+    def close(self):
+        if self.nvml is not None:
+            self.nvml.nvmlShutdown()
+            self.nvml = None
+
+def default_collectors(ollama_url: str = "http://localhost:11434") -> List[Collector]:
+    return [NvmlCollector(), ProcessCollector(), OllamaModelsCollector(ollama_url)]
+
+class CollectorSchedule:
+    """When to sample one collector, and what it last reported.
+
+    The interval doubles, up to the collector's ``max_interval``, each time
+    a sample matches the previous one (every value within ``TOLERANCE``
+    relative or ``ABSOLUTE_TOLERANCE``), and drops back to ``interval`` as
+    soon as something changes. A failing collector is retried at
+    ``max_interval`` and its values are cleared. While the window is hidden
+    nothing is sampled more often than ``HIDDEN_INTERVAL``.
+    """
+    TOLERANCE = 0.05
+    ABSOLUTE_TOLERANCE = 1.0
+    HIDDEN_INTERVAL = 30.0
+
+    def __init__(self, collector: Collector):
+        self.collector = collector
+        self.interval = collector.interval
+        self.last_run = 0.0
+        self.values: Dict[str, float] = {}
+        self.cost_ms = 0.0          # wall time of the last sample
+        self.cpu_seconds = 0.0      # total CPU time spent sampling
+        self.failures = 0
+
+    def next_due(self, visible: bool) -> float:
+        interval = self.interval if visible else max(self.interval, self.HIDDEN_INTERVAL)
+        return self.last_run + interval
+
+    def _stable(self, values: Dict[str, float]) -> bool:
+        if values.keys() != self.values.keys():
+            return False
+        return all(abs(value - self.values[key]) <= max(abs(self.values[key]) * self.TOLERANCE,
+                                                         self.ABSOLUTE_TOLERANCE)
+                   for key, value in values.items())
+
+    def run(self, now: float):
+        collector = self.collector
+        started = time.perf_counter()
+        cpu_started = time.thread_time()
+        try:
+            values = collector.collect()
+        except Exception as e:
+            self.failures += 1
+            # Say so once; a backend that isn't running would otherwise log every sample
+            log = logger.warning if self.failures == 1 else logger.debug
+            log(f"Collector {collector.name} failed ({e}); retrying every {collector.max_interval:.0f}s")
+            self.values = {}
+            self.interval = collector.max_interval
+        else:
+            if self.failures:
+                logger.info(f"Collector {collector.name} recovered")
+            self.failures = 0
+            self.interval = min(self.interval * 2, collector.max_interval) if self._stable(values) \
+                else collector.interval
+            self.values = values
+        self.cost_ms = (time.perf_counter() - started) * 1000
+        self.cpu_seconds += time.thread_time() - cpu_started
+        self.last_run = now
@@ -0,0 +1,217 @@
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+class RunningStats:
+    """Count, mean, variance, min and max in O(1) per value (Welford's algorithm).
+
+    Two instances can be merged (Chan et al.), e.g. to combine per-thread
+    or per-period statistics.
+    """
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: 'RunningStats'):
+        if not other.count:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+class LogHistogram:
+    """Histogram with logarithmic buckets for quantiles of positive values.
+
+    Like an HDR histogram: every bucket spans the same relative width, so
+    any quantile is accurate to ``precision`` (2% by default) whatever the
+    range, in constant memory. Histograms with the same settings merge by
+    adding bucket counts.
+    """
+    __slots__ = ('precision', 'min_value', 'log_base', 'counts', 'count')
+
+    def __init__(self, precision: float = 0.02, min_value: float = 1e-4):
+        self.precision = precision
+        self.min_value = min_value
+        self.log_base = math.log1p(precision)
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+
+    def _bucket(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        return int(math.log(value / self.min_value) / self.log_base) + 1
+
+    def _value(self, bucket: int) -> float:
+        if bucket == 0:
+            return self.min_value
+        # Midpoint of the bucket, so the error is at most half its width
+        return self.min_value * math.exp((bucket - 0.5) * self.log_base)
+
+    def add(self, value: float):
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+
+    def merge(self, other: 'LogHistogram'):
+        if (other.precision, other.min_value) != (self.precision, self.min_value):
+            raise ValueError("Histograms with different buckets can't be merged")
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return self._value(bucket)
+        return self._value(max(self.counts))
+
+class WindowedRate:
+    """Events per second over a sliding window, in one-second slots"""
+    __slots__ = ('window', 'slots', 'started')
+
+    def __init__(self, window: int = 60):
+        self.window = window
+        self.slots = [(0, 0.0)] * window      # (second, amount)
+        self.started = time.monotonic()
+
+    def add(self, amount: float = 1.0, now: Optional[float] = None):
+        second = int(now if now is not None else time.monotonic())
+        index = second % self.window
+        slot_second, total = self.slots[index]
+        self.slots[index] = (second, total + amount if slot_second == second else amount)
+
+    def total(self, seconds: Optional[int] = None, now: Optional[float] = None) -> float:
+        now = now if now is not None else time.monotonic()
+        seconds = min(seconds or self.window, self.window)
+        oldest = int(now) - seconds + 1
+        return sum(total for second, total in self.slots if second >= oldest)
+
+    def per_second(self, seconds: Optional[int] = None, now: Optional[float] = None) -> float:
+        now = now if now is not None else time.monotonic()
+        seconds = min(seconds or self.window, self.window)
+        # Don't dilute the rate over time before recording started
+        elapsed = min(seconds, max(now - self.started, 1.0))
+        return self.total(seconds, now) / elapsed
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """Immutable view of the request metrics at one moment, safe to hand to another thread"""
+    taken_at: float
+    requests: int
+    succeeded: int
+    failed: int
+    mean: float
+    stddev: float
+    min: float
+    max: float
+    p50: float
+    p95: float
+    p99: float
+    requests_per_minute: float
+    errors_per_minute: float
+    tokens_sent: int
+    tokens_received: int
+    tokens_per_second: float
+    recent: Tuple[float, ...]
+    system: Mapping[str, float] = field(default_factory=lambda: MappingProxyType({}))
+
+    @property
+    def success_rate(self) -> float:
+        return self.succeeded / self.requests * 100 if self.requests else 0.0
+
+class RequestMetrics:
+    """Thread-safe recorder of request latencies, outcomes and token counts.
+
+    ``record`` is O(1) and can be called from any thread; ``snapshot``
+    returns a ``MetricsSnapshot`` that shares no state with the recorder.
+    """
+    RECENT = 100
+    RATE_WINDOW = 60
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = RunningStats()
+        self.histogram = LogHistogram()
+        self.recent = deque(maxlen=self.RECENT)
+        self.request_rate = WindowedRate(self.RATE_WINDOW)
+        self.error_rate = WindowedRate(self.RATE_WINDOW)
+        self.token_rate = WindowedRate(self.RATE_WINDOW)
+        self.succeeded = 0
+        self.failed = 0
+        self.tokens_sent = 0
+        self.tokens_received = 0
+
+    def record(self, response_time: float, success: bool, tokens_sent: int = 0, tokens_received: int = 0):
+        now = time.monotonic()
+        with self.lock:
+            self.latency.add(response_time)
+            self.histogram.add(response_time)
+            self.recent.append(response_time)
+            self.request_rate.add(1, now)
+            if success:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+                self.error_rate.add(1, now)
+            self.tokens_sent += tokens_sent
+            self.tokens_received += tokens_received
+            self.token_rate.add(tokens_received, now)
+
+    def snapshot(self, system: Optional[Dict[str, float]] = None) -> MetricsSnapshot:
+        now = time.monotonic()
+        with self.lock:
+            latency = self.latency
+            return MetricsSnapshot(
+                taken_at=time.time(),
+                requests=latency.count,
+                succeeded=self.succeeded,
+                failed=self.failed,
+                mean=latency.mean,
+                stddev=latency.stddev,
+                min=latency.min if latency.count else 0.0,
+                max=latency.max if latency.count else 0.0,
+                p50=self.histogram.quantile(0.5),
+                p95=self.histogram.quantile(0.95),
+                p99=self.histogram.quantile(0.99),
+                requests_per_minute=self.request_rate.per_second(now=now) * 60,
+                errors_per_minute=self.error_rate.per_second(now=now) * 60,
+                tokens_sent=self.tokens_sent,
+                tokens_received=self.tokens_received,
+                tokens_per_second=self.token_rate.per_second(10, now),
+                recent=tuple(self.recent),
+                system=MappingProxyType(dict(system or {}))
+            )
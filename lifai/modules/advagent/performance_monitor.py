@@ -1,108 +1,98 @@
 from PyQt6.QtCore import QThread, pyqtSignal
-from collections import deque
+import threading
 import time
-from datetime import datetime
-import csv
-import GPUtil
-from typing import Dict
+from typing import List, Optional
 from lifai.utils.logger_utils import get_module_logger
+from lifai.modules.advagent.metrics import RequestMetrics
+from lifai.modules.advagent.collectors import Collector, CollectorSchedule, default_collectors
 
 logger = get_module_logger(__name__)
 
 class PerformanceMonitor(QThread):
-    update_signal = pyqtSignal(dict)
-    
-    def __init__(self):
+    """Publishes request metrics and system usage to the UI.
+
+    Requests are recorded into ``RequestMetrics`` from any thread; the UI
+    receives immutable ``MetricsSnapshot`` objects once a second while it
+    is visible. System metrics come from pluggable ``Collector`` objects,
+    each sampled on its own adaptive interval (see ``CollectorSchedule``);
+    the CPU time they cost is reported as ``collector_cpu_percent``.
+    """
+    update_signal = pyqtSignal(object)
+    UPDATE_INTERVAL = 1.0
+
+    def __init__(self, collectors: Optional[List[Collector]] = None, ollama_url: Optional[str] = None):
         super().__init__()
         self.running = True
-        self.metrics = {
-            'response_times': deque(maxlen=100),
-            'success_count': 0,
-            'failed_count': 0,
-            'tokens_sent': 0,
-            'tokens_received': 0,
-            'min_response_time': float('inf'),
-            'max_response_time': 0,
-            'avg_response_time': 0
-        }
+        self.visible = True
+        self.metrics = RequestMetrics()
+        if collectors is None:
+            collectors = default_collectors(ollama_url) if ollama_url else default_collectors()
+        self.collectors = collectors
+        self.wake = threading.Event()
 
-    def add_request_metric(self, response_time: float, success: bool, 
+    def add_request_metric(self, response_time: float, success: bool,
                          tokens_sent: int = 0, tokens_received: int = 0):
         """Add metrics for a single request"""
-        try:
-            logger.debug(f"Adding metrics - Time: {response_time:.2f}s, Success: {success}, "
-                        f"Tokens sent: {tokens_sent}, Tokens received: {tokens_received}")
-            
-            # Update response times
-            self.metrics['response_times'].append(response_time)
-            
-            # Update success/failure counts
-            if success:
-                self.metrics['success_count'] += 1
+        self.metrics.record(response_time, success, tokens_sent, tokens_received)
+
+    def set_visible(self, visible: bool):
+        """Back off while the window is hidden; sample everything at once when it is shown again"""
+        self.visible = visible
+        self.wake.set()
+
+    def _available(self) -> List[CollectorSchedule]:
+        schedules = []
+        for collector in self.collectors:
+            try:
+                available = collector.available()
+            except Exception as e:
+                logger.debug(f"Collector {collector.name} check failed: {e}")
+                available = False
+            if available:
+                schedules.append(CollectorSchedule(collector))
             else:
-                self.metrics['failed_count'] += 1
-            
-            # Update token counts (estimated from word count)
-            self.metrics['tokens_sent'] += tokens_sent
-            self.metrics['tokens_received'] += tokens_received
-            
-            # Update response time stats
-            if response_time < self.metrics['min_response_time']:
-                self.metrics['min_response_time'] = response_time
-            if response_time > self.metrics['max_response_time']:
-                self.metrics['max_response_time'] = response_time
-            
-            # Calculate average response time
-            if self.metrics['response_times']:
-                self.metrics['avg_response_time'] = sum(self.metrics['response_times']) / len(self.metrics['response_times'])
-            
-            logger.debug(f"Updated metrics: {self.metrics}")
-            
-        except Exception as e:
-            logger.error(f"Error adding request metric: {e}")
+                logger.info(f"System metrics from {collector.name} not available on this machine")
+        return schedules
 
     def run(self):
         """Monitor performance metrics"""
-        while self.running:
-            try:
-                # Get GPU metrics if available
-                gpu_metrics = {}
-                try:
-                    gpus = GPUtil.getGPUs()
-                    if gpus:
-                        gpu = gpus[0]  # Get first GPU
-                        gpu_metrics = {
-                            'gpu_util': gpu.load * 100,
-                            'vram_used': gpu.memoryUsed,
-                            'vram_total': gpu.memoryTotal
-                        }
-                except Exception as e:
-                    logger.warning(f"Could not get GPU metrics: {e}")
-                    gpu_metrics = {
-                        'gpu_util': 0,
-                        'vram_used': 0,
-                        'vram_total': 0
-                    }
+        self.running = True
+        schedules = self._available()
+        started = time.monotonic()
+        was_visible = False
+        try:
+            while self.running:
+                self.wake.clear()
+                now = time.monotonic()
+                visible = self.visible
+                for schedule in schedules:
+                    if (visible and not was_visible) or now >= schedule.next_due(visible):
+                        schedule.run(now)
+                was_visible = visible
 
-                # Calculate success rate
-                total_requests = self.metrics['success_count'] + self.metrics['failed_count']
-                success_rate = (self.metrics['success_count'] / total_requests * 100) if total_requests > 0 else 0
+                if visible:
+                    try:
+                        system = {}
+                        for schedule in schedules:
+                            system.update(schedule.values)
+                        system['collector_ms'] = sum(schedule.cost_ms for schedule in schedules)
+                        system['collector_cpu_percent'] = (sum(schedule.cpu_seconds for schedule in schedules)
+                                                           / max(time.monotonic() - started, 1.0) * 100)
+                        self.update_signal.emit(self.metrics.snapshot(system))
+                    except Exception as e:
+                        logger.error(f"Error in performance monitoring: {e}")
 
-                # Combine all metrics
-                current_metrics = {
-                    **self.metrics,
-                    **gpu_metrics,
-                    'success_rate': success_rate
-                }
-                
-                self.update_signal.emit(current_metrics)
-                
-            except Exception as e:
-                logger.error(f"Error in performance monitoring: {e}")
-            
-            time.sleep(1)  # Update every second
+                now = time.monotonic()
+                wait = min((schedule.next_due(visible) for schedule in schedules), default=now + 60) - now
+                if visible:
+                    wait = min(wait, self.UPDATE_INTERVAL)
+                self.wake.wait(max(wait, 0.05))
+        finally:
+            for schedule in schedules:
+                schedule.collector.close()
 
     def stop(self):
         """Stop the monitoring thread"""
         self.running = False
-        self.wait()
\ No newline at end of file
+        self.wake.set()
+        self.wait()
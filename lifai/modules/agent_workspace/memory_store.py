@@ -0,0 +1,260 @@
+import sqlite3
+import threading
+import time
+import numpy as np
+from pathlib import Path
+from PyQt6.QtCore import QThread, pyqtSignal
+from typing import Dict, List, Optional
+from lifai.modules.AI_chat.context_manager import estimate_tokens
+from lifai.utils.logger_utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+FACTS_PROMPT = """Extract up to 5 short, self-contained facts from this completed task that
+would help with future tasks (names, preferences, decisions, numbers, conclusions).
+Write one fact per line with no numbering. Write NONE if there is nothing worth keeping.
+
+Task: {task}
+
+Result: {output}"""
+
+class AgentMemory:
+    """Long-term agent memory: past tasks, their outputs and extracted facts.
+
+    Vectors are stored normalized as float16 in a memory-mapped file (half
+    the size of float32); text and timestamps live in SQLite. Scoring uses a
+    float32 copy of the vectors held in RAM, converted once on first use and
+    extended as memories are added, so retrieval is a single matrix-vector
+    product.
+
+    Memories are ranked by ``similarity * recency`` where recency decays
+    with a half-life of ``HALF_LIFE_DAYS`` towards ``RECENCY_FLOOR``, and are
+    packed into the prompt until the token budget is used.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS memories (
+            id INTEGER PRIMARY KEY,
+            kind TEXT NOT NULL,
+            agent_type TEXT NOT NULL DEFAULT '',
+            text TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            deleted INTEGER NOT NULL DEFAULT 0
+        );
+    """
+    HALF_LIFE_DAYS = 30.0
+    RECENCY_FLOOR = 0.5
+    MIN_SIMILARITY = 0.3
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.directory / 'memory.db'), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+        self.conn.commit()
+
+        self.dim = int(self._meta('dim', 0))
+        self.count = int(self._meta('count', 0))
+        self.vectors = None
+        self.matrix = None      # float32 working copy, loaded on demand
+        self.timestamps = None
+        self.alive = None
+
+    def _meta(self, key: str, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else default
+
+    def _set_meta(self, key: str, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    @property
+    def model(self) -> Optional[str]:
+        return self._meta('model')
+
+    def _open_vectors(self, min_capacity: int = 0):
+        path = self.directory / 'vectors.f16'
+        row_bytes = self.dim * 2
+        capacity = (path.stat().st_size if path.exists() else 0) // row_bytes
+        if capacity < max(min_capacity, 1):
+            capacity = max(min_capacity, capacity * 2, 1024)
+            with open(path, 'ab') as f:
+                f.truncate(capacity * row_bytes)
+        self.vectors = np.memmap(path, dtype=np.float16, mode='r+', shape=(capacity, self.dim))
+
+    def load(self):
+        """Open the vectors and build the float32 working copy"""
+        with self.lock:
+            if self.matrix is not None or not self.dim:
+                return
+            start = time.perf_counter()
+            self._open_vectors()
+            self.matrix = np.empty((max(self.count * 2, 1024), self.dim), dtype=np.float32)
+            self.matrix[:self.count] = self.vectors[:self.count]
+            self.timestamps = np.zeros(len(self.matrix))
+            self.alive = np.zeros(len(self.matrix), dtype=bool)
+            for row in self.conn.execute("SELECT id, created_at, deleted FROM memories"):
+                self.timestamps[row['id']] = row['created_at']
+                self.alive[row['id']] = not row['deleted']
+            logger.info(f"Loaded {self.count} agent memories in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    def add(self, entries: List[Dict], vectors, model: str):
+        """Store memories (``kind``, ``text``, optional ``agent_type``) with their embeddings"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(entries):
+            return
+        with self.lock:
+            if not self.dim:
+                self.dim = vectors.shape[1]
+                self._set_meta('dim', self.dim)
+                self._set_meta('model', model)
+            elif vectors.shape[1] != self.dim or model != self.model:
+                raise ValueError(f"Memory was built with {self.model} ({self.dim} dims); "
+                                 f"clear it to switch to {model}")
+            self.load()
+            if self.vectors is None:
+                self._open_vectors()
+
+            start, end = self.count, self.count + len(entries)
+            if end > len(self.vectors):
+                self.vectors.flush()
+                self._open_vectors(min_capacity=end)
+            if end > len(self.matrix):
+                grow = max(end, len(self.matrix) * 2)
+                self.matrix = np.resize(self.matrix, (grow, self.dim))
+                self.timestamps = np.resize(self.timestamps, grow)
+                self.alive = np.concatenate([self.alive, np.zeros(grow - len(self.alive), dtype=bool)])
+
+            normalized = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            self.vectors[start:end] = normalized
+            self.vectors.flush()
+            self.matrix[start:end] = self.vectors[start:end]
+
+            now = time.time()
+            self.conn.executemany(
+                "INSERT INTO memories (id, kind, agent_type, text, created_at) VALUES (?, ?, ?, ?, ?)",
+                ((start + i, entry['kind'], entry.get('agent_type', ''), entry['text'], now)
+                 for i, entry in enumerate(entries))
+            )
+            self.count = end
+            self._set_meta('count', end)
+            self.conn.commit()
+            self.timestamps[start:end] = now
+            self.alive[start:end] = True
+
+    def recall(self, query_vector, token_budget: int, k: int = 20, now: float = None) -> List[Dict]:
+        """Best memories by similarity x recency that fit in ``token_budget``"""
+        with self.lock:
+            self.load()
+            if not self.count or self.matrix is None:
+                return []
+            query = np.asarray(query_vector, dtype=np.float32)
+            query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+            similarity = self.matrix[:self.count] @ query
+            age_days = ((now or time.time()) - self.timestamps[:self.count]) / 86400
+            recency = self.RECENCY_FLOOR + (1 - self.RECENCY_FLOOR) * np.exp2(-age_days / self.HALF_LIFE_DAYS)
+            scores = np.where(self.alive[:self.count] & (similarity >= self.MIN_SIMILARITY),
+                              similarity * recency, -np.inf)
+
+            k = min(k, self.count)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            top = [int(row) for row in top if np.isfinite(scores[row])]
+            if not top:
+                return []
+
+            rows = {row['id']: row for row in self.conn.execute(
+                f"SELECT * FROM memories WHERE id IN ({','.join('?' * len(top))})", top)}
+
+        selected = []
+        for row_id in top:
+            row = rows[row_id]
+            tokens = estimate_tokens(row['text'])
+            if tokens > token_budget:
+                continue
+            token_budget -= tokens
+            selected.append({'id': row_id, 'kind': row['kind'], 'text': row['text'],
+                             'created_at': row['created_at'], 'score': float(scores[row_id])})
+        return selected
+
+    def recent(self, limit: int = 50) -> List[Dict]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT id, kind, agent_type, text, created_at FROM memories "
+                "WHERE deleted = 0 ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def forget(self, memory_id: int):
+        with self.lock:
+            self.conn.execute("UPDATE memories SET deleted = 1 WHERE id = ?", (memory_id,))
+            self.conn.commit()
+            if self.alive is not None and memory_id < len(self.alive):
+                self.alive[memory_id] = False
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM memories")
+            self.conn.execute("DELETE FROM meta")
+            self.conn.commit()
+            self.vectors = self.matrix = self.timestamps = self.alive = None
+            path = self.directory / 'vectors.f16'
+            if path.exists():
+                path.unlink()
+            self.dim = self.count = 0
+
+    def stats(self) -> Dict:
+        with self.lock:
+            live = self.conn.execute("SELECT COUNT(*) FROM memories WHERE deleted = 0").fetchone()[0]
+        return {'memories': live, 'dim': self.dim, 'model': self.model,
+                'disk_bytes': self.count * self.dim * 2}
+
+def format_memories(memories: List[Dict]) -> str:
+    lines = []
+    for memory in memories:
+        date = time.strftime('%Y-%m-%d', time.localtime(memory['created_at']))
+        lines.append(f"- ({memory['kind']}, {date}) {memory['text']}")
+    return '\n'.join(lines)
+
+class MemoryWriter(QThread):
+    """Stores a finished task, its output and extracted facts in the background"""
+    memories_saved = pyqtSignal(int)
+
+    OUTPUT_CHARS = 2000
+
+    def __init__(self, memory: AgentMemory, client, model: str, embedding_model: str,
+                 task: str, output: str, agent_type: str, parent=None):
+        super().__init__(parent)
+        self.memory = memory
+        self.client = client
+        self.model = model
+        self.embedding_model = embedding_model
+        self.task = task
+        self.output = output
+        self.agent_type = agent_type
+
+    def run(self):
+        try:
+            output = self.output[:self.OUTPUT_CHARS]
+            entries = [{'kind': 'task', 'agent_type': self.agent_type,
+                        'text': f"Task: {self.task[:1000]}\nResult: {output}"}]
+            facts = self.client.generate_response(
+                prompt=FACTS_PROMPT.format(task=self.task[:2000], output=output),
+                model=self.model
+            ) or ''
+            for line in facts.splitlines():
+                fact = line.strip().lstrip('-*• ').strip()
+                if fact and fact.upper() != 'NONE':
+                    entries.append({'kind': 'fact', 'agent_type': self.agent_type, 'text': fact})
+
+            vectors = self.client.embed([entry['text'] for entry in entries], self.embedding_model)
+            self.memory.add(entries, vectors, self.embedding_model)
+            self.memories_saved.emit(len(entries))
+        except Exception as e:
+            logger.error(f"Error saving agent memory: {e}")
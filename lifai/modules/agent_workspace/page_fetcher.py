@@ -0,0 +1,264 @@
+import codecs
+import hashlib
+import json
+import re
+import threading
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor, wait
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import urlsplit
+from lifai.utils.logger_utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,text/plain;q=0.9,*/*;q=0.5',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+class MainTextParser(HTMLParser):
+    """Incremental extractor of a page's readable text.
+
+    Fed while the page downloads. Boilerplate containers (navigation,
+    headers, footers, forms, scripts) are skipped and only blocks of real
+    prose or headings are kept. Text inside <article>/<main> is preferred
+    when the page has enough of it.
+    """
+    SKIP = {'script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form',
+            'svg', 'template', 'iframe', 'button', 'select'}
+    BLOCKS = {'p', 'div', 'section', 'article', 'main', 'li', 'pre', 'blockquote', 'td', 'th',
+              'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'br', 'tr', 'dd', 'dt', 'figcaption'}
+    HEADINGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+    VOID = {'br', 'img', 'input', 'meta', 'link', 'hr', 'source', 'wbr', 'area', 'col', 'embed'}
+    MIN_BLOCK_CHARS = 40
+    MIN_MAIN_CHARS = 500
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        # Skipped container and how many of that tag are open; other tags inside it are
+        # ignored, since unclosed <li>, <option> or <p> would never balance
+        self.skip_tag = None
+        self.skip_depth = 0
+        self.main_depth = 0
+        self.heading = False
+        self.current = []
+        self.blocks = []        # (text, inside main content)
+        self.title = ''
+        self.in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.VOID:
+            if tag == 'br':
+                self.current.append(' ')
+            return
+        if self.skip_tag:
+            if tag == self.skip_tag:
+                self.skip_depth += 1
+            return
+        if tag in self.SKIP:
+            self.skip_tag = tag
+            self.skip_depth = 1
+            return
+        if tag == 'title':
+            self.in_title = True
+        if tag in self.BLOCKS:
+            self._flush()
+        if tag in ('article', 'main'):
+            self.main_depth += 1
+        if tag in self.HEADINGS:
+            self.heading = True
+
+    def handle_endtag(self, tag):
+        if tag in self.VOID:
+            return
+        if self.skip_tag:
+            if tag == self.skip_tag:
+                self.skip_depth -= 1
+                if not self.skip_depth:
+                    self.skip_tag = None
+            return
+        if tag == 'title':
+            self.in_title = False
+        if tag in self.BLOCKS:
+            self._flush()
+        if tag in ('article', 'main') and self.main_depth:
+            self.main_depth -= 1
+        if tag in self.HEADINGS:
+            self.heading = False
+
+    def handle_data(self, data):
+        if self.skip_tag:
+            return
+        if self.in_title:
+            self.title += data
+        else:
+            self.current.append(data)
+
+    def _flush(self):
+        text = ' '.join(''.join(self.current).split())
+        self.current = []
+        if len(text) >= self.MIN_BLOCK_CHARS or (self.heading and text):
+            self.blocks.append((text, self.main_depth > 0))
+
+    def text(self, max_chars: int) -> str:
+        self._flush()
+        main = [text for text, in_main in self.blocks if in_main]
+        blocks = main if sum(len(text) for text in main) >= self.MIN_MAIN_CHARS else [text for text, _ in self.blocks]
+        result = []
+        total = 0
+        for text in blocks:
+            if total + len(text) > max_chars:
+                result.append(text[:max_chars - total].rsplit(' ', 1)[0] + '...')
+                break
+            result.append(text)
+            total += len(text) + 1
+        return '\n'.join(result)
+
+class PageFetcher:
+    """Downloads and extracts search result pages concurrently within a deadline.
+
+    At most ``per_host`` requests run against one host at a time. Bodies are
+    streamed and parsed as they arrive, and reading stops after ``max_bytes``
+    or when the deadline passes. Extracted text is cached on disk by URL
+    together with the response's ETag/Last-Modified: pages fetched within
+    ``FRESH_SECONDS`` are reused outright, older ones are revalidated with a
+    conditional request.
+    """
+    FRESH_SECONDS = 600
+    CHUNK_SIZE = 16 * 1024
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 1024 * 1024, per_host: int = 2,
+                 max_workers: int = 8, max_chars: int = 4000):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.per_host = per_host
+        self.max_workers = max_workers
+        self.max_chars = max_chars
+        self.host_slots = {}
+        self.lock = threading.Lock()
+
+    def _slot(self, url: str) -> threading.Semaphore:
+        host = (urlsplit(url).hostname or '').lower()
+        with self.lock:
+            if host not in self.host_slots:
+                self.host_slots[host] = threading.Semaphore(self.per_host)
+            return self.host_slots[host]
+
+    def _cache_path(self, url: str) -> Path:
+        return self.cache_dir / (hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def _load_cached(self, url: str):
+        try:
+            with open(self._cache_path(url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_cached(self, url: str, entry: Dict):
+        path = self._cache_path(url)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        tmp.replace(path)
+
+    def fetch(self, url: str, deadline_at: float) -> Dict:
+        """Fetch one page; returns ``{'text', 'bytes', 'cached'}``"""
+        cached = self._load_cached(url)
+        if cached and time.time() - cached['fetched_at'] < self.FRESH_SECONDS:
+            return {'text': cached['text'], 'bytes': 0, 'cached': True}
+
+        headers = dict(HEADERS)
+        if cached and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached and cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+        slot = self._slot(url)
+        if not slot.acquire(timeout=max(deadline_at - time.monotonic(), 0)):
+            raise TimeoutError("host busy until the deadline")
+        try:
+            remaining = max(deadline_at - time.monotonic(), 0.5)
+            with requests.get(url, headers=headers, stream=True, timeout=(min(remaining, 5), remaining)) as response:
+                if response.status_code == 304 and cached:
+                    cached['fetched_at'] = time.time()
+                    self._save_cached(url, cached)
+                    return {'text': cached['text'], 'bytes': 0, 'cached': True}
+                response.raise_for_status()
+                content_type = response.headers.get('Content-Type', '').lower()
+                if 'html' not in content_type and 'text/plain' not in content_type:
+                    raise ValueError(f"unsupported content type {content_type or 'unknown'}")
+
+                # requests assumes ISO-8859-1 for text/* without a charset; most pages are UTF-8
+                encoding = response.encoding if 'charset' in content_type else 'utf-8'
+                try:
+                    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+                except LookupError:
+                    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+                parser = MainTextParser() if 'html' in content_type else None
+                plain = []
+                received = 0
+                for chunk in response.iter_content(self.CHUNK_SIZE):
+                    received += len(chunk)
+                    text = decoder.decode(chunk)
+                    if parser:
+                        parser.feed(text)
+                    else:
+                        plain.append(text)
+                    if received >= self.max_bytes or time.monotonic() >= deadline_at:
+                        break
+
+                if parser:
+                    text = parser.text(self.max_chars)
+                else:
+                    text = re.sub(r'\s+', ' ', ''.join(plain))[:self.max_chars]
+                self._save_cached(url, {
+                    'url': url,
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'text': text,
+                    'fetched_at': time.time()
+                })
+                return {'text': text, 'bytes': received, 'cached': False}
+        finally:
+            slot.release()
+
+    def fetch_all(self, urls: List[str], deadline: float = 10.0) -> Dict[str, str]:
+        """Extracted text of each URL that completed before the deadline"""
+        start = time.monotonic()
+        deadline_at = start + deadline
+        urls = list(dict.fromkeys(url for url in urls if url.startswith(('http://', 'https://'))))
+        pages = {}
+        failed = 0
+        received = 0
+        cache_hits = 0
+        executor = ThreadPoolExecutor(max_workers=max(min(self.max_workers, len(urls)), 1),
+                                      thread_name_prefix='page-fetch')
+        try:
+            futures = {executor.submit(self.fetch, url, deadline_at): url for url in urls}
+            done, _ = wait(futures, timeout=deadline)
+            for future in done:
+                url = futures[future]
+                try:
+                    page = future.result()
+                except Exception as e:
+                    failed += 1
+                    logger.debug(f"Failed to fetch {url}: {e}")
+                    continue
+                received += page['bytes']
+                cache_hits += page['cached']
+                if page['text']:
+                    pages[url] = page['text']
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        logger.info(
+            f"Fetched {len(pages)}/{len(urls)} pages in {time.monotonic() - start:.1f}s "
+            f"({received // 1024} KB downloaded, {cache_hits} from cache, {failed} failed, "
+            f"{len(urls) - len(done)} past the deadline)"
+        )
+        return pages
@@ -0,0 +1,147 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from lifai.utils.logger_utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+class RunHistory:
+    """Local record of agent runs and the timing of each step.
+
+    A run is one execution of a task graph (retries of failed steps are
+    recorded as further runs of the same task with a higher ``attempt``).
+    For generation steps the backend's prompt-eval and generation times and
+    token counts are stored when the client reports them.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            agent_type TEXT NOT NULL,
+            task TEXT NOT NULL,
+            model TEXT NOT NULL DEFAULT '',
+            attempt INTEGER NOT NULL DEFAULT 1,
+            status TEXT NOT NULL,
+            started_at REAL NOT NULL,
+            finished_at REAL NOT NULL,
+            output_chars INTEGER NOT NULL DEFAULT 0,
+            prompt_tokens INTEGER,
+            completion_tokens INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS run_steps (
+            run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+            step TEXT NOT NULL,
+            status TEXT NOT NULL,
+            started_at REAL NOT NULL,
+            finished_at REAL NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 1,
+            output_chars INTEGER NOT NULL DEFAULT 0,
+            prompt_tokens INTEGER,
+            completion_tokens INTEGER,
+            prompt_eval_seconds REAL,
+            generation_seconds REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_runs_started ON runs(started_at);
+        CREATE INDEX IF NOT EXISTS idx_run_steps_run ON run_steps(run_id);
+    """
+    TASK_CHARS = 2000
+
+    def __init__(self, path: Path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(self.SCHEMA)
+        self.conn.commit()
+
+    def record_run(self, agent_type: str, task: str, model: str, attempt: int, status: str,
+                   steps: List[Dict], output_chars: int = 0) -> int:
+        """Store a finished run; each step dict has ``step``, ``status``,
+        ``started_at``, ``finished_at`` and optionally ``attempts``,
+        ``output_chars`` and the backend ``stats`` of a generation"""
+        started_at = min((step['started_at'] for step in steps), default=time.time())
+        finished_at = max((step['finished_at'] for step in steps), default=started_at)
+        prompt_tokens = completion_tokens = None
+        rows = []
+        for step in steps:
+            stats = step.get('stats') or {}
+            if stats.get('prompt_tokens') is not None:
+                prompt_tokens = (prompt_tokens or 0) + stats['prompt_tokens']
+            if stats.get('completion_tokens') is not None:
+                completion_tokens = (completion_tokens or 0) + stats['completion_tokens']
+            rows.append((step['step'], step['status'], step['started_at'], step['finished_at'],
+                         step.get('attempts', 1), step.get('output_chars', 0),
+                         stats.get('prompt_tokens'), stats.get('completion_tokens'),
+                         stats.get('prompt_eval_seconds'), stats.get('generation_seconds')))
+
+        with self.lock:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (agent_type, task, model, attempt, status, started_at, finished_at, "
+                "output_chars, prompt_tokens, completion_tokens) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (agent_type, task[:self.TASK_CHARS], model, attempt, status, started_at, finished_at,
+                 output_chars, prompt_tokens, completion_tokens)
+            )
+            run_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO run_steps (run_id, step, status, started_at, finished_at, attempts, output_chars, "
+                "prompt_tokens, completion_tokens, prompt_eval_seconds, generation_seconds) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id,) + row for row in rows]
+            )
+            self.conn.commit()
+        return run_id
+
+    def recent_runs(self, limit: int = 100) -> List[Dict]:
+        with self.lock:
+            rows = self.conn.execute("SELECT * FROM runs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def run_steps(self, run_id: int) -> List[Dict]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT * FROM run_steps WHERE run_id = ? ORDER BY started_at", (run_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def step_percentiles(self, days: Optional[float] = 30) -> List[Dict]:
+        """p50/p95 duration of each step by agent type over recent successful steps.
+
+        Generation steps are also split into the backend's prompt evaluation
+        and token generation phases where those were reported.
+        """
+        since = time.time() - days * 86400 if days else 0
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT r.agent_type, s.step, s.finished_at - s.started_at AS seconds, "
+                "s.prompt_eval_seconds, s.generation_seconds "
+                "FROM run_steps s JOIN runs r ON r.id = s.run_id "
+                "WHERE s.status = 'done' AND s.started_at >= ?", (since,)
+            ).fetchall()
+
+        groups = {}
+        for row in rows:
+            groups.setdefault((row['agent_type'], row['step']), []).append(row['seconds'])
+            if row['prompt_eval_seconds'] is not None:
+                groups.setdefault((row['agent_type'], f"{row['step']}: prompt eval"), []).append(row['prompt_eval_seconds'])
+            if row['generation_seconds'] is not None:
+                groups.setdefault((row['agent_type'], f"{row['step']}: generation"), []).append(row['generation_seconds'])
+        return [
+            {'agent_type': agent_type, 'step': step, 'count': len(values),
+             'p50': percentile(values, 0.5), 'p95': percentile(values, 0.95)}
+            for (agent_type, step), values in sorted(groups.items())
+        ]
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM run_steps")
+            self.conn.execute("DELETE FROM runs")
+            self.conn.commit()
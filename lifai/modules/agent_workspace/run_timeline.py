@@ -0,0 +1,70 @@
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt, QRectF
+from PyQt6.QtGui import QPainter, QColor
+from typing import Dict, List
+
+STATUS_COLORS = {
+    'done': QColor('#128C7E'),
+    'failed': QColor('#D9534F'),
+    'blocked': QColor('#AAAAAA'),
+}
+PROMPT_EVAL_COLOR = QColor('#F0AD4E')
+
+class RunTimeline(QWidget):
+    """Gantt-style chart of one run: a bar per step on a shared time axis.
+
+    For generation steps with backend timings, the prompt evaluation part
+    of the bar is drawn in a separate colour.
+    """
+    ROW_HEIGHT = 22
+    LABEL_WIDTH = 110
+    DURATION_WIDTH = 60
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.steps: List[Dict] = []
+        self.setMinimumHeight(self.ROW_HEIGHT * 3)
+
+    def set_steps(self, steps: List[Dict]):
+        self.steps = steps
+        self.setMinimumHeight(self.ROW_HEIGHT * max(len(steps) + 1, 3))
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if not self.steps:
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "Select a run to see its timeline")
+            return
+
+        start = min(step['started_at'] for step in self.steps)
+        span = max(max(step['finished_at'] for step in self.steps) - start, 1e-3)
+        chart_left = self.LABEL_WIDTH
+        chart_width = max(self.width() - self.LABEL_WIDTH - self.DURATION_WIDTH, 10)
+
+        for row, step in enumerate(self.steps):
+            top = row * self.ROW_HEIGHT + 3
+            height = self.ROW_HEIGHT - 6
+            duration = step['finished_at'] - step['started_at']
+            left = chart_left + (step['started_at'] - start) / span * chart_width
+            width = max(duration / span * chart_width, 2)
+
+            painter.setPen(self.palette().windowText().color())
+            painter.drawText(QRectF(0, top, self.LABEL_WIDTH - 6, height),
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, step['step'])
+            painter.drawText(QRectF(chart_left + chart_width + 6, top, self.DURATION_WIDTH, height),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, f"{duration:.2f}s")
+
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(STATUS_COLORS.get(step['status'], QColor('#5BC0DE')))
+            painter.drawRoundedRect(QRectF(left, top, width, height), 3, 3)
+            if step.get('prompt_eval_seconds') and duration > 0:
+                eval_width = min(step['prompt_eval_seconds'] / duration, 1) * width
+                painter.setBrush(PROMPT_EVAL_COLOR)
+                painter.drawRoundedRect(QRectF(left, top, eval_width, height), 3, 3)
+
+        axis_top = len(self.steps) * self.ROW_HEIGHT
+        painter.setPen(self.palette().mid().color())
+        painter.drawLine(chart_left, axis_top + 2, chart_left + chart_width, axis_top + 2)
+        painter.drawText(QRectF(chart_left, axis_top + 3, chart_width, self.ROW_HEIGHT - 4),
+                         Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignTop, f"{span:.2f}s")
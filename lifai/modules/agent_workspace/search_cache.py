@@ -0,0 +1,147 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List
+from lifai.utils.logger_utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query used in cache keys"""
+    return ' '.join(query.casefold().split())
+
+class SearchCache:
+    """Web search results cached by engine, normalized query and result count.
+
+    A small in-memory LRU sits in front of an SQLite table so results survive
+    restarts. Entries are fresh for ``ttl`` seconds. With
+    ``stale_while_revalidate`` an expired entry (up to ``MAX_STALE`` old) is
+    returned immediately and refreshed on a background thread, so repeated
+    research tasks never wait on the engine. Empty results are not cached.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS search_cache (
+            key TEXT PRIMARY KEY,
+            engine TEXT NOT NULL,
+            query TEXT NOT NULL,
+            results TEXT NOT NULL,
+            stored_at REAL NOT NULL,
+            latency REAL NOT NULL
+        );
+    """
+    MAX_STALE = 7 * 86400
+
+    def __init__(self, directory: Path, ttl: float = 3600, stale_while_revalidate: bool = True,
+                 max_entries: int = 256):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.memory = OrderedDict()
+        self.revalidating = set()
+        self.counters = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'revalidations': 0,
+                         'saved_seconds': 0.0, 'fetch_seconds': 0.0}
+
+        self.conn = sqlite3.connect(str(directory / 'search_cache.db'), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+        self.conn.execute("DELETE FROM search_cache WHERE stored_at < ?", (time.time() - self.MAX_STALE,))
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(engine: str, query: str, count: int) -> str:
+        raw = f"{engine}\x00{normalize_query(query)}\x00{count}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _lookup(self, key: str):
+        entry = self.memory.get(key)
+        if entry is not None:
+            self.memory.move_to_end(key)
+            return entry
+        row = self.conn.execute(
+            "SELECT results, stored_at, latency FROM search_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        entry = {'results': json.loads(row[0]), 'stored_at': row[1], 'latency': row[2]}
+        self._remember(key, entry)
+        return entry
+
+    def _remember(self, key: str, entry: Dict):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def _store(self, key: str, engine: str, query: str, results: List[Dict], latency: float):
+        entry = {'results': results, 'stored_at': time.time(), 'latency': latency}
+        with self.lock:
+            self._remember(key, entry)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, engine, query, results, stored_at, latency) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, engine, normalize_query(query), json.dumps(results), entry['stored_at'], latency)
+            )
+            self.conn.commit()
+
+    def _fetch(self, key: str, engine: str, query: str, fetch: Callable[[], List[Dict]]) -> List[Dict]:
+        start = time.perf_counter()
+        results = fetch()
+        latency = time.perf_counter() - start
+        with self.lock:
+            self.counters['fetch_seconds'] += latency
+        if results:
+            self._store(key, engine, query, results, latency)
+        return results
+
+    def _revalidate(self, key: str, engine: str, query: str, fetch: Callable[[], List[Dict]]):
+        try:
+            self._fetch(key, engine, query, fetch)
+            logger.debug(f"Refreshed cached {engine} results for: {query}")
+        except Exception as e:
+            logger.error(f"Search cache refresh failed: {e}")
+        finally:
+            with self.lock:
+                self.revalidating.discard(key)
+
+    def get(self, engine: str, query: str, count: int, fetch: Callable[[], List[Dict]]) -> List[Dict]:
+        """Cached results for the query, calling ``fetch`` on a miss"""
+        key = self.make_key(engine, query, count)
+        with self.lock:
+            entry = self._lookup(key)
+            age = time.time() - entry['stored_at'] if entry else None
+            if entry and age < self.ttl:
+                self.counters['hits'] += 1
+                self.counters['saved_seconds'] += entry['latency']
+                return entry['results']
+            if entry and self.stale_while_revalidate and age < self.MAX_STALE:
+                self.counters['stale_hits'] += 1
+                self.counters['saved_seconds'] += entry['latency']
+                if key not in self.revalidating:
+                    self.revalidating.add(key)
+                    self.counters['revalidations'] += 1
+                    threading.Thread(target=self._revalidate, args=(key, engine, query, fetch),
+                                     daemon=True).start()
+                return entry['results']
+            self.counters['misses'] += 1
+        return self._fetch(key, engine, query, fetch)
+
+    def clear(self):
+        with self.lock:
+            self.memory.clear()
+            self.conn.execute("DELETE FROM search_cache")
+            self.conn.commit()
+
+    def stats(self) -> Dict:
+        with self.lock:
+            stats = dict(self.counters)
+            stats['entries'] = self.conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['stale_hits']) / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,126 @@
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from lifai.utils.logger_utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+TRACKING_PARAMS = {'gclid', 'fbclid', 'msclkid', 'yclid', 'mc_cid', 'mc_eid', 'ref', 'ref_src', 'igshid'}
+WORD_RE = re.compile(r'\w+')
+
+def canonical_url(url: str) -> str:
+    """URL form used to detect the same page returned by different engines"""
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    )
+    path = re.sub(r'/+', '/', parts.path).rstrip('/')
+    if path.endswith(('/index.html', '/index.htm', '/index.php')):
+        path = path.rsplit('/', 1)[0]
+    # http and https are treated as the same page
+    return urlunsplit(('', host, path, urlencode(query), ''))[2:]
+
+def shingles(text: str, size: int = 3) -> set:
+    words = WORD_RE.findall(text.casefold())
+    if len(words) < size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def similarity(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+class ResultMerger:
+    """Merges ranked result lists from several engines.
+
+    Results are keyed on their canonical URL; a page found by several
+    engines keeps its best snippet and is ranked by reciprocal rank fusion
+    (the sum of ``1 / (RRF_K + rank)`` over engines). Results whose snippet
+    is a near duplicate (word 3-gram Jaccard >= ``NEAR_DUPLICATE``) of one
+    already kept are dropped, which catches mirrors and syndicated copies.
+    """
+    RRF_K = 60
+    NEAR_DUPLICATE = 0.8
+
+    def __init__(self):
+        self.entries = {}
+        self.signatures = []
+
+    def add(self, engine: str, results: List[Dict]):
+        for rank, result in enumerate(results):
+            link = result.get('link') or ''
+            if not result.get('title') or not link.startswith(('http://', 'https://')):
+                continue
+            key = canonical_url(link)
+            entry = self.entries.get(key)
+            if entry is None:
+                signature = shingles(result.get('snippet', ''))
+                if len(signature) > 3 and any(similarity(signature, other) >= self.NEAR_DUPLICATE
+                                              for other in self.signatures):
+                    continue
+                self.signatures.append(signature)
+                entry = self.entries[key] = {'result': dict(result), 'score': 0.0, 'engines': []}
+            elif len(result.get('snippet', '')) > len(entry['result'].get('snippet', '')):
+                entry['result']['snippet'] = result['snippet']
+            entry['score'] += 1 / (self.RRF_K + rank + 1)
+            entry['engines'].append(engine)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def results(self, count: int) -> List[Dict]:
+        ranked = sorted(self.entries.values(), key=lambda entry: entry['score'], reverse=True)
+        return [entry['result'] for entry in ranked[:count]]
+
+def fan_out(searches: Dict[str, Callable[[float], List[Dict]]], count: int,
+            deadline: float = 8.0) -> Tuple[List[Dict], Dict[str, str]]:
+    """Query every engine concurrently and merge their results.
+
+    Each search callable receives the seconds left before the deadline to
+    use as its request timeout. Returns as soon as ``count`` distinct results
+    have been merged or the deadline passes; engines still running are
+    abandoned (their threads end at their own timeout and their results are
+    discarded). Returns the results and a per-engine status report.
+    """
+    start = time.monotonic()
+    merger = ResultMerger()
+    report = {name: 'pending' for name in searches}
+    executor = ThreadPoolExecutor(max_workers=max(len(searches), 1), thread_name_prefix='search')
+    try:
+        pending = {executor.submit(search, deadline): name for name, search in searches.items()}
+        while pending:
+            remaining = deadline - (time.monotonic() - start)
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                elapsed = time.monotonic() - start
+                try:
+                    results = future.result() or []
+                    merger.add(name, results)
+                    report[name] = f"{len(results)} results in {elapsed:.1f}s"
+                except Exception as e:
+                    report[name] = f"failed after {elapsed:.1f}s: {e}"
+            if len(merger) >= count:
+                break
+        for name in pending.values():
+            report[name] = 'not waited for'
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    logger.info(f"Fan-out search finished in {time.monotonic() - start:.1f}s: "
+                + ', '.join(f"{name}: {status}" for name, status in report.items()))
+    return merger.results(count), report
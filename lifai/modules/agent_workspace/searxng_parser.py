@@ -0,0 +1,143 @@
+import html
+import re
+import time
+import requests
+from typing import Dict, List
+from lifai.utils.logger_utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+# Result markup of the simple (<article>) and oscar (<div>) themes
+RESULT_START_RE = re.compile(r'<(?:article|div)\b[^>]*\bclass="(?:[^"]*\s)?result(?:\s[^"]*)?"', re.I)
+CONTAINER_RE = re.compile(r'<(?:div|main)\b[^>]*\bid="(?:urls|main_results|results)"', re.I)
+TITLE_RE = re.compile(r'<h[34]\b[^>]*>\s*<a\b[^>]*?\bhref="([^"]+)"[^>]*>(.*?)</a>', re.I | re.S)
+SNIPPET_RE = re.compile(r'<p\b[^>]*\bclass="[^"]*\b(?:content|result-content)\b[^"]*"[^>]*>(.*?)</p>', re.I | re.S)
+TAG_RE = re.compile(r'<[^>]+>')
+SPACE_RE = re.compile(r'\s+')
+
+# Instances that refused format=json, with the time they did
+_json_refused: Dict[str, float] = {}
+JSON_RETRY_AFTER = 3600
+
+def _text(fragment: str) -> str:
+    return SPACE_RE.sub(' ', html.unescape(TAG_RE.sub('', fragment))).strip()
+
+def results_container(page: str) -> str:
+    """The part of a result page that holds the results, or the whole page"""
+    match = CONTAINER_RE.search(page)
+    return page[match.start():] if match else page
+
+def parse_results_html(page: str, count: int) -> List[Dict]:
+    """Extract results from a SearXNG HTML page with precompiled patterns.
+
+    Only the results container is scanned; each result block is sliced out
+    and matched for its title link and content paragraph. Pages whose markup
+    doesn't match (custom themes) fall back to BeautifulSoup on the container.
+    """
+    container = results_container(page)
+    starts = [match.start() for match in RESULT_START_RE.finditer(container)]
+    results = []
+    for start, end in zip(starts, starts[1:] + [len(container)]):
+        block = container[start:end]
+        title = TITLE_RE.search(block)
+        if not title:
+            continue
+        snippet = SNIPPET_RE.search(block)
+        results.append({
+            'title': _text(title.group(2)),
+            'snippet': _text(snippet.group(1)) if snippet else '',
+            'link': html.unescape(title.group(1))
+        })
+        if len(results) >= count:
+            break
+    return results or parse_results_soup(container, count)
+
+def parse_results_soup(page: str, count: int) -> List[Dict]:
+    """Selector cascade for markup the compiled patterns don't recognise"""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(page, 'html.parser')
+    results = []
+    result_elements = (
+        soup.select('.result') or
+        soup.select('.result-default') or
+        soup.select('.results-item') or
+        soup.select('article') or
+        soup.select('.searchresult')
+    )
+    for result in result_elements:
+        title_element = (
+            result.select_one('.result-title') or
+            result.select_one('.title') or
+            result.select_one('h3') or
+            result.select_one('h4')
+        )
+        link_element = (
+            result.select_one('.result-link') or
+            result.select_one('.url') or
+            result.select_one('a')
+        )
+        content_element = (
+            result.select_one('.result-content') or
+            result.select_one('.content') or
+            result.select_one('.snippet') or
+            result.select_one('p')
+        )
+        if title_element and link_element:
+            title = title_element.get_text(strip=True)
+            link = link_element.get('href')
+            if title and link:
+                results.append({
+                    'title': title,
+                    'snippet': content_element.get_text(strip=True) if content_element else '',
+                    'link': link
+                })
+        if len(results) >= count:
+            break
+    return results
+
+def parse_results_json(data: Dict, count: int) -> List[Dict]:
+    results = []
+    for item in data.get('results', []):
+        if item.get('title') and item.get('url'):
+            results.append({
+                'title': item['title'].strip(),
+                'snippet': (item.get('content') or '').strip(),
+                'link': item['url']
+            })
+        if len(results) >= count:
+            break
+    return results
+
+def search(instance_url: str, query: str, count: int, timeout: float = 10) -> List[Dict]:
+    """Search a SearXNG instance, preferring its JSON API over the HTML page.
+
+    Many public instances disable ``format=json``; a refusal is remembered
+    for an hour so those instances go straight to the HTML page.
+    """
+    params = {'q': query, 'language': 'en', 'pageno': '1'}
+    deadline = time.monotonic() + timeout
+
+    refused_at = _json_refused.get(instance_url)
+    if refused_at is None or time.time() - refused_at > JSON_RETRY_AFTER:
+        try:
+            response = requests.get(instance_url.rstrip('/') + '/search', params={**params, 'format': 'json'},
+                                    headers={**HEADERS, 'Accept': 'application/json'}, timeout=timeout)
+            if response.ok and 'json' in response.headers.get('Content-Type', ''):
+                _json_refused.pop(instance_url, None)
+                return parse_results_json(response.json(), count)
+            logger.debug(f"{instance_url} refused the JSON API ({response.status_code}), using HTML")
+            _json_refused[instance_url] = time.time()
+        except ValueError:
+            # Not valid JSON (e.g. an HTML error page)
+            _json_refused[instance_url] = time.time()
+
+    response = requests.get(instance_url, params=params, headers=HEADERS,
+                            timeout=max(deadline - time.monotonic(), 1))
+    response.raise_for_status()
+    return parse_results_html(response.text, count)
@@ -0,0 +1,168 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from PyQt6.QtCore import QThread, pyqtSignal
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from lifai.utils.logger_utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+BLOCKED = 'blocked'     # a dependency failed
+
+@dataclass
+class Step:
+    """One node of a task plan.
+
+    ``func`` receives a dict of its dependencies' results keyed by step name.
+    A step that raises is retried up to ``retries`` more times before it is
+    marked failed.
+    """
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    deps: Sequence[str] = ()
+    retries: int = 0
+    status: str = PENDING
+    result: Any = None
+    error: Optional[str] = None
+    attempts: int = 0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def duration(self) -> float:
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+class TaskGraph:
+    """A plan of steps with dependencies, executed on a thread pool.
+
+    Steps whose dependencies are done run in parallel. Results stay on the
+    steps, so after a failure ``run()`` can be called again and only the
+    failed steps (and the steps that were blocked by them) are executed.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.steps: Dict[str, Step] = {}
+        self.max_workers = max_workers
+
+    def add(self, name: str, func: Callable[[Dict[str, Any]], Any], deps: Sequence[str] = (),
+            retries: int = 0) -> Step:
+        for dep in deps:
+            if dep not in self.steps:
+                raise ValueError(f"Step '{name}' depends on unknown step '{dep}'")
+        if name in self.steps:
+            raise ValueError(f"Duplicate step '{name}'")
+        # Steps may only depend on earlier steps, so the graph can't have cycles
+        step = self.steps[name] = Step(name, func, tuple(deps), retries)
+        return step
+
+    def __getitem__(self, name: str) -> Step:
+        return self.steps[name]
+
+    @property
+    def failed(self) -> List[str]:
+        return [step.name for step in self.steps.values() if step.status in (FAILED, BLOCKED)]
+
+    @property
+    def completed(self) -> int:
+        return sum(step.status == DONE for step in self.steps.values())
+
+    def _ready(self) -> List[Step]:
+        return [step for step in self.steps.values()
+                if step.status == PENDING and all(self.steps[dep].status == DONE for dep in step.deps)]
+
+    def _block_dependents(self):
+        changed = True
+        while changed:
+            changed = False
+            for step in self.steps.values():
+                if step.status == PENDING and any(self.steps[dep].status in (FAILED, BLOCKED) for dep in step.deps):
+                    step.status = BLOCKED
+                    changed = True
+
+    def _execute(self, step: Step):
+        inputs = {dep: self.steps[dep].result for dep in step.deps}
+        while True:
+            step.attempts += 1
+            try:
+                return step.func(inputs)
+            except Exception as e:
+                if step.attempts > step.retries:
+                    raise
+                logger.warning(f"Step '{step.name}' failed (attempt {step.attempts}), retrying: {e}")
+
+    def run(self, on_started: Callable[[Step], None] = None, on_finished: Callable[[Step], None] = None,
+            should_stop: Callable[[], bool] = None) -> bool:
+        """Run every step that isn't done yet; returns True if all steps succeeded"""
+        for step in self.steps.values():
+            if step.status in (FAILED, BLOCKED, RUNNING):
+                step.status = PENDING
+                step.error = None
+                step.attempts = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='task-step') as executor:
+            running = {}
+            while True:
+                if not (should_stop and should_stop()):
+                    for step in self._ready():
+                        step.status = RUNNING
+                        step.started_at = time.time()
+                        step.finished_at = None
+                        if on_started:
+                            on_started(step)
+                        running[executor.submit(self._execute, step)] = step
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    step.finished_at = time.time()
+                    try:
+                        step.result = future.result()
+                        step.status = DONE
+                    except Exception as e:
+                        step.status = FAILED
+                        step.error = str(e)
+                        logger.error(f"Step '{step.name}' failed: {e}")
+                    if on_finished:
+                        on_finished(step)
+                self._block_dependents()
+
+        return all(step.status == DONE for step in self.steps.values())
+
+class TaskGraphWorker(QThread):
+    """Runs a TaskGraph off the GUI thread and reports step progress"""
+    step_started = pyqtSignal(str)
+    step_finished = pyqtSignal(str, str, float)     # name, status, seconds
+    progress = pyqtSignal(int, int)                 # completed, total
+    graph_finished = pyqtSignal(bool)
+
+    def __init__(self, graph: TaskGraph, parent=None):
+        super().__init__(parent)
+        self.graph = graph
+        self.stopped = False
+
+    def stop(self):
+        """Start no further steps; running steps finish"""
+        self.stopped = True
+
+    def run(self):
+        total = len(self.graph.steps)
+        self.progress.emit(self.graph.completed, total)
+
+        def finished(step: Step):
+            self.step_finished.emit(step.name, step.status, step.duration)
+            self.progress.emit(self.graph.completed, total)
+
+        success = self.graph.run(
+            on_started=lambda step: self.step_started.emit(step.name),
+            on_finished=finished,
+            should_stop=lambda: self.stopped
+        )
+        self.graph_finished.emit(success)
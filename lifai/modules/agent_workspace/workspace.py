@@ -1,12 +1,16 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                             QTabWidget, QTextEdit, QPushButton, QComboBox,
                             QLabel, QProgressBar, QFrame, QLineEdit, QFormLayout,
-                            QMessageBox, QGroupBox)
-from PyQt6.QtCore import Qt
+                            QMessageBox, QGroupBox, QCheckBox, QListWidget, QFileDialog,
+                            QSpinBox, QTableWidget, QTableWidgetItem, QHeaderView,
+                            QSplitter)
+from PyQt6.QtCore import Qt, QThread, QTimer
 from typing import Dict
 import requests
 import json
 import os
+import threading
+import time
 
 from lifai.utils.ollama_client import OllamaClient
 from lifai.utils.logger_utils import get_module_logger
@@ -18,6 +22,18 @@ class AgentWorkspaceWindow(QMainWindow):
         super().__init__()
         self.settings = settings
         self.ollama_client = ollama_client
+        self.ingest_worker = None
+        self.memory = None
+        self.memory_writer = None
+        self.cache = None
+        self.page_fetcher = None
+        self.task_worker = None
+        self.task_graph = None
+        self.task_request = None
+        self.step_states = {}
+        self.task_attempt = 0
+        self.pass_started_at = 0.0
+        self.history = None
         
         # Load API settings
         self.config_file = os.path.join(os.path.dirname(__file__), 'config.json')
@@ -72,10 +88,23 @@ class AgentWorkspaceWindow(QMainWindow):
         self.agent_types.addItems(["Account Manager", "Research Agent", "Repeat Scrubbing"])
         control_layout.addWidget(self.agent_types)
         
+        self.use_knowledge = QCheckBox("Use knowledge base")
+        control_layout.addWidget(self.use_knowledge)
+        
+        self.use_memory = QCheckBox("Use agent memory")
+        self.use_memory.setChecked(True)
+        control_layout.addWidget(self.use_memory)
+        
         # Execute button
-        execute_btn = QPushButton("Execute Task")
-        execute_btn.clicked.connect(self.execute_task)
-        control_layout.addWidget(execute_btn)
+        self.execute_btn = QPushButton("Execute Task")
+        self.execute_btn.clicked.connect(self.execute_task)
+        control_layout.addWidget(self.execute_btn)
+        
+        # Re-runs only the steps that failed in the last task
+        self.retry_btn = QPushButton("Retry Failed")
+        self.retry_btn.setEnabled(False)
+        self.retry_btn.clicked.connect(self.retry_failed_steps)
+        control_layout.addWidget(self.retry_btn)
         
         layout.addWidget(control_group)
         
@@ -84,6 +113,8 @@ class AgentWorkspaceWindow(QMainWindow):
         progress_layout = QVBoxLayout(progress_group)
         self.progress_bar = QProgressBar()
         progress_layout.addWidget(self.progress_bar)
+        self.step_status = QLabel("")
+        progress_layout.addWidget(self.step_status)
         
         layout.addWidget(progress_group)
         
@@ -161,8 +192,59 @@ class AgentWorkspaceWindow(QMainWindow):
         self.results_count.addItems(['5', '10', '15', '20'])
         self.results_count.setCurrentText(str(self.api_settings.get('results_count', 5)))
         common_layout.addRow("Results Count:", self.results_count)
+        
+        self.cache_ttl = QSpinBox()
+        self.cache_ttl.setRange(0, 7 * 24 * 60)
+        self.cache_ttl.setSuffix(" min")
+        self.cache_ttl.setValue(int(self.api_settings.get('search_cache_ttl', 60)))
+        self.cache_ttl.setToolTip("How long search results are reused; 0 disables the cache")
+        common_layout.addRow("Cache Results For:", self.cache_ttl)
+        
+        self.cache_stale = QCheckBox("Use expired results while refreshing in the background")
+        self.cache_stale.setChecked(self.api_settings.get('search_cache_stale', True))
+        common_layout.addRow("", self.cache_stale)
         layout.addWidget(common_group)
         
+        # Fan-out: query every configured engine at once and merge the results
+        fanout_group = QGroupBox("Multi-Engine Search")
+        fanout_layout = QFormLayout(fanout_group)
+        
+        self.search_fanout = QCheckBox("Query all configured engines concurrently")
+        self.search_fanout.setChecked(self.api_settings.get('search_fanout', False))
+        fanout_layout.addRow("", self.search_fanout)
+        
+        self.searxng_extra = QLineEdit()
+        self.searxng_extra.setText(', '.join(self.api_settings.get('searxng_extra_instances', [])))
+        self.searxng_extra.setPlaceholderText("https://searx.example.org, ...")
+        fanout_layout.addRow("Extra SearXNG Instances:", self.searxng_extra)
+        
+        self.search_deadline = QSpinBox()
+        self.search_deadline.setRange(1, 60)
+        self.search_deadline.setSuffix(" s")
+        self.search_deadline.setValue(int(self.api_settings.get('search_deadline', 8)))
+        fanout_layout.addRow("Search Deadline:", self.search_deadline)
+        layout.addWidget(fanout_group)
+        
+        # Research Agent reads the top result pages, not just their snippets
+        fetch_group = QGroupBox("Result Page Reading")
+        fetch_layout = QFormLayout(fetch_group)
+        
+        self.fetch_pages_enabled = QCheckBox("Read the top result pages for Research Agent tasks")
+        self.fetch_pages_enabled.setChecked(self.api_settings.get('fetch_pages', True))
+        fetch_layout.addRow("", self.fetch_pages_enabled)
+        
+        self.fetch_pages_count = QSpinBox()
+        self.fetch_pages_count.setRange(1, 20)
+        self.fetch_pages_count.setValue(int(self.api_settings.get('fetch_pages_count', 5)))
+        fetch_layout.addRow("Pages To Read:", self.fetch_pages_count)
+        
+        self.fetch_deadline = QSpinBox()
+        self.fetch_deadline.setRange(1, 60)
+        self.fetch_deadline.setSuffix(" s")
+        self.fetch_deadline.setValue(int(self.api_settings.get('fetch_deadline', 10)))
+        fetch_layout.addRow("Reading Deadline:", self.fetch_deadline)
+        layout.addWidget(fetch_group)
+        
         # Add save and test buttons
         button_layout = QHBoxLayout()
         save_btn = QPushButton("Save Settings")
@@ -192,15 +274,353 @@ class AgentWorkspaceWindow(QMainWindow):
     def create_memory_tab(self):
         widget = QWidget()
         layout = QVBoxLayout(widget)
-        layout.addWidget(QLabel("Memory Management - Coming Soon"))
+        
+        # Knowledge base: local documents retrieved into chat and task prompts
+        knowledge_group = QGroupBox("Knowledge Base")
+        knowledge_layout = QVBoxLayout(knowledge_group)
+        
+        model_layout = QFormLayout()
+        self.embedding_model = QLineEdit()
+        self.embedding_model.setText(self.api_settings.get('embedding_model', 'nomic-embed-text'))
+        self.embedding_model.setPlaceholderText("Embedding model of the active backend")
+        model_layout.addRow("Embedding Model:", self.embedding_model)
+        knowledge_layout.addLayout(model_layout)
+        
+        self.knowledge_files = QListWidget()
+        knowledge_layout.addWidget(self.knowledge_files)
+        
+        button_layout = QHBoxLayout()
+        add_files_btn = QPushButton("Add Files...")
+        add_files_btn.clicked.connect(self.add_knowledge_files)
+        add_folder_btn = QPushButton("Add Folder...")
+        add_folder_btn.clicked.connect(self.add_knowledge_folder)
+        refresh_btn = QPushButton("Update Changed Files")
+        refresh_btn.clicked.connect(lambda: self.start_ingest(None))
+        remove_btn = QPushButton("Remove Selected")
+        remove_btn.clicked.connect(self.remove_knowledge_file)
+        for button in (add_files_btn, add_folder_btn, refresh_btn, remove_btn):
+            button_layout.addWidget(button)
+        knowledge_layout.addLayout(button_layout)
+        
+        self.ingest_progress = QProgressBar()
+        self.ingest_progress.hide()
+        knowledge_layout.addWidget(self.ingest_progress)
+        self.knowledge_status = QLabel("")
+        knowledge_layout.addWidget(self.knowledge_status)
+        
+        layout.addWidget(knowledge_group)
+        self.knowledge_loaded = False
+        
+        # Agent memory: past tasks and facts recalled into new task prompts
+        memory_group = QGroupBox("Agent Memory")
+        memory_layout = QVBoxLayout(memory_group)
+        self.memory_list = QListWidget()
+        memory_layout.addWidget(self.memory_list)
+        
+        memory_buttons = QHBoxLayout()
+        forget_btn = QPushButton("Forget Selected")
+        forget_btn.clicked.connect(self.forget_memory)
+        clear_memory_btn = QPushButton("Clear All")
+        clear_memory_btn.clicked.connect(self.clear_memory)
+        memory_buttons.addWidget(forget_btn)
+        memory_buttons.addWidget(clear_memory_btn)
+        memory_layout.addLayout(memory_buttons)
+        self.memory_status = QLabel("")
+        memory_layout.addWidget(self.memory_status)
+        
+        layout.addWidget(memory_group)
         return widget
 
+    def knowledge_base(self):
+        from lifai.modules.rag import get_knowledge_base
+        return get_knowledge_base()
+
+    def refresh_knowledge_list(self):
+        """Show indexed files and index size"""
+        knowledge_base = self.knowledge_base()
+        self.knowledge_files.clear()
+        for info in knowledge_base.list_files():
+            self.knowledge_files.addItem(f"{info['path']}  ({info['chunks']} chunks)")
+            self.knowledge_files.item(self.knowledge_files.count() - 1).setData(
+                Qt.ItemDataRole.UserRole, info['path'])
+        stats = knowledge_base.stats()
+        model = f", model {stats['model']}" if stats['model'] else ""
+        self.knowledge_status.setText(f"{stats['files']} files, {stats['chunks']} chunks{model}")
+
+    def add_knowledge_files(self):
+        paths, _ = QFileDialog.getOpenFileNames(
+            self, "Add Documents", "",
+            "Documents (*.txt *.md *.log *.csv *.json *.pdf *.docx *.html *.htm);;All Files (*.*)"
+        )
+        if paths:
+            self.start_ingest(paths)
+
+    def add_knowledge_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Add Folder")
+        if folder:
+            self.start_ingest([folder])
+
+    def remove_knowledge_file(self):
+        item = self.knowledge_files.currentItem()
+        if item is not None and self.ingest_worker is None:
+            self.knowledge_base().remove(item.data(Qt.ItemDataRole.UserRole))
+            self.refresh_knowledge_list()
+
+    def start_ingest(self, paths):
+        """Embed new or changed files in the background; None updates all known files"""
+        if self.ingest_worker is not None:
+            return
+        from lifai.modules.rag import IngestWorker
+
+        model = self.embedding_model.text().strip()
+        if not model:
+            QMessageBox.warning(self, "Knowledge Base", "Enter the embedding model to use.")
+            return
+        self.api_settings['embedding_model'] = model
+        self.save_api_settings()
+
+        self.ingest_worker = IngestWorker(self.knowledge_base(), self.ollama_client, model, paths, self)
+        self.ingest_worker.progress.connect(self.on_ingest_progress)
+        self.ingest_worker.ingest_finished.connect(self.on_ingest_finished)
+        self.ingest_worker.ingest_failed.connect(
+            lambda error: self.knowledge_status.setText(f"Indexing failed: {error}"))
+        self.ingest_worker.finished.connect(self.on_ingest_worker_done)
+        self.ingest_progress.setValue(0)
+        self.ingest_progress.show()
+        self.ingest_worker.start()
+
+    def on_ingest_progress(self, done: int, total: int, path: str):
+        self.ingest_progress.setMaximum(max(total, 1))
+        self.ingest_progress.setValue(done)
+        if path:
+            self.knowledge_status.setText(f"Indexing {os.path.basename(path)} ({done + 1}/{total})")
+
+    def on_ingest_finished(self, result: dict):
+        self.refresh_knowledge_list()
+        self.knowledge_status.setText(
+            f"{self.knowledge_status.text()} - {result['added']} indexed, "
+            f"{result['unchanged']} unchanged, {result['failed']} failed"
+        )
+
+    def on_ingest_worker_done(self):
+        self.ingest_worker = None
+        self.ingest_progress.hide()
+
+    def agent_memory(self):
+        if self.memory is None:
+            from lifai.modules.agent_workspace.memory_store import AgentMemory
+            self.memory = AgentMemory(os.path.join(os.path.dirname(__file__), 'memory'))
+        return self.memory
+
+    def refresh_memory_list(self):
+        """Show the most recent memories"""
+        memory = self.agent_memory()
+        self.memory_list.clear()
+        for entry in memory.recent():
+            text = entry['text'].replace('\n', ' ')
+            self.memory_list.addItem(f"[{entry['kind']}] {text[:150]}")
+            self.memory_list.item(self.memory_list.count() - 1).setData(
+                Qt.ItemDataRole.UserRole, entry['id'])
+        stats = memory.stats()
+        self.memory_status.setText(f"{stats['memories']} memories, {stats['disk_bytes'] // 1024} KB of vectors")
+
+    def forget_memory(self):
+        item = self.memory_list.currentItem()
+        if item is not None:
+            self.agent_memory().forget(item.data(Qt.ItemDataRole.UserRole))
+            self.refresh_memory_list()
+
+    def clear_memory(self):
+        if self.memory_writer is not None:
+            return
+        reply = QMessageBox.question(self, "Agent Memory", "Delete all agent memories?")
+        if reply == QMessageBox.StandardButton.Yes:
+            self.agent_memory().clear()
+            self.refresh_memory_list()
+
+    def recall_memories(self, query: str, token_budget: int = 800) -> str:
+        """Past tasks and facts relevant to a new task, within a token budget"""
+        from lifai.modules.agent_workspace.memory_store import format_memories
+
+        memory = self.agent_memory()
+        if not memory.count:
+            return ''
+        try:
+            start = time.perf_counter()
+            vector = self.ollama_client.embed([query], memory.model)[0]
+            embedded = time.perf_counter()
+            memories = memory.recall(vector, token_budget)
+            logger.info(f"Recalled {len(memories)} memories: embedding {(embedded - start) * 1000:.0f} ms, "
+                        f"retrieval {(time.perf_counter() - embedded) * 1000:.1f} ms")
+        except Exception as e:
+            logger.error(f"Agent memory recall failed: {e}")
+            return ''
+        return format_memories(memories)
+
+    def remember_task(self, task: str, output: str, agent_type: str):
+        """Store the finished task and its extracted facts in the background"""
+        if self.memory_writer is not None:
+            return
+        from lifai.modules.agent_workspace.memory_store import MemoryWriter
+
+        memory = self.agent_memory()
+        embedding_model = memory.model or self.embedding_model.text().strip()
+        if not embedding_model:
+            return
+        self.memory_writer = MemoryWriter(memory, self.ollama_client, self.settings['model'].get(),
+                                          embedding_model, task, output, agent_type, self)
+        self.memory_writer.memories_saved.connect(lambda count: self.refresh_memory_list())
+        self.memory_writer.finished.connect(self.on_memory_writer_done)
+        self.memory_writer.start(QThread.Priority.LowPriority)
+
+    def on_memory_writer_done(self):
+        self.memory_writer = None
+
     def create_monitoring_tab(self):
         widget = QWidget()
         layout = QVBoxLayout(widget)
-        layout.addWidget(QLabel("Agent Monitoring - Coming Soon"))
+        
+        cache_group = QGroupBox("Search Cache")
+        cache_layout = QFormLayout(cache_group)
+        self.cache_hit_rate = QLabel("-")
+        self.cache_saved = QLabel("-")
+        self.cache_entries = QLabel("-")
+        cache_layout.addRow("Hit Rate:", self.cache_hit_rate)
+        cache_layout.addRow("Latency Saved:", self.cache_saved)
+        cache_layout.addRow("Cached Queries:", self.cache_entries)
+        clear_cache_btn = QPushButton("Clear Search Cache")
+        clear_cache_btn.clicked.connect(self.clear_search_cache)
+        cache_layout.addRow("", clear_cache_btn)
+        layout.addWidget(cache_group)
+        
+        # Agent runs: recent runs, the step timeline of the selected run and step percentiles
+        from lifai.modules.agent_workspace.run_timeline import RunTimeline
+        
+        runs_group = QGroupBox("Agent Runs")
+        runs_layout = QVBoxLayout(runs_group)
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        
+        self.runs_list = QListWidget()
+        self.runs_list.currentItemChanged.connect(self.on_run_selected)
+        splitter.addWidget(self.runs_list)
+        
+        self.run_timeline = RunTimeline()
+        splitter.addWidget(self.run_timeline)
+        
+        self.step_stats = QTableWidget(0, 5)
+        self.step_stats.setHorizontalHeaderLabels(["Agent Type", "Step", "Runs", "p50", "p95"])
+        self.step_stats.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.step_stats.verticalHeader().setVisible(False)
+        self.step_stats.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        splitter.addWidget(self.step_stats)
+        runs_layout.addWidget(splitter)
+        
+        clear_history_btn = QPushButton("Clear Run History")
+        clear_history_btn.clicked.connect(self.clear_run_history)
+        runs_layout.addWidget(clear_history_btn)
+        layout.addWidget(runs_group, 1)
+        
+        self.monitor_timer = QTimer(self)
+        self.monitor_timer.setInterval(2000)
+        self.monitor_timer.timeout.connect(self.update_monitoring)
         return widget
 
+    def run_history(self):
+        if self.history is None:
+            from lifai.modules.agent_workspace.run_history import RunHistory
+            self.history = RunHistory(os.path.join(os.path.dirname(__file__), 'history', 'runs.db'))
+        return self.history
+
+    def refresh_run_history(self):
+        """Reload the runs list and the step percentile table"""
+        history = self.run_history()
+        self.runs_list.clear()
+        for run in history.recent_runs():
+            started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(run['started_at']))
+            tokens = f", {run['prompt_tokens']}+{run['completion_tokens']} tokens" if run['prompt_tokens'] is not None else ""
+            retry = f" (retry {run['attempt'] - 1})" if run['attempt'] > 1 else ""
+            task = run['task'].replace('\n', ' ')[:60]
+            self.runs_list.addItem(
+                f"{started}  {run['agent_type']}{retry}  {run['status']}  "
+                f"{run['finished_at'] - run['started_at']:.1f}s{tokens}  - {task}"
+            )
+            self.runs_list.item(self.runs_list.count() - 1).setData(Qt.ItemDataRole.UserRole, run['id'])
+        
+        rows = history.step_percentiles()
+        self.step_stats.setRowCount(len(rows))
+        for row, stats in enumerate(rows):
+            values = [stats['agent_type'], stats['step'], str(stats['count']),
+                      f"{stats['p50']:.2f}s", f"{stats['p95']:.2f}s"]
+            for column, value in enumerate(values):
+                self.step_stats.setItem(row, column, QTableWidgetItem(value))
+
+    def on_run_selected(self, item, previous=None):
+        if item is None:
+            self.run_timeline.set_steps([])
+            return
+        self.run_timeline.set_steps(self.run_history().run_steps(item.data(Qt.ItemDataRole.UserRole)))
+
+    def clear_run_history(self):
+        reply = QMessageBox.question(self, "Agent Runs", "Delete the recorded run history?")
+        if reply == QMessageBox.StandardButton.Yes:
+            self.run_history().clear()
+            self.refresh_run_history()
+
+    def record_run(self, success: bool):
+        """Store the steps executed in the last pass of the task graph"""
+        task, agent_type = self.task_request
+        steps = []
+        output_chars = 0
+        for step in self.task_graph.steps.values():
+            if step.started_at is None or step.finished_at is None or step.started_at < self.pass_started_at:
+                continue
+            result = step.result if step.status == 'done' else None
+            stats = None
+            if isinstance(result, dict) and 'response' in result:
+                stats = result.get('stats')
+                result = result['response']
+                output_chars = len(result)
+            steps.append({
+                'step': step.name, 'status': step.status, 'started_at': step.started_at,
+                'finished_at': step.finished_at, 'attempts': step.attempts,
+                'output_chars': len(result if isinstance(result, str) else json.dumps(result, default=str))
+                                if result is not None else 0,
+                'stats': stats
+            })
+        try:
+            self.run_history().record_run(agent_type, task, self.settings['model'].get(), self.task_attempt,
+                                          'done' if success else 'failed', steps, output_chars)
+            self.refresh_run_history()
+        except Exception as e:
+            logger.error(f"Error recording agent run: {e}")
+
+    def search_cache(self):
+        if self.cache is None:
+            from lifai.modules.agent_workspace.search_cache import SearchCache
+            self.cache = SearchCache(os.path.join(os.path.dirname(__file__), 'cache'))
+        self.cache.ttl = int(self.api_settings.get('search_cache_ttl', 60)) * 60
+        self.cache.stale_while_revalidate = self.api_settings.get('search_cache_stale', True)
+        return self.cache
+
+    def clear_search_cache(self):
+        self.search_cache().clear()
+        self.update_monitoring()
+
+    def update_monitoring(self):
+        """Refresh the Monitoring tab counters"""
+        if self.cache is None:
+            return
+        stats = self.cache.stats()
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses']
+        self.cache_hit_rate.setText(
+            f"{stats['hit_rate']:.0%} of {lookups} searches "
+            f"({stats['hits']} fresh, {stats['stale_hits']} stale, {stats['misses']} misses)"
+        )
+        self.cache_saved.setText(
+            f"{stats['saved_seconds']:.1f}s saved, {stats['fetch_seconds']:.1f}s spent on engine requests"
+        )
+        self.cache_entries.setText(f"{stats['entries']} ({stats['revalidations']} background refreshes)")
+
     def load_api_settings(self):
         """Load API settings from config file"""
         try:
@@ -292,96 +712,27 @@ class AgentWorkspaceWindow(QMainWindow):
             'google_api_key': self.google_api_key.text(),
             'google_cx': self.google_cx.text(),
             'bing_api_key': self.bing_api_key.text(),
-            'results_count': int(self.results_count.currentText())
+            'results_count': int(self.results_count.currentText()),
+            'search_cache_ttl': self.cache_ttl.value(),
+            'search_cache_stale': self.cache_stale.isChecked(),
+            'search_fanout': self.search_fanout.isChecked(),
+            'searxng_extra_instances': [url.strip() for url in self.searxng_extra.text().split(',') if url.strip()],
+            'search_deadline': self.search_deadline.value(),
+            'fetch_pages': self.fetch_pages_enabled.isChecked(),
+            'fetch_pages_count': self.fetch_pages_count.value(),
+            'fetch_deadline': self.fetch_deadline.value()
         })
         self.save_api_settings()
         QMessageBox.information(self, "Success", "Settings saved successfully!")
 
-    def searxng_search(self, query: str) -> list:
-        """Perform search using SearXNG"""
+    def searxng_search(self, query: str, instance_url: str = None, timeout: float = 10) -> list:
+        """Perform search using SearXNG (JSON API, falling back to the HTML page)"""
+        from lifai.modules.agent_workspace import searxng_parser
+
         try:
-            instance_url = self.api_settings['searxng_instance']
-            
-            # Basic parameters without format specification
-            params = {
-                'q': query,
-                'language': 'en',
-                'pageno': '1'
-            }
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-            }
-            
+            instance_url = instance_url or self.api_settings['searxng_instance']
             logger.info(f"Performing SearXNG search: {query}")
-            response = requests.get(
-                instance_url,
-                params=params,
-                headers=headers,
-                timeout=10
-            )
-            response.raise_for_status()
-            
-            # Parse the HTML response using BeautifulSoup
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Try different possible selectors
-            results = []
-            result_elements = (
-                soup.select('.result') or
-                soup.select('.result-default') or
-                soup.select('.results-item') or
-                soup.select('article') or
-                soup.select('.searchresult')
-            )
-            
-            for result in result_elements:
-                try:
-                    # Try different possible selectors for title
-                    title_element = (
-                        result.select_one('.result-title') or
-                        result.select_one('.title') or
-                        result.select_one('h3') or
-                        result.select_one('h4')
-                    )
-                    
-                    # Try different possible selectors for link
-                    link_element = (
-                        result.select_one('.result-link') or
-                        result.select_one('.url') or
-                        result.select_one('a')
-                    )
-                    
-                    # Try different possible selectors for content
-                    content_element = (
-                        result.select_one('.result-content') or
-                        result.select_one('.content') or
-                        result.select_one('.snippet') or
-                        result.select_one('p')
-                    )
-                    
-                    if title_element and link_element:
-                        title = title_element.get_text(strip=True)
-                        link = link_element.get('href')
-                        content = content_element.get_text(strip=True) if content_element else ""
-                        
-                        if title and link:
-                            results.append({
-                                'title': title,
-                                'snippet': content,
-                                'link': link
-                            })
-                        
-                    if len(results) >= self.api_settings['results_count']:
-                        break
-                        
-                except Exception as e:
-                    logger.debug(f"Failed to parse result: {e}")
-                    continue
-            
+            results = searxng_parser.search(instance_url, query, int(self.api_settings['results_count']), timeout)
             logger.info(f"Found {len(results)} results")
             return results
             
@@ -389,18 +740,65 @@ class AgentWorkspaceWindow(QMainWindow):
             logger.error(f"SearXNG search error: {e}")
             return []
 
+    def fanout_searches(self, query: str) -> Dict:
+        """Search callables for every configured engine, keyed by engine name"""
+        searches = {}
+        instances = [self.api_settings.get('searxng_instance', '')] + self.api_settings.get('searxng_extra_instances', [])
+        for url in dict.fromkeys(url for url in instances if url):
+            searches[f"SearXNG {url}"] = lambda timeout, url=url: self.searxng_search(query, url, timeout)
+        if self.api_settings.get('google_api_key') and self.api_settings.get('google_cx'):
+            searches["Google"] = lambda timeout: self.google_search(query, timeout)
+        if self.api_settings.get('bing_api_key'):
+            searches["Bing"] = lambda timeout: self.bing_search(query, timeout)
+        return searches
+
+    def fanout_search(self, query: str) -> list:
+        """Query all configured engines concurrently and merge their results"""
+        from lifai.modules.agent_workspace.search_fanout import fan_out
+
+        results, _ = fan_out(
+            self.fanout_searches(query),
+            int(self.api_settings.get('results_count', 5)),
+            deadline=float(self.api_settings.get('search_deadline', 8))
+        )
+        return results
+
     def web_search(self, query: str) -> list:
-        """Perform web search using selected search engine"""
+        """Perform web search using selected search engine, through the search cache"""
         engine = self.api_settings.get('search_engine', 'SearXNG')
         
-        if engine == "Google Custom Search":
-            return self.google_search(query)
+        if self.api_settings.get('search_fanout'):
+            search = self.fanout_search
+            engine = "Fan-out " + ' | '.join(sorted(self.fanout_searches(query)))
+        elif engine == "Google Custom Search":
+            search = self.google_search
         elif engine == "Bing Search":
-            return self.bing_search(query)
+            search = self.bing_search
         else:
-            return self.searxng_search(query)
+            search = self.searxng_search
+            engine = f"SearXNG {self.api_settings.get('searxng_instance', '')}"
+        
+        cache = self.search_cache()
+        if cache.ttl <= 0:
+            return search(query)
+        return cache.get(engine, query, int(self.api_settings.get('results_count', 5)), lambda: search(query))
 
-    def google_search(self, query: str) -> list:
+    def fetch_pages(self, results: list) -> Dict[str, str]:
+        """Main text of the top result pages, fetched concurrently within the deadline"""
+        if self.page_fetcher is None:
+            from lifai.modules.agent_workspace.page_fetcher import PageFetcher
+            self.page_fetcher = PageFetcher(os.path.join(os.path.dirname(__file__), 'cache', 'pages'),
+                                            max_chars=3000)
+        urls = [result['link'] for result in results[:int(self.api_settings.get('fetch_pages_count', 5))]]
+        if not urls:
+            return {}
+        try:
+            return self.page_fetcher.fetch_all(urls, deadline=float(self.api_settings.get('fetch_deadline', 10)))
+        except Exception as e:
+            logger.error(f"Error reading result pages: {e}")
+            return {}
+
+    def google_search(self, query: str, timeout: float = 10) -> list:
         """Perform Google Custom Search"""
         try:
             api_key = self.api_settings.get('google_api_key')
@@ -418,7 +816,7 @@ class AgentWorkspaceWindow(QMainWindow):
                 'num': min(int(self.api_settings['results_count']), 10)
             }
             
-            response = requests.get(url, params=params)
+            response = requests.get(url, params=params, timeout=timeout)
             response.raise_for_status()
             
             items = response.json().get('items', [])
@@ -432,7 +830,7 @@ class AgentWorkspaceWindow(QMainWindow):
             logger.error(f"Google search error: {e}")
             return []
 
-    def bing_search(self, query: str) -> list:
+    def bing_search(self, query: str, timeout: float = 10) -> list:
         """Perform Bing Web Search"""
         try:
             api_key = self.api_settings.get('bing_api_key')
@@ -448,7 +846,7 @@ class AgentWorkspaceWindow(QMainWindow):
                 "count": min(int(self.api_settings['results_count']), 50)
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = requests.get(url, headers=headers, params=params, timeout=timeout)
             response.raise_for_status()
             
             webpages = response.json().get('webPages', {}).get('value', [])
@@ -463,151 +861,254 @@ class AgentWorkspaceWindow(QMainWindow):
             return []
 
     def execute_task(self):
-        """Execute the selected task with the chosen agent"""
+        """Plan the selected task as a graph of steps and run it in the background"""
+        if self.task_worker is not None:
+            return
+        task = self.task_input.toPlainText().strip()
+        agent_type = self.agent_types.currentText()
+        
+        if not task:
+            logger.warning("No task text provided")
+            return
+        
+        logger.info(f"Executing task with {agent_type}")
         try:
-            task_text = self.task_input.toPlainText().strip()
-            agent_type = self.agent_types.currentText()
+            self.task_graph = self.plan_task(task, agent_type)
+        except Exception as e:
+            logger.error(f"Error planning task: {e}")
+            self.task_output.setPlainText(f"Error: {str(e)}")
+            return
+        self.task_request = (task, agent_type)
+        self.task_attempt = 0
+        self.task_output.clear()
+        self.step_states = {}
+        self.start_task_graph()
+
+    def plan_task(self, task: str, agent_type: str):
+        """Steps for a task: independent lookups run in parallel, then generation"""
+        from lifai.modules.agent_workspace.task_graph import TaskGraph
+
+        graph = TaskGraph()
+        context = []
+        if agent_type == "Research Agent":
+            graph.add('search', lambda inputs: self.search_step(task), retries=1)
+            context.append('search')
+            if self.api_settings.get('fetch_pages', True):
+                graph.add('fetch', lambda inputs: self.fetch_pages(inputs['search']), deps=['search'])
+                context.append('fetch')
+        if self.use_knowledge.isChecked():
+            graph.add('knowledge', lambda inputs: self.retrieve_knowledge(task))
+            context.append('knowledge')
+        if self.use_memory.isChecked():
+            graph.add('memory', lambda inputs: self.recall_memories(task))
+            context.append('memory')
+        
+        task_text = self.build_task_text(agent_type, task)
+        model = self.settings['model'].get()
+        graph.add('generate', lambda inputs: self.generate_answer(agent_type, task_text, inputs, model),
+                  deps=context, retries=1)
+        return graph
+
+    def search_step(self, task: str) -> list:
+        logger.info("Performing web search...")
+        results = self.web_search(task)
+        if not results:
+            # Not a failure: the answer is generated without search results
+            logger.warning("No search results found")
+        return results or []
+
+    def build_task_text(self, agent_type: str, task_text: str) -> str:
+        """Task text with the agent type's context and guidelines"""
+        # For Account Manager, add specific context and guidelines
+        if agent_type == "Account Manager":
+            logger.info("Setting up Account Manager context...")
+            account_context = """
+            You are an professional and expereinced account manager with strong communication and soft skills.
+            """
+            task_text = f"{account_context}\n\nBelow is the customer email and communications: {task_text}. \n\n Your task is to analyze the provided customer emails to extract key points, pain points, requirements, expectations, and involved stakeholders. Summarize your findings in a clear and concise report using professional language and generate a response to the customer."
+
+        # For Repeat Scrubbing, add specific context and guidelines
+        elif agent_type == "Repeat Scrubbing":
+            logger.info("Setting up Repeat Scrubbing context...")
             
-            if not task_text:
-                logger.warning("No task text provided")
-                return
-                
-            logger.info(f"Executing task with {agent_type}")
-            self.progress_bar.setValue(10)
+            # Company-specific abbreviations and terms
+            company_terms = """
+            Common Internal Abbreviations and Terms:
+            - NOI = no other issues
+            - TS = troubleshooting
+            - LSP = Lenovo Service Provider
+            - FT = Field Technician
+            - CX = Customers
+            - TAM = Technical Account Manager
+            - L2 = level 2 support
+            - SB = systemboard
+            - MB = motherboard
+            - SP = speakers
+            - HP = Hewlett Packard
+            - red nub = trackpoint
+            - WWAN = cellular network card
+            - LAN = ethernet connection
+            - L1 = level 1 support agent
+            - LTS = level 1 support agent
+            - UCC = Univeral control centre usually responsible for parts and field tech
+            """
             
-            # For Research Agent, perform web search first
-            search_results = []
-            if agent_type == "Research Agent":
-                logger.info("Performing web search...")
-                search_results = self.web_search(task_text)
-                if not search_results:
-                    logger.warning("No search results found")
+            scrubbing_context = f"""
+            You the most experiened and professional tech support agent in a Lenovo like PC company. Your job is to understand the repair and figure out why there is a repeat repair and why couldn't we fix it the first time.
             
-            # For Account Manager, add specific context and guidelines
-            elif agent_type == "Account Manager":
-                logger.info("Setting up Account Manager context...")
-                account_context = """
-                You are an professional and expereinced account manager with strong communication and soft skills.
-                """
-                task_text = f"{account_context}\n\nBelow is the customer email and communications: {task_text}. \n\n Your task is to analyze the provided customer emails to extract key points, pain points, requirements, expectations, and involved stakeholders. Summarize your findings in a clear and concise report using professional language and generate a response to the customer."
-
-            # For Repeat Scrubbing, add specific context and guidelines
-            elif agent_type == "Repeat Scrubbing":
-                logger.info("Setting up Repeat Scrubbing context...")
-                
-                # Company-specific abbreviations and terms
-                company_terms = """
-                Common Internal Abbreviations and Terms:
-                - NOI = no other issues
-                - TS = troubleshooting
-                - LSP = Lenovo Service Provider
-                - FT = Field Technician
-                - CX = Customers
-                - TAM = Technical Account Manager
-                - L2 = level 2 support
-                - SB = systemboard
-                - MB = motherboard
-                - SP = speakers
-                - HP = Hewlett Packard
-                - red nub = trackpoint
-                - WWAN = cellular network card
-                - LAN = ethernet connection
-                - L1 = level 1 support agent
-                - LTS = level 1 support agent
-                - UCC = Univeral control centre usually responsible for parts and field tech
-                """
-                
-                scrubbing_context = f"""
-                You the most experiened and professional tech support agent in a Lenovo like PC company. Your job is to understand the repair and figure out why there is a repeat repair and why couldn't we fix it the first time.
-                
-                CONTEXT UNDERSTANDING:
-                {company_terms}
-                
-                YOUR CORE RESPONSIBILITIES:
-                1. Text Analysis:
-                   - Identify repeated information and redundant statements
-                   - Recognize and properly interpret company abbreviations
-                   - Understand technical context and domain-specific language
-                
-                2. Content Processing:
-                   - Consolidate similar points while preserving technical accuracy
-                   - Maintain proper use of company terminology
-                   - Ensure consistency in abbreviation usage
-                   - Preserve important technical details and specifications
-                
-                3. Quality Assurance:
-                   - Verify that all technical terms are correctly maintained
-                   - Ensure no critical information is lost during consolidation
-                   - Maintain document structure and technical context
-                """
-                
-                task_instructions = """
-                Please process the content following these steps:
-                1. Initial scan for company abbreviations and terms
-                2. Identify repetitive content while considering technical context
-                3. Consolidate similar information
-                4. Preserve unique technical details
-                5. Maintain proper terminology usage
-                
-                Provide output in the following format:
-                
-                === DOCUMENT METRICS ===
-                Original Length: [Word count]
-                Cleaned Length: [Word count]
-                Reduction: [Percentage]
-                
-                === ABBREVIATIONS DETECTED ===
-                [List all company abbreviations found in the text]
-                
-                === CLEANED CONTENT ===
-                [Your cleaned and consolidated content here]
-                
-                === CONSOLIDATION SUMMARY ===
-                [List of major changes and consolidations made]
-                
-                === TECHNICAL TERMS PRESERVED ===
-                [List of key technical terms and contexts maintained]
-                """
-                
-                task_text = f"{scrubbing_context}\n\nCONTENT TO PROCESS:\n{task_text}\n\n{task_instructions}"
-
-            # Construct the prompt based on agent type and search results
-            prompt = f"You are a {agent_type}. Please help with this task:\n\n{task_text}\n\n"
+            CONTEXT UNDERSTANDING:
+            {company_terms}
             
-            if search_results:
-                prompt += "\nBased on these search results:\n"
-                for i, result in enumerate(search_results, 1):
-                    prompt += f"\n{i}. {result['title']}\n"
-                    prompt += f"   {result['snippet']}\n"
-                    prompt += f"   Source: {result['link']}\n"
+            YOUR CORE RESPONSIBILITIES:
+            1. Text Analysis:
+               - Identify repeated information and redundant statements
+               - Recognize and properly interpret company abbreviations
+               - Understand technical context and domain-specific language
             
-            prompt += "\nProvide your response in a clear, step-by-step format."
+            2. Content Processing:
+               - Consolidate similar points while preserving technical accuracy
+               - Maintain proper use of company terminology
+               - Ensure consistency in abbreviation usage
+               - Preserve important technical details and specifications
             
-            logger.debug(f"Generated prompt with {'web search results' if search_results else 'no search results'}")
-            self.progress_bar.setValue(30)
+            3. Quality Assurance:
+               - Verify that all technical terms are correctly maintained
+               - Ensure no critical information is lost during consolidation
+               - Maintain document structure and technical context
+            """
             
-            # Generate response using ollama
-            response = self.ollama_client.generate_response(
-                prompt=prompt,
-                model=self.settings['model'].get()
-            )
+            task_instructions = """
+            Please process the content following these steps:
+            1. Initial scan for company abbreviations and terms
+            2. Identify repetitive content while considering technical context
+            3. Consolidate similar information
+            4. Preserve unique technical details
+            5. Maintain proper terminology usage
             
-            self.progress_bar.setValue(70)
+            Provide output in the following format:
             
-            if response:
-                self.task_output.clear()
-                self.task_output.setPlainText(response)
-                self.progress_bar.setValue(100)
-                logger.info("Task executed successfully")
-            else:
-                logger.error("No response generated from the model")
-                self.task_output.setPlainText("Error: Failed to generate response")
-                self.progress_bar.setValue(0)
-                
+            === DOCUMENT METRICS ===
+            Original Length: [Word count]
+            Cleaned Length: [Word count]
+            Reduction: [Percentage]
+            
+            === ABBREVIATIONS DETECTED ===
+            [List all company abbreviations found in the text]
+            
+            === CLEANED CONTENT ===
+            [Your cleaned and consolidated content here]
+            
+            === CONSOLIDATION SUMMARY ===
+            [List of major changes and consolidations made]
+            
+            === TECHNICAL TERMS PRESERVED ===
+            [List of key technical terms and contexts maintained]
+            """
+            
+            task_text = f"{scrubbing_context}\n\nCONTENT TO PROCESS:\n{task_text}\n\n{task_instructions}"
+
+        return task_text
+
+    def generate_answer(self, agent_type: str, task_text: str, inputs: Dict, model: str) -> Dict:
+        """Build the final prompt from the lookup steps' results and generate the answer"""
+        search_results = inputs.get('search') or []
+        pages = inputs.get('fetch') or {}
+        
+        # Construct the prompt based on agent type and search results
+        prompt = f"You are a {agent_type}. Please help with this task:\n\n{task_text}\n\n"
+        
+        if search_results:
+            prompt += "\nBased on these search results:\n"
+            for i, result in enumerate(search_results, 1):
+                prompt += f"\n{i}. {result['title']}\n"
+                prompt += f"   {result['snippet']}\n"
+                prompt += f"   Source: {result['link']}\n"
+                if result['link'] in pages:
+                    prompt += f"   Page content:\n{pages[result['link']]}\n"
+        
+        if inputs.get('knowledge'):
+            prompt += f"\nRelevant excerpts from the knowledge base:\n{inputs['knowledge']}\n"
+        
+        if inputs.get('memory'):
+            prompt += f"\nRelevant notes from previous tasks:\n{inputs['memory']}\n"
+        
+        prompt += "\nProvide your response in a clear, step-by-step format."
+        
+        logger.debug(f"Generated prompt with {'web search results' if search_results else 'no search results'}")
+        response = self.ollama_client.generate_response(prompt=prompt, model=model)
+        if not response:
+            raise RuntimeError("No response generated from the model")
+        return {'response': response, 'stats': getattr(self.ollama_client, 'last_response_stats', None)}
+
+    def start_task_graph(self):
+        from lifai.modules.agent_workspace.task_graph import TaskGraphWorker
+
+        self.execute_btn.setEnabled(False)
+        self.retry_btn.setEnabled(False)
+        self.task_attempt += 1
+        self.pass_started_at = time.time()
+        self.task_worker = TaskGraphWorker(self.task_graph, self)
+        self.task_worker.step_started.connect(self.on_task_step_started)
+        self.task_worker.step_finished.connect(self.on_task_step_finished)
+        self.task_worker.progress.connect(self.on_task_progress)
+        self.task_worker.graph_finished.connect(self.on_task_graph_finished)
+        self.task_worker.finished.connect(self.on_task_worker_done)
+        self.task_worker.start()
+
+    def retry_failed_steps(self):
+        """Run the failed steps of the last task again, reusing completed steps"""
+        if self.task_worker is None and self.task_graph is not None and self.task_graph.failed:
+            logger.info(f"Retrying steps: {', '.join(self.task_graph.failed)}")
+            self.start_task_graph()
+
+    def show_step_states(self):
+        self.step_status.setText("  |  ".join(f"{name}: {state}" for name, state in self.step_states.items()))
+
+    def on_task_step_started(self, name: str):
+        self.step_states[name] = "running"
+        self.show_step_states()
+
+    def on_task_step_finished(self, name: str, status: str, seconds: float):
+        self.step_states[name] = f"{status} ({seconds:.1f}s)"
+        self.show_step_states()
+
+    def on_task_progress(self, completed: int, total: int):
+        self.progress_bar.setValue(int(completed * 100 / max(total, 1)))
+
+    def on_task_graph_finished(self, success: bool):
+        graph = self.task_graph
+        task, agent_type = self.task_request
+        self.record_run(success)
+        if success:
+            response = graph['generate'].result['response']
+            self.task_output.setPlainText(response)
+            logger.info("Task executed successfully")
+            if self.use_memory.isChecked():
+                self.remember_task(task, response, agent_type)
+            return
+        
+        for name in graph.failed:
+            self.step_states[name] = graph[name].status
+        self.show_step_states()
+        errors = [f"{step.name}: {step.error}" for step in graph.steps.values() if step.error]
+        self.task_output.setPlainText("Error: " + ("; ".join(errors) or "task stopped"))
+        logger.error(f"Task failed at steps: {', '.join(graph.failed)}")
+
+    def on_task_worker_done(self):
+        self.task_worker = None
+        self.execute_btn.setEnabled(True)
+        self.retry_btn.setEnabled(bool(self.task_graph and self.task_graph.failed))
+
+    def retrieve_knowledge(self, query: str, max_chars: int = 6000) -> str:
+        """Top matching knowledge base excerpts for a task prompt"""
+        from lifai.modules.rag import format_knowledge
+
+        try:
+            results = self.knowledge_base().search(query, self.ollama_client, k=5)
         except Exception as e:
-            logger.error(f"Error executing task: {e}")
-            self.task_output.setPlainText(f"Error: {str(e)}")
-            self.progress_bar.setValue(0)
+            logger.error(f"Knowledge base search failed: {e}")
+            return ''
+        return format_knowledge(results, max_chars)
 
     def closeEvent(self, event):
         event.ignore()
@@ -616,6 +1117,17 @@ class AgentWorkspaceWindow(QMainWindow):
     def show(self):
         super().show()
         self.raise_()
+        self.update_monitoring()
+        self.monitor_timer.start()
+        if not self.knowledge_loaded:
+            # Open the index on first show rather than at startup
+            self.knowledge_loaded = True
+            self.refresh_knowledge_list()
+            self.refresh_memory_list()
+            self.refresh_run_history()
+            # Convert the stored vectors off the GUI thread so the first task doesn't wait
+            threading.Thread(target=self.agent_memory().load, daemon=True).start()
 
     def hide(self):
-        super().hide()
\ No newline at end of file
+        super().hide()
+        self.monitor_timer.stop()
\ No newline at end of file
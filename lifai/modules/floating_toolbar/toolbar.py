@@ -1,157 +1,175 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-from typing import Dict, Callable
-from pynput import mouse
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                            QPushButton, QComboBox, QMessageBox, QApplication)
+from PyQt6.QtCore import Qt, QObject, QPoint, pyqtSignal
+from typing import Dict, Callable, List
 from lifai.utils.ollama_client import OllamaClient
 from lifai.utils.clipboard_utils import ClipboardManager
 from lifai.utils.logger_utils import get_module_logger
-from lifai.config.prompts import improvement_options, llm_prompts
+from lifai.config.prompt_store import CompiledPrompt
+from lifai.config.prompts import prompt_registry, prompt_store
+from lifai.config.prompt_registry import PromptChange, apply_to_combo
+from lifai.utils.token_budget import CHUNK, REFUSE, WARN, generate_within, get_token_budget
 import time
 import threading
 
 logger = get_module_logger(__name__)
 
-class FloatingToolbar(tk.Toplevel):
+class _DragHandle(QWidget):
+    """Widget that moves its top-level window when dragged"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.drag_offset = None
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.drag_offset = event.globalPosition().toPoint() - self.window().pos()
+
+    def mouseMoveEvent(self, event):
+        if self.drag_offset is not None and event.buttons() & Qt.MouseButton.LeftButton:
+            self.window().move(event.globalPosition().toPoint() - self.drag_offset)
+
+    def mouseReleaseEvent(self, event):
+        self.drag_offset = None
+
+class _MiniButton(QPushButton):
+    """Draggable button shown while the toolbar is minimized"""
+
+    def __init__(self, on_click: Callable):
+        super().__init__("✨")
+        self.on_click = on_click
+        self.press_pos = None
+        self.drag_offset = None
+        self.setFixedWidth(32)
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint |
+            Qt.WindowType.Tool
+        )
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.press_pos = event.globalPosition().toPoint()
+            self.drag_offset = self.press_pos - self.pos()
+
+    def mouseMoveEvent(self, event):
+        if self.drag_offset is not None and event.buttons() & Qt.MouseButton.LeftButton:
+            self.move(event.globalPosition().toPoint() - self.drag_offset)
+
+    def mouseReleaseEvent(self, event):
+        # Only treat it as a click if the button was not dragged
+        moved = event.globalPosition().toPoint() - (self.press_pos or QPoint())
+        self.drag_offset = None
+        if moved.manhattanLength() < 4:
+            self.on_click()
+
+class FloatingToolbar(QWidget):
+    # Emitted from the mouse listener thread; delivered on the GUI thread
+    selection_finished = pyqtSignal()
+
     def __init__(self, callback: Callable, clipboard: ClipboardManager):
         super().__init__()
         self.callback = callback
         self.clipboard = clipboard
-        
-        # Prevent window from being closed with X button
-        self.protocol("WM_DELETE_WINDOW", lambda: None)
-        
+
         # Setup window properties
-        self.title("LifAi Toolbar")
-        self.attributes('-topmost', True)
-        self.overrideredirect(True)
-        
+        self.setWindowTitle("LifAi Toolbar")
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint |
+            Qt.WindowType.Tool
+        )
+
         # Create main frame
-        self.main_frame = ttk.Frame(self)
-        self.main_frame.pack(padx=5, pady=5)
-        
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(5, 5, 5, 5)
+
         # Create title bar for dragging
-        title_frame = ttk.Frame(self.main_frame)
-        title_frame.pack(fill=tk.X, pady=(0, 5))
-        
-        title_label = ttk.Label(title_frame, text="✨ LifAi")
-        title_label.pack(side=tk.LEFT)
-        
+        title_frame = _DragHandle()
+        title_layout = QHBoxLayout(title_frame)
+        title_layout.setContentsMargins(0, 0, 0, 0)
+        title_layout.addWidget(QLabel("✨ LifAi"))
+        title_layout.addStretch()
+
         # Minimize button
-        min_btn = ttk.Button(title_frame, text="—", width=3,
-                            command=self.minimize_toolbar)
-        min_btn.pack(side=tk.RIGHT)
-        
-        # Bind dragging events
-        title_frame.bind('<Button-1>', self.start_drag)
-        title_frame.bind('<B1-Motion>', self.on_drag)
-        
+        min_btn = QPushButton("—")
+        min_btn.setFixedWidth(32)
+        min_btn.clicked.connect(self.minimize_toolbar)
+        title_layout.addWidget(min_btn)
+        main_layout.addWidget(title_frame)
+
         # Create prompt selection
-        self.selected_prompt = tk.StringVar(value=improvement_options[0])
-        self.prompt_combo = ttk.Combobox(
-            self.main_frame,
-            textvariable=self.selected_prompt,
-            values=improvement_options,
-            state='readonly',
-            width=30
-        )
-        self.prompt_combo.pack(pady=(0, 5))
-        
+        self.prompt_combo = QComboBox()
+        self.prompts_version = prompt_registry.version
+        self.prompt_combo.addItems(prompt_registry.names())
+        self.prompt_combo.setMinimumWidth(220)
+        main_layout.addWidget(self.prompt_combo)
+
         # Create enhance button
-        self.enhance_btn = ttk.Button(
-            self.main_frame,
-            text="✨ Select & Enhance",
-            command=self.start_enhancement
-        )
-        self.enhance_btn.pack()
-        
-        # Variables for dragging
-        self.drag_data = {"x": 0, "y": 0}
+        self.enhance_btn = QPushButton("✨ Select & Enhance")
+        self.enhance_btn.clicked.connect(self.start_enhancement)
+        main_layout.addWidget(self.enhance_btn)
+
+        self.selection_finished.connect(self.reset_enhance_button)
+
+        self.mini_window = None
         self.waiting_for_selection = False
         self.mouse_down = False
         self.mouse_down_time = None
-        
-    def start_drag(self, event):
-        """Begin dragging the window"""
-        self.drag_data["x"] = event.x
-        self.drag_data["y"] = event.y
-        
-    def on_drag(self, event):
-        """Handle window dragging"""
-        x = self.winfo_x() - self.drag_data["x"] + event.x
-        y = self.winfo_y() - self.drag_data["y"] + event.y
-        self.geometry(f"+{x}+{y}")
-        
+
+    def closeEvent(self, event):
+        # Prevent window from being closed by the window manager
+        event.ignore()
+
     def minimize_toolbar(self):
         """Minimize to a small floating button"""
-        self.withdraw()
-        if not hasattr(self, 'mini_window'):
-            self.mini_window = tk.Toplevel()
-            self.mini_window.overrideredirect(True)
-            self.mini_window.attributes('-topmost', True)
-            
-            # Prevent mini window from being closed
-            self.mini_window.protocol("WM_DELETE_WINDOW", lambda: None)
-            
-            # Create small button
-            btn = ttk.Button(self.mini_window, text="✨", width=3,
-                           command=self.restore_toolbar)
-            btn.pack()
-            
+        self.hide()
+        if self.mini_window is None:
+            self.mini_window = _MiniButton(self.restore_toolbar)
+
             # Position mini window where the toolbar was
-            x = self.winfo_x()
-            y = self.winfo_y()
-            self.mini_window.geometry(f"+{x}+{y}")
-            
-            # Bind dragging for mini window
-            btn.bind('<Button-1>', self.start_mini_drag)
-            btn.bind('<B1-Motion>', self.on_mini_drag)
-            
+            self.mini_window.move(self.pos())
+            self.mini_window.show()
+
     def restore_toolbar(self):
         """Restore the main toolbar"""
-        if hasattr(self, 'mini_window'):
+        if self.mini_window is not None:
             # Get position from mini window
-            x = self.mini_window.winfo_x()
-            y = self.mini_window.winfo_y()
-            
+            pos = self.mini_window.pos()
+
             # Destroy mini window
-            self.mini_window.destroy()
-            delattr(self, 'mini_window')
-            
+            self.mini_window.close()
+            self.mini_window.deleteLater()
+            self.mini_window = None
+
             # Show main window at mini window's position
-            self.geometry(f"+{x}+{y}")
-            self.deiconify()
-            
-    def start_mini_drag(self, event):
-        """Begin dragging the mini window"""
-        self.drag_data["x"] = event.x
-        self.drag_data["y"] = event.y
-        
-    def on_mini_drag(self, event):
-        """Handle mini window dragging"""
-        x = self.mini_window.winfo_x() - self.drag_data["x"] + event.x
-        y = self.mini_window.winfo_y() - self.drag_data["y"] + event.y
-        self.mini_window.geometry(f"+{x}+{y}")
-        
+            self.move(pos)
+            self.show()
+
     def start_enhancement(self):
         """Start the enhancement process"""
         if self.waiting_for_selection:
             return
-            
-        selected_prompt = self.selected_prompt.get()
-        prompt_template = llm_prompts[selected_prompt]
-        self.enhance_btn.configure(text="Select text now...", state='disabled')
+
+        selected_prompt = self.prompt_combo.currentText()
+        prompt = prompt_store.get(selected_prompt)
+        if prompt is None:
+            return
+        self.enhance_btn.setText("Select text now...")
+        self.enhance_btn.setEnabled(False)
         self.waiting_for_selection = True
-        
+
         # Start waiting for selection in a separate thread
-        threading.Thread(target=self.wait_for_selection, 
-                       args=(prompt_template,), 
+        threading.Thread(target=self.wait_for_selection,
+                       args=(prompt,),
                        daemon=True).start()
-        
-    def wait_for_selection(self, prompt_template):
+
+    def wait_for_selection(self, prompt):
         """Wait for text selection and then process it"""
         try:
+            from pynput import mouse
             self.mouse_down = False
-            
+
             def on_click(x, y, button, pressed):
                 if button == mouse.Button.left:
                     if pressed:
@@ -161,7 +179,7 @@ class FloatingToolbar(tk.Toplevel):
                         if self.mouse_down:
                             # Calculate how long the mouse was held down
                             hold_duration = time.time() - (self.mouse_down_time or 0)
-                            
+
                             # If held for more than 0.2 seconds, consider it a drag-select
                             if hold_duration > 0.2:
                                 # Small delay after release
@@ -170,50 +188,53 @@ class FloatingToolbar(tk.Toplevel):
                                 if selected_text:
                                     logger.debug(f"Selection complete after {hold_duration:.2f}s: {selected_text[:100]}...")
                                     self.waiting_for_selection = False
-                                    self.callback(prompt_template, selected_text)
+                                    self.callback(prompt, selected_text)
                                     return False  # Stop listener
                             else:
                                 logger.debug(f"Ignored quick click ({hold_duration:.2f}s)")
-                                
+
                         self.mouse_down = False
                         self.mouse_down_time = None
-            
+
             # Start mouse listener
             with mouse.Listener(on_click=on_click) as listener:
                 listener.join()
-                
+
         except Exception as e:
             logger.error(f"Error waiting for selection: {e}")
         finally:
             # Reset button state
             self.waiting_for_selection = False
-            self.after(0, lambda: self.enhance_btn.configure(
-                text="✨ Select & Enhance", 
-                state='normal'
-            ))
-            
-    def update_prompts(self, new_options):
-        """Update the prompts dropdown with new options"""
-        current = self.selected_prompt.get()
-        self.prompt_combo['values'] = new_options
-        
-        # Try to keep the current selection if it still exists
-        if current in new_options:
-            self.selected_prompt.set(current)
-        else:
-            self.selected_prompt.set(new_options[0])
-        
-        # Force the combobox to refresh
-        self.prompt_combo.update()
-
-class FloatingToolbarModule:
+            self.selection_finished.emit()
+
+    def reset_enhance_button(self):
+        self.enhance_btn.setText("✨ Select & Enhance")
+        self.enhance_btn.setEnabled(True)
+
+    def update_prompts(self, changes: List[PromptChange]):
+        """Apply prompt library changes to the dropdown, keeping the selection"""
+        self.prompts_version = apply_to_combo(self.prompt_combo, changes,
+                                              prompt_registry.names(), self.prompts_version)
+
+    def destroy(self):
+        if self.mini_window is not None:
+            self.mini_window.close()
+            self.mini_window.deleteLater()
+            self.mini_window = None
+        self.deleteLater()
+
+class FloatingToolbarModule(QObject):
+    # Text processing runs on the listener thread; errors are shown on the GUI thread
+    error_signal = pyqtSignal(str)
+
     def __init__(self, settings: Dict, ollama_client: OllamaClient):
+        super().__init__()
         logger.info("Initializing Floating Toolbar Module")
         self.settings = settings
         self.ollama_client = ollama_client
         self.clipboard = ClipboardManager()
         self.toolbar = None
-        self.cached_options = None
+        self.error_signal.connect(self.show_error)
 
     def enable(self):
         logger.info("Enabling Floating Toolbar")
@@ -222,11 +243,9 @@ class FloatingToolbarModule:
                 callback=self.process_text,
                 clipboard=self.clipboard
             )
-            # Apply any cached updates
-            if self.cached_options:
-                self.toolbar.update_prompts(self.cached_options)
-            screen_width = self.toolbar.winfo_screenwidth()
-            self.toolbar.geometry(f"+{screen_width-300}+50")
+            screen_width = QApplication.primaryScreen().availableGeometry().width()
+            self.toolbar.move(screen_width - 300, 50)
+            self.toolbar.show()
 
     def disable(self):
         logger.info("Disabling Floating Toolbar")
@@ -234,35 +253,49 @@ class FloatingToolbarModule:
             self.toolbar.destroy()
             self.toolbar = None
 
-    def process_text(self, prompt_template: str, selected_text: str):
+    def destroy(self):
+        self.disable()
+
+    def process_text(self, prompt: CompiledPrompt, selected_text: str):
         """Process the text after user selects it"""
         try:
             logger.info("Processing text with prompt template")
             logger.debug(f"Selected text length: {len(selected_text)}")
 
-            prompt = prompt_template.format(text=selected_text)
+            model = self.settings['model'].get()
+            preflight = get_token_budget(self.ollama_client).check_template(prompt, selected_text, model)
+            if preflight.action == REFUSE:
+                logger.error(preflight.message)
+                self.error_signal.emit(preflight.message)
+                return
+            if preflight.action in (WARN, CHUNK):
+                logger.warning(preflight.message)
 
             logger.debug("Sending request to Ollama")
-            improved_text = self.ollama_client.generate_response(
-                prompt=prompt,
-                model=self.settings['model'].get()
-            )
+            results = []
+            for part in preflight.chunks or [selected_text]:
+                result = generate_within(self.ollama_client, prompt.render(text=part), model, preflight)
+                if not result:
+                    results = []
+                    break
+                results.append(result.strip())
+            improved_text = '\n\n'.join(results)
 
             if improved_text:
                 logger.info("Successfully processed text")
                 self.clipboard.replace_selected_text(improved_text.strip())
             else:
                 logger.error("Failed to process text")
-                messagebox.showerror("Error", "Failed to generate improved text")
+                self.error_signal.emit("Failed to generate improved text")
 
         except Exception as e:
             logger.error(f"Error processing text: {str(e)}")
-            messagebox.showerror("Error", f"Error processing text: {e}")
+            self.error_signal.emit(f"Error processing text: {e}")
 
-    def update_prompts(self, new_options):
-        """Handle prompt updates whether toolbar is active or not"""
-        self.cached_options = new_options
-        if self.toolbar:
-            self.toolbar.update_prompts(new_options)
+    def show_error(self, message: str):
+        QMessageBox.critical(None, "Error", message)
 
-    
\ No newline at end of file
+    def update_prompts(self, changes: List[PromptChange]):
+        """Handle prompt updates; a toolbar created later reads the current library"""
+        if self.toolbar:
+            self.toolbar.update_prompts(changes)
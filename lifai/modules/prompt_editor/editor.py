@@ -1,378 +1,299 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-import json
-import os
-from typing import Dict, Callable
+from PyQt6.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, QGroupBox,
+                            QListWidget, QLabel, QLineEdit, QPlainTextEdit,
+                            QPushButton, QMessageBox, QFileDialog)
+from PyQt6.QtCore import Qt
+from typing import Dict, List
 from datetime import datetime
 from lifai.utils.logger_utils import get_module_logger
-from lifai.config.prompts import improvement_options, llm_prompts
+from lifai.config.prompts import prompt_registry, prompt_store
+from lifai.config.prompt_registry import PromptChange, REMOVED, RENAMED, UPDATED
+from lifai.config.prompt_store import CompiledPrompt, PromptError, read_prompt_file, write_prompt_file
 
 logger = get_module_logger(__name__)
 
+# Built-in prompts kept in the library but hidden from the editor
+SYSTEM_PROMPTS = {
+    "Pro spell fix",
+    "Pro rewrite V4",
+    "TS questions convertor",
+    "Translator",
+    "Internal communications"
+}
+
+class _EditorFrame(QWidget):
+    def closeEvent(self, event):
+        # Prevent window from being closed with X button
+        event.ignore()
+
 class PromptEditorWindow:
     def __init__(self, settings: Dict):
         self.settings = settings
         self.window = None
-        self.prompts_file = os.path.join(os.path.dirname(__file__), '../../config/saved_prompts.py')
-        
         # Load saved prompts or use defaults
         self.prompts_data = {
             'templates': self.load_saved_prompts()
         }
-        self.update_callbacks = []
         self.is_visible = False
         self.has_unsaved_changes = False
         
     def load_saved_prompts(self):
-        """Load prompts from saved file or return defaults"""
-        try:
-            if os.path.exists(self.prompts_file):
-                namespace = {}
-                with open(self.prompts_file, 'r', encoding='utf-8') as f:
-                    exec(f.read(), namespace)
-                if 'llm_prompts' in namespace:
-                    logger.info("Loaded saved prompts successfully")
-                    # Filter out system prompts from editor view
-                    system_prompts = {
-                        "Pro spell fix",
-                        "Pro rewrite V4", 
-                        "TS questions convertor",
-                        "Translator",
-                        "Internal communications"
-                    }
-                    return {k: v for k, v in namespace['llm_prompts'].items() 
-                           if k not in system_prompts}
-        except Exception as e:
-            logger.error(f"Error loading saved prompts: {e}")
-        return {}  # Return empty dict instead of llm_prompts.copy()
+        """User prompts from the prompt library (system prompts are not editable here)"""
+        logger.info("Loaded saved prompts successfully")
+        return {k: v for k, v in prompt_store.templates.items() if k not in SYSTEM_PROMPTS}
+
+    def library_templates(self) -> Dict[str, str]:
+        """The edited prompts plus the system prompts they don't cover"""
+        final_prompts = {
+            k: v for k, v in prompt_store.templates.items()
+            if k in SYSTEM_PROMPTS
+        }
+        final_prompts.update(self.prompts_data['templates'])
+        return final_prompts
 
     def save_prompts_to_file(self):
-        """Save current prompts to file while preserving system prompts"""
+        """Save current prompts to the library while preserving system prompts"""
         try:
-            # First load existing prompts to preserve system prompts
-            namespace = {}
-            with open(self.prompts_file, 'r', encoding='utf-8') as f:
-                exec(f.read(), namespace)
-            existing_prompts = namespace.get('llm_prompts', {})
-
-            # Merge user prompts with system prompts
-            system_prompts = {
-                "Pro spell fix",
-                "Pro rewrite V4",
-                "TS questions convertor", 
-                "Translator",
-                "Internal communications"
-            }
-            
-            # Keep system prompts and add user prompts
-            final_prompts = {
-                k: v for k, v in existing_prompts.items() 
-                if k in system_prompts
-            }
-            final_prompts.update(self.prompts_data['templates'])
-
-            # Write to file
-            os.makedirs(os.path.dirname(self.prompts_file), exist_ok=True)
-            with open(self.prompts_file, 'w', encoding='utf-8') as f:
-                f.write("llm_prompts = {\n")
-                for name, template in final_prompts.items():
-                    f.write(f"    \"{name}\": \"\"\"{template}\"\"\",\n")
-                f.write("}\n\n")
-                f.write("# Get options from llm_prompts keys\n")
-                f.write("improvement_options = list(llm_prompts.keys())\n")
+            # The registry saves the file and sends the changes to the open windows
+            prompt_registry.replace_all(self.library_templates())
             logger.info("Prompts saved to file successfully")
         except Exception as e:
             logger.error(f"Error saving prompts to file: {e}")
-            messagebox.showerror("Error", f"Failed to save prompts: {e}")
+            QMessageBox.critical(self.window, "Error", f"Failed to save prompts: {e}")
+
+    def update_prompts(self, changes: List[PromptChange]):
+        """Take in library changes made elsewhere (e.g. the shared prompt folder)"""
+        templates = self.prompts_data['templates']
+        for change in changes:
+            if change.kind in (REMOVED, RENAMED):
+                templates.pop(change.old_name or change.name, None)
+            if change.kind != REMOVED and change.name not in SYSTEM_PROMPTS:
+                templates[change.name] = prompt_store.templates.get(change.name, '')
+        if self.window is not None and any(change.kind != UPDATED for change in changes):
+            self.refresh_list()
 
-    def add_update_callback(self, callback: Callable):
-        """Add a callback to be notified when prompts are updated"""
-        if callback not in self.update_callbacks:
-            self.update_callbacks.append(callback)
-        
     def notify_prompt_updates(self):
-        """Update the global prompts"""
-        # Update global variables
-        llm_prompts.clear()
-        llm_prompts.update(self.prompts_data['templates'])
-        
-        # Get the list of options
-        options = list(llm_prompts.keys())
-        
-        # Update improvement_options
-        improvement_options.clear()
-        improvement_options.extend(options)
-        
-        # Notify all callbacks with the new options
-        for callback in self.update_callbacks:
-            try:
-                callback(options)
-            except Exception as e:
-                logger.error(f"Error notifying prompt update: {e}")
+        """Publish the edited prompts to the open windows without saving them"""
+        prompt_registry.replace_all(self.library_templates(), save=False)
         
     def show(self):
         """Show the editor window"""
-        if self.window is None or not self.window.winfo_exists():
+        if self.window is None:
             self.create_window()
-        self.window.deiconify()
+        self.window.show()
+        self.window.raise_()
         self.is_visible = True
-        
+
     def hide(self):
         """Hide the editor window"""
-        if self.window and self.window.winfo_exists():
-            self.window.withdraw()
+        if self.window is not None:
+            self.window.hide()
         self.is_visible = False
-            
+
+    def destroy(self):
+        if self.window is not None:
+            self.window.deleteLater()
+            self.window = None
+
     def create_window(self):
         """Create the editor window"""
         if self.window:
-            self.window.destroy()
-            
-        self.window = tk.Toplevel()
-        self.window.title("Prompt Editor")
-        self.window.geometry("600x500")
-        
-        # Prevent window from being closed with X button
-        self.window.protocol("WM_DELETE_WINDOW", lambda: None)
-        
+            self.window.deleteLater()
+
+        self.window = _EditorFrame()
+        self.window.setWindowTitle("Prompt Editor")
+        self.window.resize(600, 500)
+
         # Main container
-        main_frame = ttk.Frame(self.window, padding=10)
-        main_frame.pack(fill=tk.BOTH, expand=True)
-        
+        main_layout = QHBoxLayout(self.window)
+
         # Prompts list frame (left side)
-        list_frame = ttk.LabelFrame(main_frame, text="Prompts", padding=5)
-        list_frame.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 5))
-        
+        list_frame = QGroupBox("Prompts")
+        list_layout = QVBoxLayout(list_frame)
+        main_layout.addWidget(list_frame)
+
         # Prompts listbox
-        self.prompts_list = tk.Listbox(list_frame, width=30, exportselection=False)
-        self.prompts_list.pack(fill=tk.Y, expand=True)
-        self.prompts_list.bind('<<ListboxSelect>>', self.on_prompt_select)
-        
+        self.prompts_list = QListWidget()
+        self.prompts_list.setFixedWidth(220)
+        self.prompts_list.currentRowChanged.connect(self.on_prompt_select)
+        list_layout.addWidget(self.prompts_list)
+
         # Populate list
-        for option in self.prompts_data['templates'].keys():
-            self.prompts_list.insert(tk.END, option)
-            
+        self.prompts_list.addItems(list(self.prompts_data['templates'].keys()))
+
         # Editor frame (right side)
-        editor_frame = ttk.Frame(main_frame)
-        editor_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
+        editor_layout = QVBoxLayout()
+        main_layout.addLayout(editor_layout, 1)
+
         # Name field
-        name_frame = ttk.Frame(editor_frame)
-        name_frame.pack(fill=tk.X, pady=(0, 5))
-        ttk.Label(name_frame, text="Name:").pack(side=tk.LEFT)
-        self.name_entry = ttk.Entry(name_frame)
-        self.name_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
-        
+        name_layout = QHBoxLayout()
+        name_layout.addWidget(QLabel("Name:"))
+        self.name_entry = QLineEdit()
+        name_layout.addWidget(self.name_entry)
+        editor_layout.addLayout(name_layout)
+
         # Template editor
-        ttk.Label(editor_frame, text="Prompt Template:").pack(anchor=tk.W)
-        self.template_text = tk.Text(editor_frame, height=10, wrap=tk.WORD)
-        self.template_text.pack(fill=tk.BOTH, expand=True, pady=5)
-        
+        editor_layout.addWidget(QLabel("Prompt Template:"))
+        self.template_text = QPlainTextEdit()
+        editor_layout.addWidget(self.template_text)
+
         # Help text
-        help_text = "Use {text} as placeholder for the selected text in your prompt template"
-        ttk.Label(editor_frame, text=help_text, foreground='gray').pack(anchor=tk.W)
-        
+        help_label = QLabel("Use {text} as placeholder for the selected text in your prompt template")
+        help_label.setStyleSheet("color: gray")
+        editor_layout.addWidget(help_label)
+
         # Buttons frame
-        buttons_frame = ttk.Frame(editor_frame)
-        buttons_frame.pack(fill=tk.X, pady=10)
-        
-        # Save button
-        save_btn = ttk.Button(
-            buttons_frame,
-            text="Save Prompt",
-            command=self.save_prompt
-        )
-        save_btn.pack(side=tk.LEFT, padx=5)
-        
-        # Delete button
-        delete_btn = ttk.Button(
-            buttons_frame,
-            text="Delete Prompt",
-            command=self.delete_prompt
-        )
-        delete_btn.pack(side=tk.LEFT, padx=5)
-        
-        # New button
-        new_btn = ttk.Button(
-            buttons_frame,
-            text="New Prompt",
-            command=self.new_prompt
-        )
-        new_btn.pack(side=tk.LEFT, padx=5)
-        
-        # Export button
-        export_btn = ttk.Button(
-            buttons_frame,
-            text="Export",
-            command=self.export_prompts
-        )
-        export_btn.pack(side=tk.LEFT, padx=5)
-        
-        # Import button
-        import_btn = ttk.Button(
-            buttons_frame,
-            text="Import",
-            command=self.import_prompts
-        )
-        import_btn.pack(side=tk.LEFT, padx=5)
-        
+        buttons_layout = QHBoxLayout()
+        editor_layout.addLayout(buttons_layout)
+
+        for text, command in (
+            ("Save Prompt", self.save_prompt),
+            ("Delete Prompt", self.delete_prompt),
+            ("New Prompt", self.new_prompt),
+            ("Export", self.export_prompts),
+            ("Import", self.import_prompts),
+        ):
+            button = QPushButton(text)
+            button.clicked.connect(command)
+            buttons_layout.addWidget(button)
+
         # Apply changes button
-        self.apply_btn = ttk.Button(
-            editor_frame,
-            text="Apply Changes",
-            command=self.apply_changes,
-            state='disabled'
-        )
-        self.apply_btn.pack(anchor=tk.E, pady=5)
-        
+        self.apply_btn = QPushButton("Apply Changes")
+        self.apply_btn.clicked.connect(self.apply_changes)
+        self.apply_btn.setEnabled(False)
+        editor_layout.addWidget(self.apply_btn, alignment=Qt.AlignmentFlag.AlignRight)
+
         # Status label
-        self.status_label = ttk.Label(editor_frame, text="")
-        self.status_label.pack(anchor=tk.E)
-        
-    def on_prompt_select(self, event):
+        self.status_label = QLabel("")
+        editor_layout.addWidget(self.status_label, alignment=Qt.AlignmentFlag.AlignRight)
+
+    def set_status(self, text: str, color: str):
+        self.status_label.setText(text)
+        self.status_label.setStyleSheet(f"color: {color}")
+
+    def on_prompt_select(self, row: int):
         """Handle prompt selection"""
-        selection = self.prompts_list.curselection()
-        if not selection:
+        if row < 0:
             return
-            
-        name = self.prompts_list.get(selection[0])
+
+        name = self.prompts_list.item(row).text()
         template = self.prompts_data['templates'].get(name, '')
-        
-        self.name_entry.delete(0, tk.END)
-        self.name_entry.insert(0, name)
-        
-        self.template_text.delete('1.0', tk.END)
-        self.template_text.insert('1.0', template)
-        
+
+        self.name_entry.setText(name)
+        self.template_text.setPlainText(template)
+
     def new_prompt(self):
         """Clear the editor for a new prompt"""
-        self.name_entry.delete(0, tk.END)
-        self.template_text.delete('1.0', tk.END)
-        self.prompts_list.selection_clear(0, tk.END)
-        
+        self.name_entry.clear()
+        self.template_text.clear()
+        self.prompts_list.clearSelection()
+        self.prompts_list.setCurrentRow(-1)
+
     def save_prompt(self):
         """Save the current prompt"""
-        name = self.name_entry.get().strip()
-        template = self.template_text.get('1.0', 'end-1c').strip()
-        
+        name = self.name_entry.text().strip()
+        template = self.template_text.toPlainText().strip()
+
         if not name or not template:
-            messagebox.showerror("Error", "Name and template are required")
+            QMessageBox.critical(self.window, "Error", "Name and template are required")
             return
-            
-        if "{text}" not in template:
-            messagebox.showerror("Error", "Template must contain {text} placeholder")
+
+        try:
+            CompiledPrompt(name, template)
+        except PromptError as e:
+            QMessageBox.critical(self.window, "Error", str(e))
             return
-            
+
         # Update data
         self.prompts_data['templates'][name] = template
-        
+
         # Refresh list if it's a new prompt
-        if name not in self.prompts_list.get(0, tk.END):
-            self.prompts_list.insert(tk.END, name)
-        
+        if not self.prompts_list.findItems(name, Qt.MatchFlag.MatchExactly):
+            self.prompts_list.addItem(name)
+
         # Mark as having unsaved changes
         self.mark_unsaved_changes()
-        messagebox.showinfo("Success", "Prompt saved successfully")
-        
+        QMessageBox.information(self.window, "Success", "Prompt saved successfully")
+
     def delete_prompt(self):
         """Delete the selected prompt"""
-        selection = self.prompts_list.curselection()
-        if not selection:
+        row = self.prompts_list.currentRow()
+        if row < 0:
             return
-            
-        name = self.prompts_list.get(selection[0])
-        if messagebox.askyesno("Confirm Delete", f"Delete prompt '{name}'?"):
+
+        name = self.prompts_list.item(row).text()
+        answer = QMessageBox.question(self.window, "Confirm Delete", f"Delete prompt '{name}'?")
+        if answer == QMessageBox.StandardButton.Yes:
             self.prompts_data['templates'].pop(name, None)
-            self.prompts_list.delete(selection[0])
+            self.prompts_list.takeItem(row)
             self.new_prompt()
-            
+
             # Mark as having unsaved changes
             self.mark_unsaved_changes()
-            
+
     def mark_unsaved_changes(self):
         """Mark that there are changes that need to be applied"""
         self.has_unsaved_changes = True
-        self.status_label.config(
-            text="Changes need to be applied",
-            foreground='#1976D2'  # Blue color
-        )
-        self.apply_btn.config(state='normal')
-        
+        self.set_status("Changes need to be applied", '#1976D2')  # Blue color
+        self.apply_btn.setEnabled(True)
+
     def apply_changes(self):
         """Apply changes to all modules"""
         try:
-            # Update the global prompt variables
-            llm_prompts.clear()
-            llm_prompts.update(self.prompts_data['templates'])
-            
-            # Save to file
+            # Update the global prompts, save them and notify the open windows
             self.save_prompts_to_file()
             
-            # Notify all registered callbacks
-            for callback in self.update_callbacks:
-                try:
-                    callback(list(llm_prompts.keys()))
-                except Exception as e:
-                    logger.error(f"Error notifying prompt update: {e}")
-            
             # Reset status
             self.has_unsaved_changes = False
-            self.status_label.config(
-                text="Changes applied and saved successfully",
-                foreground='#4CAF50'  # Green color
-            )
-            self.apply_btn.config(state='disabled')
+            self.set_status("Changes applied and saved successfully", '#4CAF50')  # Green color
+            self.apply_btn.setEnabled(False)
             
             logger.info("Prompt changes applied to all modules")
             
         except Exception as e:
             logger.error(f"Error applying changes: {e}")
-            messagebox.showerror("Error", f"Failed to apply changes: {e}")
+            QMessageBox.critical(self.window, "Error", f"Failed to apply changes: {e}")
     
     def export_prompts(self):
         try:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f'prompts_export_{timestamp}.py'
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write("llm_prompts = {\n")
-                for name, template in self.prompts_data['templates'].items():
-                    f.write(f"    \"{name}\": \"\"\"{template}\"\"\",\n")
-                f.write("}\n\n")
-                f.write("# Get options from llm_prompts keys\n")
-                f.write("improvement_options = list(llm_prompts.keys())\n")
-            messagebox.showinfo("Success", f"Prompts exported to {filename}")
+            filename = f'prompts_export_{timestamp}.json'
+            write_prompt_file(filename, self.prompts_data['templates'])
+            QMessageBox.information(self.window, "Success", f"Prompts exported to {filename}")
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to export: {e}")
+            QMessageBox.critical(self.window, "Error", f"Failed to export: {e}")
             
     def import_prompts(self):
         try:
-            filename = filedialog.askopenfilename(
-                title="Import Prompts",
-                filetypes=[("Python files", "*.py"), ("JSON files", "*.json")]
+            filename, _ = QFileDialog.getOpenFileName(
+                self.window,
+                "Import Prompts",
+                "",
+                "Prompt files (*.json *.py);;JSON files (*.json);;Python files (*.py)"
             )
             if filename:
-                if filename.endswith('.json'):
-                    with open(filename) as f:
-                        data = json.load(f)
-                        self.prompts_data = {'templates': data['templates']}
-                else:  # Python file
-                    namespace = {}
-                    with open(filename) as f:
-                        exec(f.read(), namespace)
-                    self.prompts_data = {'templates': namespace.get('llm_prompts', {})}
+                # Python files are parsed, not executed
+                imported = read_prompt_file(filename)
+                # Shared folder prompts stay, as system prompts do; an imported prompt
+                # of the same name is kept as the local version behind the shared one
+                for name in prompt_store.external:
+                    if name in imported:
+                        prompt_store.shadowed[name] = imported[name]
+                templates = dict(imported)
+                templates.update({name: prompt_store.templates[name] for name in prompt_store.external
+                                  if name in prompt_store.templates and name not in SYSTEM_PROMPTS})
+                self.prompts_data = {'templates': templates}
                 
                 if self.prompts_data['templates']:
                     self.refresh_list()
                     self.notify_prompt_updates()
-                    messagebox.showinfo("Success", "Prompts imported successfully")
+                    QMessageBox.information(self.window, "Success", "Prompts imported successfully")
                 else:
                     raise ValueError("Invalid prompts file format")
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to import: {e}")
+            QMessageBox.critical(self.window, "Error", f"Failed to import: {e}")
             
     def refresh_list(self):
-        self.prompts_list.delete(0, tk.END)
-        for option in self.prompts_data['templates'].keys():
-            self.prompts_list.insert(tk.END, option)
+        self.prompts_list.clear()
+        self.prompts_list.addItems(list(self.prompts_data['templates'].keys()))
 
     
\ No newline at end of file
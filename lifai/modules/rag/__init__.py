@@ -0,0 +1,5 @@
+from .chunking import chunk_text
+from .vector_index import VectorIndex
+from .knowledge_base import KnowledgeBase, IngestWorker, format_knowledge, get_knowledge_base
+
+__all__ = ['chunk_text', 'VectorIndex', 'KnowledgeBase', 'IngestWorker', 'format_knowledge', 'get_knowledge_base']
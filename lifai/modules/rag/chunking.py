@@ -0,0 +1,37 @@
+import re
+from typing import List
+
+def chunk_text(text: str, max_chars: int = 1200, overlap: int = 150) -> List[str]:
+    """Split text into chunks of at most ``max_chars`` characters.
+
+    Chunks are built from whole paragraphs where possible, then sentences,
+    and consecutive chunks share up to ``overlap`` characters so a passage
+    cut at a boundary is still found by either chunk.
+    """
+    pieces = []
+    for paragraph in re.split(r'\n\s*\n', text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in re.split(r'(?<=[.!?])\s+', paragraph):
+            # Hard-wrap sentences that are longer than a chunk (tables, logs)
+            for start in range(0, len(sentence), max_chars):
+                pieces.append(sentence[start:start + max_chars])
+
+    chunks = []
+    current = ''
+    for piece in pieces:
+        if current and len(current) + len(piece) + 2 > max_chars:
+            chunks.append(current)
+            tail = current[-overlap:] if overlap else ''
+            # Start the overlap at a word boundary
+            tail = tail[tail.find(' ') + 1:] if ' ' in tail else tail
+            current = f"{tail}\n\n{piece}" if tail and len(tail) + len(piece) + 2 <= max_chars else piece
+        else:
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,176 @@
+import os
+import time
+import numpy as np
+from pathlib import Path
+from PyQt6.QtCore import QThread, pyqtSignal
+from typing import Callable, Dict, Iterable, List, Optional
+from lifai.modules.rag.chunking import chunk_text
+from lifai.modules.rag.vector_index import VectorIndex
+from lifai.modules.AI_chat.document_extract import extract_document, file_sha256
+from lifai.utils.logger_utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+SUPPORTED_SUFFIXES = {'.txt', '.md', '.log', '.csv', '.json', '.py', '.rst',
+                      '.pdf', '.docx', '.html', '.htm'}
+DEFAULT_EMBEDDING_MODEL = 'nomic-embed-text'
+
+class KnowledgeBase:
+    """Documents chunked, embedded by the active backend and stored in a
+    ``VectorIndex``.
+
+    Ingestion is incremental: a file whose size and mtime are unchanged is
+    skipped, a touched file is re-hashed and only re-embedded if its content
+    changed. Chunks are embedded in batches of ``BATCH_SIZE``.
+    """
+    BATCH_SIZE = 32
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.index = VectorIndex(self.directory)
+        self.extract_dir = self.directory / 'extracted'
+
+    def _embed(self, client, model: str, texts: List[str]) -> np.ndarray:
+        vectors = []
+        for start in range(0, len(texts), self.BATCH_SIZE):
+            vectors.extend(client.embed(texts[start:start + self.BATCH_SIZE], model))
+        return np.asarray(vectors, dtype=np.float32)
+
+    @staticmethod
+    def expand_paths(paths: Iterable[str]) -> List[str]:
+        """Files to ingest; directories are searched recursively"""
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                for root, _, names in os.walk(path):
+                    files.extend(os.path.join(root, name) for name in sorted(names)
+                                 if Path(name).suffix.lower() in SUPPORTED_SUFFIXES)
+            elif os.path.isfile(path):
+                files.append(path)
+        return [os.path.abspath(path) for path in files]
+
+    def ingest(self, paths: Iterable[str], client, model: str,
+               progress: Callable[[int, int, str], None] = None,
+               should_stop: Callable[[], bool] = None) -> Dict:
+        """Add or update files; returns counts of added, unchanged and failed files"""
+        if self.index.model and self.index.model != model:
+            logger.info(f"Embedding model changed from {self.index.model} to {model}, rebuilding knowledge base")
+            known = [info['path'] for info in self.index.list_files()]
+            self.index.reset(model)
+            paths = list(paths) + known
+
+        files = self.expand_paths(paths)
+        result = {'added': 0, 'unchanged': 0, 'failed': 0, 'chunks': 0}
+        start_time = time.perf_counter()
+        for number, path in enumerate(files, 1):
+            if should_stop and should_stop():
+                break
+            if progress:
+                progress(number - 1, len(files), path)
+            try:
+                chunks = self._ingest_file(path, client, model)
+                if chunks is None:
+                    result['unchanged'] += 1
+                else:
+                    result['added'] += 1
+                    result['chunks'] += chunks
+            except Exception as e:
+                logger.error(f"Error ingesting {path}: {e}")
+                result['failed'] += 1
+
+        if self.index.needs_rebuild():
+            self.index.rebuild()
+        if progress:
+            progress(len(files), len(files), '')
+        logger.info(f"Knowledge base ingest: {result} in {time.perf_counter() - start_time:.1f} s")
+        return result
+
+    def _ingest_file(self, path: str, client, model: str) -> Optional[int]:
+        stat = os.stat(path)
+        info = self.index.file_info(path)
+        if info and info['size'] == stat.st_size and info['mtime'] == stat.st_mtime:
+            return None
+        digest = file_sha256(path)
+        if info and info['sha256'] == digest:
+            self.index.touch_file(path, stat.st_size, stat.st_mtime)
+            return None
+
+        document = extract_document(path, self.extract_dir)
+        with open(document.text_path, 'r', encoding='utf-8', errors='replace') as f:
+            chunks = chunk_text(f.read())
+        vectors = self._embed(client, model, chunks) if chunks else np.zeros((0, self.index.dim or 1))
+        self.index.replace_file(path, digest, stat.st_size, stat.st_mtime, chunks, vectors, model)
+        return len(chunks)
+
+    def refresh(self, client, model: str, **kwargs) -> Dict:
+        """Re-ingest known files and drop the ones that no longer exist"""
+        paths = []
+        for info in self.index.list_files():
+            if os.path.exists(info['path']):
+                paths.append(info['path'])
+            else:
+                self.index.remove_file(info['path'])
+        return self.ingest(paths, client, model, **kwargs)
+
+    def remove(self, path: str):
+        self.index.remove_file(path)
+
+    def search(self, query: str, client, k: int = 5) -> List[Dict]:
+        """Top-k chunks for a query; empty if nothing has been indexed"""
+        if not self.index.count or not self.index.model:
+            return []
+        vector = client.embed([query], self.index.model)[0]
+        return self.index.search(np.asarray(vector, dtype=np.float32), k)
+
+    def stats(self) -> Dict:
+        return self.index.stats()
+
+    def list_files(self) -> List[Dict]:
+        return self.index.list_files()
+
+def format_knowledge(results: List[Dict], max_chars: int) -> str:
+    """Retrieved chunks as a prompt section, best first, within ``max_chars``"""
+    parts = []
+    used = 0
+    for number, result in enumerate(results, 1):
+        entry = f"[{number}] ({os.path.basename(result['source'])})\n{result['text']}"
+        if used + len(entry) > max_chars:
+            break
+        parts.append(entry)
+        used += len(entry)
+    return '\n\n'.join(parts)
+
+_knowledge_base = None
+
+def get_knowledge_base() -> KnowledgeBase:
+    """The knowledge base shared by the chat and agent windows"""
+    global _knowledge_base
+    if _knowledge_base is None:
+        _knowledge_base = KnowledgeBase(Path(__file__).parent / 'index')
+    return _knowledge_base
+
+class IngestWorker(QThread):
+    """Runs knowledge base ingestion off the GUI thread"""
+    progress = pyqtSignal(int, int, str)
+    ingest_finished = pyqtSignal(dict)
+    ingest_failed = pyqtSignal(str)
+
+    def __init__(self, knowledge_base: KnowledgeBase, client, model: str,
+                 paths: List[str] = None, parent=None):
+        super().__init__(parent)
+        self.knowledge_base = knowledge_base
+        self.client = client
+        self.model = model
+        self.paths = paths  # None refreshes every known file
+
+    def run(self):
+        try:
+            kwargs = {'progress': self.progress.emit, 'should_stop': self.isInterruptionRequested}
+            if self.paths is None:
+                result = self.knowledge_base.refresh(self.client, self.model, **kwargs)
+            else:
+                result = self.knowledge_base.ingest(self.paths, self.client, self.model, **kwargs)
+            self.ingest_finished.emit(result)
+        except Exception as e:
+            logger.error(f"Knowledge base ingest failed: {e}")
+            self.ingest_failed.emit(str(e))
@@ -0,0 +1,369 @@
+import sqlite3
+import threading
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+from lifai.utils.logger_utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+class VectorIndex:
+    """Persistent cosine-similarity index: vectors in a memory-mapped file,
+    chunk text and file bookkeeping in SQLite.
+
+    Vectors are normalized float32 rows of ``vectors-<n>.f32``. Small indexes
+    are searched exhaustively. Once an index has ``IVF_MIN_ROWS`` rows it is
+    partitioned with k-means: rows are rewritten grouped by their nearest
+    centroid, so a query scores the centroids and then only the contiguous
+    row ranges of the ``nprobe`` closest lists. Rows added after the last
+    rebuild form a tail that is always scanned in full; the index is rebuilt
+    when the tail (or the share of deleted rows) grows too large.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS files (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path TEXT NOT NULL UNIQUE,
+            sha256 TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS chunks (
+            row INTEGER PRIMARY KEY,
+            file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            text TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_chunks_file ON chunks(file_id);
+    """
+    IVF_MIN_ROWS = 20000
+    REBUILD_TAIL_RATIO = 0.1
+    REBUILD_DEAD_RATIO = 0.25
+    DEFAULT_NPROBE = 24
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.RLock()
+
+        self.conn = sqlite3.connect(str(self.directory / 'index.db'), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(self.SCHEMA)
+        self.conn.commit()
+
+        self.dim = int(self._meta('dim', 0))
+        self.count = int(self._meta('count', 0))
+        self.vectors = None
+        self.capacity = 0
+        self._open_vectors()
+        self._load_alive()
+        self._load_ivf()
+
+    # Bookkeeping
+
+    def _meta(self, key: str, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else default
+
+    def _set_meta(self, key: str, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    @property
+    def model(self) -> Optional[str]:
+        return self._meta('model')
+
+    def _vectors_path(self, generation: int = None) -> Path:
+        generation = int(self._meta('generation', 0)) if generation is None else generation
+        return self.directory / f'vectors-{generation}.f32'
+
+    def _open_vectors(self, min_capacity: int = 0):
+        self.vectors = None
+        if not self.dim:
+            self.capacity = 0
+            return
+        path = self._vectors_path()
+        row_bytes = self.dim * 4
+        size = path.stat().st_size if path.exists() else 0
+        capacity = size // row_bytes
+        if capacity < max(min_capacity, 1):
+            # Grow geometrically so appends rarely remap the file
+            capacity = max(min_capacity, capacity * 2, 1024)
+            with open(path, 'ab') as f:
+                f.truncate(capacity * row_bytes)
+        self.capacity = capacity
+        self.vectors = np.memmap(path, dtype=np.float32, mode='r+', shape=(capacity, self.dim))
+
+    def _load_alive(self):
+        self.alive = np.zeros(self.capacity, dtype=bool)
+        rows = [row[0] for row in self.conn.execute("SELECT row FROM chunks")]
+        if rows:
+            self.alive[np.array(rows, dtype=np.int64)] = True
+
+    def _load_ivf(self):
+        self.centroids = None
+        self.offsets = None
+        self.ivf_rows = int(self._meta('ivf_rows', 0))
+        path = self.directory / f'ivf-{self._meta("generation", 0)}.npz'
+        if self.ivf_rows and path.exists():
+            data = np.load(path)
+            self.centroids = data['centroids']
+            self.offsets = data['offsets']
+        else:
+            self.ivf_rows = 0
+
+    # Files
+
+    def file_info(self, path: str) -> Optional[Dict]:
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM files WHERE path = ?", (path,)).fetchone()
+        return dict(row) if row else None
+
+    def list_files(self) -> List[Dict]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT f.id, f.path, f.size, f.mtime, COUNT(c.row) AS chunks "
+                "FROM files f LEFT JOIN chunks c ON c.file_id = f.id GROUP BY f.id ORDER BY f.path"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def touch_file(self, path: str, size: int, mtime: float):
+        """Record a new mtime for a file whose content did not change"""
+        with self.lock:
+            self.conn.execute("UPDATE files SET size = ?, mtime = ? WHERE path = ?", (size, mtime, path))
+            self.conn.commit()
+
+    def remove_file(self, path: str):
+        with self.lock:
+            info = self.file_info(path)
+            if info is None:
+                return
+            self._delete_rows(info['id'])
+            self.conn.execute("DELETE FROM files WHERE id = ?", (info['id'],))
+            self.conn.commit()
+
+    def _delete_rows(self, file_id: int):
+        rows = [row[0] for row in self.conn.execute("SELECT row FROM chunks WHERE file_id = ?", (file_id,))]
+        if rows:
+            self.alive[np.array(rows, dtype=np.int64)] = False
+        self.conn.execute("DELETE FROM chunks WHERE file_id = ?", (file_id,))
+
+    # Writing
+
+    def reset(self, model: str = None):
+        """Drop every vector, e.g. when the embedding model changes"""
+        with self.lock:
+            self.conn.execute("DELETE FROM chunks")
+            self.conn.execute("DELETE FROM files")
+            self.conn.execute("DELETE FROM meta")
+            if model:
+                self._set_meta('model', model)
+            self.conn.commit()
+            self.vectors = None
+            for path in self.directory.glob('vectors-*.f32'):
+                path.unlink()
+            for path in self.directory.glob('ivf-*.npz'):
+                path.unlink()
+            self.dim = self.count = self.capacity = self.ivf_rows = 0
+            self.alive = np.zeros(0, dtype=bool)
+            self.centroids = self.offsets = None
+
+    def replace_file(self, path: str, sha256: str, size: int, mtime: float,
+                     texts: Sequence[str], vectors: np.ndarray, model: str):
+        """Store the chunks of a file, replacing its previous chunks"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(texts) != len(vectors):
+            raise ValueError("Each chunk needs exactly one vector")
+        with self.lock:
+            if self.dim == 0 and len(vectors):
+                self.dim = vectors.shape[1]
+                self._set_meta('dim', self.dim)
+                self._set_meta('model', model)
+                self._open_vectors()
+                self.alive = np.zeros(self.capacity, dtype=bool)
+            if len(vectors) and vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding size {vectors.shape[1]} does not match the index ({self.dim})")
+
+            info = self.file_info(path)
+            if info:
+                self._delete_rows(info['id'])
+                self.conn.execute("UPDATE files SET sha256 = ?, size = ?, mtime = ? WHERE id = ?",
+                                  (sha256, size, mtime, info['id']))
+                file_id = info['id']
+            else:
+                file_id = self.conn.execute(
+                    "INSERT INTO files (path, sha256, size, mtime) VALUES (?, ?, ?, ?)",
+                    (path, sha256, size, mtime)
+                ).lastrowid
+
+            if len(vectors):
+                start = self.count
+                end = start + len(vectors)
+                if end > self.capacity:
+                    self.vectors.flush()
+                    self._open_vectors(min_capacity=end)
+                    self.alive = np.concatenate([self.alive, np.zeros(self.capacity - len(self.alive), dtype=bool)])
+                norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+                self.vectors[start:end] = vectors / np.maximum(norms, 1e-12)
+                # Vectors reach the disk before the rows that point at them
+                self.vectors.flush()
+                self.conn.executemany(
+                    "INSERT INTO chunks (row, file_id, position, text) VALUES (?, ?, ?, ?)",
+                    ((start + i, file_id, i, text) for i, text in enumerate(texts))
+                )
+                self.count = end
+                self._set_meta('count', self.count)
+                self.alive[start:end] = True
+            self.conn.commit()
+
+    # Searching
+
+    def search(self, query: np.ndarray, k: int = 5, nprobe: int = DEFAULT_NPROBE) -> List[Dict]:
+        """Top-k chunks by cosine similarity"""
+        with self.lock:
+            if self.vectors is None or self.count == 0:
+                return []
+            query = np.asarray(query, dtype=np.float32).reshape(-1)
+            query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+            ranges = self._probe_ranges(query, nprobe)
+            rows = np.concatenate([np.arange(start, end) for start, end in ranges]) if ranges else np.zeros(0, int)
+            scores = np.concatenate([self.vectors[start:end] @ query for start, end in ranges]) if ranges else np.zeros(0)
+            mask = self.alive[rows]
+            rows, scores = rows[mask], scores[mask]
+            if len(rows) == 0:
+                return []
+
+            k = min(k, len(rows))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return self._chunks(rows[top], scores[top])
+
+    def _probe_ranges(self, query: np.ndarray, nprobe: int) -> List[tuple]:
+        """Contiguous row ranges to score: the closest IVF lists plus the tail"""
+        if self.centroids is None:
+            return [(0, self.count)]
+        nprobe = min(nprobe, len(self.centroids))
+        lists = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        ranges = [(int(self.offsets[i]), int(self.offsets[i + 1])) for i in sorted(lists)
+                  if self.offsets[i + 1] > self.offsets[i]]
+        if self.count > self.ivf_rows:
+            ranges.append((self.ivf_rows, self.count))
+        return ranges
+
+    def _chunks(self, rows: np.ndarray, scores: np.ndarray) -> List[Dict]:
+        placeholders = ','.join('?' * len(rows))
+        found = {
+            row['row']: row for row in self.conn.execute(
+                f"SELECT c.row, c.position, c.text, f.path FROM chunks c JOIN files f ON f.id = c.file_id "
+                f"WHERE c.row IN ({placeholders})", [int(r) for r in rows]
+            )
+        }
+        return [
+            {'text': found[int(row)]['text'], 'source': found[int(row)]['path'],
+             'position': found[int(row)]['position'], 'score': float(score)}
+            for row, score in zip(rows, scores) if int(row) in found
+        ]
+
+    # Maintenance
+
+    def needs_rebuild(self) -> bool:
+        live = int(self.alive[:self.count].sum()) if self.count else 0
+        if live < self.IVF_MIN_ROWS:
+            # Small indexes are scanned exhaustively; only reclaim space
+            return self.count > 1000 and self.count - live > self.REBUILD_DEAD_RATIO * self.count
+        tail = self.count - self.ivf_rows
+        return (self.centroids is None or tail > self.REBUILD_TAIL_RATIO * live or
+                self.count - live > self.REBUILD_DEAD_RATIO * self.count)
+
+    def rebuild(self, iterations: int = 8, sample_size: int = 20000, batch: int = 8192):
+        """Drop deleted rows and, for large indexes, regroup rows by k-means list"""
+        with self.lock:
+            live_rows = np.flatnonzero(self.alive[:self.count])
+            n = len(live_rows)
+            generation = int(self._meta('generation', 0)) + 1
+            new_path = self._vectors_path(generation)
+
+            centroids = offsets = None
+            order = live_rows
+            if n >= self.IVF_MIN_ROWS:
+                nlist = int(np.sqrt(n))
+                centroids = self._train_centroids(live_rows, nlist, iterations, sample_size)
+                assignment = np.empty(n, dtype=np.int32)
+                for start in range(0, n, batch):
+                    block = self.vectors[live_rows[start:start + batch]]
+                    assignment[start:start + batch] = np.argmax(block @ centroids.T, axis=1)
+                by_list = np.argsort(assignment, kind='stable')
+                order = live_rows[by_list]
+                offsets = np.searchsorted(assignment[by_list], np.arange(nlist + 1))
+
+            capacity = max(n * 2, 1024)
+            new_vectors = np.memmap(new_path, dtype=np.float32, mode='w+', shape=(capacity, self.dim))
+            for start in range(0, n, batch):
+                end = min(start + batch, n)
+                new_vectors[start:end] = self.vectors[order[start:end]]
+            new_vectors.flush()
+            del new_vectors
+            if centroids is not None:
+                np.savez(self.directory / f'ivf-{generation}.npz', centroids=centroids, offsets=offsets)
+
+            # Renumber chunk rows; the switch to the new files is one transaction
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS row_map (old INTEGER PRIMARY KEY, new INTEGER)")
+            self.conn.execute("DELETE FROM row_map")
+            self.conn.executemany("INSERT INTO row_map (old, new) VALUES (?, ?)",
+                                  ((int(old), new) for new, old in enumerate(order)))
+            self.conn.execute("UPDATE chunks SET row = -1 - (SELECT new FROM row_map WHERE old = chunks.row)")
+            self.conn.execute("UPDATE chunks SET row = -1 - row")
+            self._set_meta('generation', generation)
+            self._set_meta('count', n)
+            self._set_meta('ivf_rows', n if centroids is not None else 0)
+            self.conn.commit()
+
+            old_generation = generation - 1
+            self.vectors = None
+            for stale in (self._vectors_path(old_generation), self.directory / f'ivf-{old_generation}.npz'):
+                if stale.exists():
+                    stale.unlink()
+            self.count = n
+            self._open_vectors()
+            self._load_alive()
+            self._load_ivf()
+            logger.info(f"Rebuilt vector index: {n} rows, "
+                        f"{len(centroids) if centroids is not None else 0} lists")
+
+    def _train_centroids(self, rows: np.ndarray, nlist: int, iterations: int, sample_size: int) -> np.ndarray:
+        """Spherical k-means on a sample of the live rows"""
+        rng = np.random.default_rng(0)
+        sample_rows = np.sort(rng.choice(rows, size=min(sample_size, len(rows)), replace=False))
+        sample = np.asarray(self.vectors[sample_rows])
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            empty = np.bincount(assignment, minlength=nlist) == 0
+            # Reseed empty lists with random sample rows
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()), replace=False)]
+            centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+        return centroids.astype(np.float32)
+
+    def stats(self) -> Dict:
+        with self.lock:
+            live = int(self.alive[:self.count].sum()) if self.count else 0
+            return {
+                'files': self.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0],
+                'chunks': live,
+                'dim': self.dim,
+                'model': self.model,
+                'lists': 0 if self.centroids is None else len(self.centroids)
+            }
+
+    def close(self):
+        with self.lock:
+            if self.vectors is not None:
+                self.vectors.flush()
+            self.conn.close()
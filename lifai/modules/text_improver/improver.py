@@ -1,15 +1,15 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTextEdit,
                             QPushButton, QComboBox, QLabel, QFrame, QToolBar,
                             QProgressBar)
 from PyQt6.QtGui import QTextCharFormat, QFont, QColor, QTextCursor
 from PyQt6.QtCore import Qt
-from typing import Dict
+from typing import Dict, List
 from lifai.utils.ollama_client import OllamaClient
-from lifai.config.prompts import improvement_options, llm_prompts
+from lifai.config.prompts import prompt_registry, prompt_store
+from lifai.config.prompt_registry import PromptChange, apply_to_combo
+from lifai.config.prompt_store import CompiledPrompt
+from lifai.utils.token_budget import CHUNK, REFUSE, WARN, generate_within, get_token_budget
 from lifai.utils.logger_utils import get_module_logger
-from markdown import markdown
 
 logger = get_module_logger(__name__)
 
@@ -78,7 +78,8 @@ class TextImproverWindow(QWidget):
         # Improvement selection
         controls_layout.addWidget(QLabel("Select Prompts:"))
         self.improvement_dropdown = QComboBox()
-        self.improvement_dropdown.addItems(improvement_options)
+        self.prompts_version = prompt_registry.version
+        self.improvement_dropdown.addItems(prompt_registry.names())
         controls_layout.addWidget(self.improvement_dropdown)
         
         # Process button
@@ -169,23 +170,43 @@ class TextImproverWindow(QWidget):
             self.progress_bar.setValue(20)
             
             improvement = self.improvement_dropdown.currentText()
-            prompt = llm_prompts.get(improvement, "Please improve this text:")
-            prompt = prompt.format(text=text)
+            template = prompt_store.get(improvement) or CompiledPrompt('default', "Please improve this text:\n{text}")
+            model = self.settings['model'].get()
+
+            # Make sure the prompt and the expected reply fit the model's window
+            preflight = get_token_budget(self.ollama_client).check_template(template, text, model)
+            if preflight.action == REFUSE:
+                self.show_error(preflight.message)
+                self.status_label.setText("")
+                self.progress_bar.setValue(0)
+                return
+            if preflight.action in (WARN, CHUNK):
+                logger.warning(preflight.message)
+                self.status_label.setText(preflight.message)
             
             self.progress_bar.setValue(40)
             
-            improved_text = self.ollama_client.generate_response(
-                prompt=prompt,
-                model=self.settings['model'].get()
-            )
+            parts = preflight.chunks or [text]
+            results = []
+            for i, part in enumerate(parts):
+                result = generate_within(self.ollama_client, template.render(text=part), model, preflight)
+                if not result:
+                    results = []
+                    break
+                results.append(result)
+                self.progress_bar.setValue(40 + 40 * (i + 1) // len(parts))
+                self.repaint()
+            improved_text = '\n\n'.join(results)
             
             self.progress_bar.setValue(80)
             
             if improved_text:
                 # Convert markdown to HTML before displaying
+                from markdown import markdown
                 html_content = markdown(improved_text, extensions=['extra'])
                 self.output_text.setHtml(html_content)
-                self.status_label.setText("Text processed successfully!")
+                self.status_label.setText("Text processed successfully!" if len(parts) == 1
+                                          else f"Text processed successfully in {len(parts)} parts!")
                 self.progress_bar.setValue(100)
             else:
                 self.show_error("Failed to generate improved text")
@@ -202,20 +223,11 @@ class TextImproverWindow(QWidget):
         from PyQt6.QtWidgets import QMessageBox
         QMessageBox.critical(self, "Error", message)
 
-    def update_prompts(self, new_options):
-        """Update available improvement options"""
-        current = self.improvement_dropdown.currentText()
-        
-        # Update dropdown values
-        self.improvement_dropdown.clear()
-        self.improvement_dropdown.addItems(new_options)
-        
-        # Try to restore previous selection
-        index = self.improvement_dropdown.findText(current)
-        if index >= 0:
-            self.improvement_dropdown.setCurrentIndex(index)
-        
-        logger.info(f"Updated improver prompts: {len(new_options)} options available")
+    def update_prompts(self, changes: List[PromptChange]):
+        """Apply prompt library changes to the dropdown, keeping the selection"""
+        self.prompts_version = apply_to_combo(self.improvement_dropdown, changes,
+                                              prompt_registry.names(), self.prompts_version)
+        logger.info(f"Updated improver prompts: {self.improvement_dropdown.count()} options available")
 
     def show(self):
         """Show the window"""
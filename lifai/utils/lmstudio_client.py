@@ -1,10 +1,25 @@
 import requests
 import json
 import logging
+import threading
+import time
 
 class LMStudioClient:
+    # A failed model lookup is retried after this many seconds instead of being cached
+    MODEL_INFO_RETRY = 30
+
     def __init__(self, base_url="http://localhost:1234/v1"):
         self.base_url = base_url
+        self.model_info = {}
+        self.model_info_failures = {}       # model -> time of the last failed lookup
+        self._local = threading.local()
+
+    @property
+    def last_response_stats(self):
+        """
+        Token counts and timing of this thread's last generate_response call
+        """
+        return getattr(self._local, 'stats', None)
 
     def fetch_models(self):
         """
@@ -28,12 +43,66 @@ class LMStudioClient:
             logging.error(f"Error connecting to LM Studio: {e}")
             return ["LM Studio not running"]
 
+    def get_model_info(self, model):
+        """
+        Context window and architecture of a model from LM Studio's REST API, cached per model
+        """
+        if model in self.model_info:
+            return self.model_info[model]
+        if time.monotonic() - self.model_info_failures.get(model, -self.MODEL_INFO_RETRY) < self.MODEL_INFO_RETRY:
+            return {}
+        info = {}
+        try:
+            api_root = self.base_url.rsplit('/v1', 1)[0]
+            response = requests.get(f"{api_root}/api/v0/models/{model}", timeout=10)
+            if response.status_code == 200:
+                data = response.json()
+                info = {
+                    'context_length': data.get('loaded_context_length') or data.get('max_context_length'),
+                    'trained_context_length': data.get('max_context_length'),
+                    'architecture': data.get('arch'),
+                    # The loaded window is fixed by LM Studio, not per request
+                    'resizable': False
+                }
+        except Exception as e:
+            logging.error(f"Error fetching model info from LM Studio: {e}")
+        if info:
+            self.model_info[model] = info
+            self.model_info_failures.pop(model, None)
+        else:
+            # LM Studio may not be running yet or the model not downloaded; look again later
+            self.model_info_failures[model] = time.monotonic()
+        return info
+
+    def get_context_length(self, model):
+        """
+        Context window of a model (see get_model_info)
+        """
+        return self.get_model_info(model).get('context_length')
+
+    def embed(self, texts, model):
+        """
+        Embed a batch of texts with the OpenAI-compatible embeddings endpoint
+        """
+        response = requests.post(
+            f"{self.base_url}/embeddings",
+            json={"model": model, "input": texts},
+            timeout=120
+        )
+        response.raise_for_status()
+        data = sorted(response.json().get('data', []), key=lambda item: item.get('index', 0))
+        if len(data) != len(texts):
+            raise ValueError(f"Expected {len(texts)} embeddings, got {len(data)}")
+        return [item['embedding'] for item in data]
+
     def generate_response(self, prompt, model=None, temperature=0.7):
         """
         Generate a response using LM Studio's API
         """
+        self._local.stats = None
         try:
             messages = [{"role": "user", "content": prompt}]
+            start = time.perf_counter()
             response = requests.post(
                 f"{self.base_url}/chat/completions",
                 json={
@@ -44,6 +113,12 @@ class LMStudioClient:
             )
             response.raise_for_status()
             result = response.json()
+            usage = result.get('usage') or {}
+            self._local.stats = {
+                'prompt_tokens': usage.get('prompt_tokens'),
+                'completion_tokens': usage.get('completion_tokens'),
+                'total_seconds': time.perf_counter() - start
+            }
             
             # Extract the response text from the completion
             if 'choices' in result and len(result['choices']) > 0:
@@ -0,0 +1,162 @@
+import copy
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+# Attributes every LogRecord has; anything else was passed with ``extra=`` and is written as a field
+STANDARD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+SECRET_PATTERNS = (
+    re.compile(r"(?i)(['\"]?(?:authorization|x-api-key|api[_-]?key)['\"]?\s*[:=]\s*['\"]?)(?:bearer\s+)?[^'\"\s,}]+"),
+    re.compile(r'(?i)(bearer\s+)[A-Za-z0-9._~+/=-]+'),
+)
+
+def redact(text: str) -> str:
+    """Mask credentials (Authorization headers, bearer tokens, API keys) in log text"""
+    for pattern in SECRET_PATTERNS:
+        text = pattern.sub(r'\1[REDACTED]', text)
+    return text
+
+def redact_headers(headers) -> Dict[str, str]:
+    """Copy of HTTP headers that is safe to log"""
+    return {name: '[REDACTED]' if name.lower() in ('authorization', 'x-api-key', 'api-key', 'cookie') else value
+            for name, value in dict(headers).items()}
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, thread, message,
+    source location and any fields passed with ``extra=``"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': round(record.created, 6),
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': redact(record.getMessage()),
+            'where': f"{record.module}:{record.lineno}",
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in STANDARD_ATTRS and not key.startswith('_'):
+                entry[key] = value if isinstance(value, (int, float, str, bool, type(None))) else repr(value)
+        return json.dumps(entry, ensure_ascii=False)
+
+class SamplingFilter(logging.Filter):
+    """Rate-limits records below ``level`` per call site.
+
+    Each call site (logger and line) may log ``rate`` records per second
+    with bursts of ``burst``; beyond that only one record in
+    ``sample_every`` is kept. A kept record carries the number of records
+    dropped before it as ``sampled_out``.
+    """
+
+    def __init__(self, level: int = logging.INFO, rate: float = 20.0, burst: int = 100, sample_every: int = 100):
+        super().__init__()
+        self.level = level
+        self.rate = rate
+        self.burst = burst
+        self.sample_every = sample_every
+        self.sites = {}     # (logger, line) -> [tokens, last refill, dropped]
+        self.lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.level:
+            return True
+        now = time.monotonic()
+        key = (record.name, record.lineno)
+        with self.lock:
+            site = self.sites.get(key)
+            if site is None:
+                site = self.sites[key] = [float(self.burst), now, 0]
+            site[0] = min(self.burst, site[0] + (now - site[1]) * self.rate)
+            site[1] = now
+            if site[0] < 1 and (site[2] + 1) % self.sample_every:
+                site[2] += 1
+                return False
+            site[0] = max(site[0] - 1, 0)
+            dropped, site[2] = site[2], 0
+        if dropped:
+            record.sampled_out = dropped
+        return True
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.setFormatter(logging.Formatter())
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback now; arguments may change before the writer gets to them
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self.formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+def _gzip_rotator(source: str, dest: str):
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb', compresslevel=6) as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+class FileLogging:
+    """JSON-lines log files written by a background thread.
+
+    Callers only put records on a bounded queue (dropping, not blocking,
+    when it is full); a ``QueueListener`` thread formats them and writes
+    ``lifai.jsonl``, which is rotated by size into ``lifai.jsonl.1.gz``,
+    ``.2.gz`` and so on. Records below INFO are sampled per call site so
+    chatty debug logging can't flood the files.
+    """
+    QUEUE_SIZE = 10000
+
+    def __init__(self, directory: str, level: int = logging.DEBUG, max_bytes: int = 5 * 1024 * 1024,
+                 backup_count: int = 5, compress: bool = True, sampling: Optional[SamplingFilter] = None):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, 'lifai.jsonl')
+        self.file_handler = logging.handlers.RotatingFileHandler(
+            self.path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True
+        )
+        if compress:
+            self.file_handler.namer = lambda name: name + '.gz'
+            self.file_handler.rotator = _gzip_rotator
+        self.file_handler.setFormatter(JsonLinesFormatter())
+
+        self.queue = queue.Queue(self.QUEUE_SIZE)
+        self.handler = NonBlockingQueueHandler(self.queue)
+        self.handler.setLevel(level)
+        self.handler.addFilter(sampling or SamplingFilter())
+        self.listener = logging.handlers.QueueListener(self.queue, self.file_handler, respect_handler_level=False)
+
+    def start(self, logger: Optional[logging.Logger] = None) -> 'FileLogging':
+        (logger or logging.getLogger()).addHandler(self.handler)
+        self.listener.start()
+        return self
+
+    def stop(self, logger: Optional[logging.Logger] = None):
+        """Detach from the logger and write out what is still queued"""
+        (logger or logging.getLogger()).removeHandler(self.handler)
+        self.listener.stop()
+        self.file_handler.close()
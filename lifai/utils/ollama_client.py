@@ -1,16 +1,29 @@
 from typing import Optional, List
 import requests
 import logging
+import threading
+import time
 from lifai.utils.logger_utils import get_module_logger
 import json
 
 logger = get_module_logger(__name__)
 
 class OllamaClient:
+    # A failed model lookup is retried after this many seconds instead of being cached
+    MODEL_INFO_RETRY = 30
+
     def __init__(self, base_url: str = "http://localhost:11434"):
         self.base_url = base_url
+        self.model_info = {}
+        self.model_info_failures = {}       # model -> time of the last failed lookup
+        self._local = threading.local()
         logger.info(f"Initializing OllamaClient with base URL: {base_url}")
 
+    @property
+    def last_response_stats(self) -> Optional[dict]:
+        """Token counts and timings of this thread's last generate_response call"""
+        return getattr(self._local, 'stats', None)
+
     def fetch_models(self) -> List[str]:
         try:
             logger.debug("Fetching available models from Ollama")
@@ -26,24 +39,108 @@ class OllamaClient:
             logger.error(f"Error fetching models: {str(e)}")
             return []
 
-    def generate_response(self, prompt: str, model: str) -> Optional[str]:
+    def get_model_info(self, model: str) -> dict:
+        """Context window and tokenizer of a model from /api/show, cached per model.
+
+        ``context_length`` is the ``num_ctx`` set in the model's parameters
+        if there is one, else the trained context length. An empty dict
+        means the model couldn't be looked up.
+        """
+        if model in self.model_info:
+            return self.model_info[model]
+        if time.monotonic() - self.model_info_failures.get(model, -self.MODEL_INFO_RETRY) < self.MODEL_INFO_RETRY:
+            return {}
+        info = {}
+        try:
+            response = requests.post(f"{self.base_url}/api/show", json={"model": model}, timeout=10)
+            if response.status_code == 200:
+                show = response.json()
+                model_info = show.get('model_info', {})
+                trained = next((int(value) for key, value in model_info.items()
+                                if key.endswith('.context_length')), None)
+                num_ctx = None
+                for line in show.get('parameters', '').splitlines():
+                    parts = line.split()
+                    if len(parts) == 2 and parts[0] == 'num_ctx':
+                        num_ctx = int(parts[1])
+                info = {
+                    'context_length': num_ctx or trained,
+                    'trained_context_length': trained,
+                    'architecture': model_info.get('general.architecture'),
+                    'tokenizer': model_info.get('tokenizer.ggml.model'),
+                    'tokenizer_pre': model_info.get('tokenizer.ggml.pre'),
+                    'resizable': True
+                }
+            else:
+                logger.error(f"Failed to fetch model info. Status code: {response.status_code}")
+        except Exception as e:
+            logger.error(f"Error fetching model info: {str(e)}")
+        if info:
+            self.model_info[model] = info
+            self.model_info_failures.pop(model, None)
+        else:
+            # The backend may not be up yet or the model not pulled; look again later
+            self.model_info_failures[model] = time.monotonic()
+        return info
+
+    def get_context_length(self, model: str) -> Optional[int]:
+        """Context window of a model (see ``get_model_info``)"""
+        return self.get_model_info(model).get('context_length')
+
+    def embed(self, texts: List[str], model: str) -> List[List[float]]:
+        """Embed a batch of texts with /api/embed (one vector per text)"""
+        response = requests.post(
+            f"{self.base_url}/api/embed",
+            json={"model": model, "input": texts},
+            timeout=120
+        )
+        if response.status_code == 404:
+            # Servers before /api/embed only embed one prompt per request
+            return [self._embed_one(text, model) for text in texts]
+        response.raise_for_status()
+        embeddings = response.json().get('embeddings', [])
+        if len(embeddings) != len(texts):
+            raise ValueError(f"Expected {len(texts)} embeddings, got {len(embeddings)}")
+        return embeddings
+
+    def _embed_one(self, text: str, model: str) -> List[float]:
+        response = requests.post(
+            f"{self.base_url}/api/embeddings",
+            json={"model": model, "prompt": text},
+            timeout=120
+        )
+        response.raise_for_status()
+        return response.json()['embedding']
+
+    def generate_response(self, prompt: str, model: str, num_ctx: Optional[int] = None) -> Optional[str]:
+        self._local.stats = None
         try:
             logger.debug(f"Generating response using model: {model}")
             logger.debug(f"Prompt: {prompt[:100]}...")
 
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": prompt,
-                    "stream": False  # Get complete response at once
-                }
-            )
+            payload = {
+                "model": model,
+                "prompt": prompt,
+                "stream": False  # Get complete response at once
+            }
+            if num_ctx:
+                # Without this the server runs with its own default window
+                payload["options"] = {"num_ctx": num_ctx}
+            response = requests.post(f"{self.base_url}/api/generate", json=payload)
 
             if response.status_code == 200:
                 # Extract just the response text from the JSON response
                 response_json = response.json()
                 result = response_json.get('response', '')
+                # Durations are reported in nanoseconds
+                self._local.stats = {
+                    'prompt_tokens': response_json.get('prompt_eval_count'),
+                    'completion_tokens': response_json.get('eval_count'),
+                    'prompt_eval_seconds': response_json.get('prompt_eval_duration', 0) / 1e9,
+                    'generation_seconds': response_json.get('eval_duration', 0) / 1e9,
+                    'load_seconds': response_json.get('load_duration', 0) / 1e9,
+                    'total_seconds': response_json.get('total_duration', 0) / 1e9
+                }
                 
                 logger.info("Successfully generated response")
                 logger.debug(f"Response length: {len(result)} characters")
@@ -0,0 +1,340 @@
+import builtins
+import importlib.abc
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+from lifai.utils.logger_utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+# Profiler installed by ``run.py --profile-startup``; None in normal runs
+_active_profiler = None
+
+def get_profiler() -> Optional['StartupProfiler']:
+    """Return the active startup profiler, if any"""
+    return _active_profiler
+
+@contextmanager
+def profile_step(name: str):
+    """Time a startup step; a no-op unless startup profiling is active"""
+    profiler = _active_profiler
+    if profiler is None or profiler.finished:
+        yield
+        return
+    with profiler.step(name):
+        yield
+
+def _is_lifai_module(name: str) -> bool:
+    return name == '__main__' or name == 'lifai' or name.startswith('lifai.')
+
+class _TimedLoader(importlib.abc.Loader):
+    """Wraps a module loader to time the execution of the module body"""
+
+    def __init__(self, loader, profiler: 'StartupProfiler'):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        # Extension modules (PyQt6.QtCore...) are loaded and initialized here,
+        # so the timer starts before creation, not at exec_module
+        self._profiler._enter_import(spec.name)
+        try:
+            return self._loader.create_module(spec)
+        except BaseException:
+            self._profiler._exit_import(spec.name)
+            raise
+
+    def exec_module(self, module):
+        # Hand the module its real loader so resource lookups keep working
+        module.__loader__ = self._loader
+        if getattr(module, '__spec__', None) is not None:
+            module.__spec__.loader = self._loader
+        if not self._profiler._importing(module.__name__):
+            # Loaded without create_module, e.g. by a caller of exec_module alone
+            self._profiler._enter_import(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit_import(module.__name__)
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """Meta path finder that wraps the loader found by the other finders"""
+
+    def __init__(self, profiler: 'StartupProfiler'):
+        self.profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        if threading.get_ident() != self.profiler.main_thread:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader, self.profiler)
+                return spec
+        return None
+
+class StartupProfiler:
+    """Collects import, step, first-paint and blocking I/O timings at startup.
+
+    The report attributes every third-party import to the LifAi module that
+    triggered it, so slow startup can be traced back to our own code.
+    """
+
+    def __init__(self, output_dir: str = 'logs'):
+        self.output_dir = output_dir
+        self.start_time = time.perf_counter()
+        self.main_thread = threading.get_ident()
+        self.finished = False
+        self.first_paint_ms = None
+
+        self.imports: List[Dict] = []
+        self.steps: List[Dict] = []
+        self.io_events: List[Dict] = []
+
+        self._import_stack = []
+        self._step_depth = 0
+        self._finder = _ImportTimer(self)
+        self._originals = {}
+        self._paint_filter = None
+
+    @classmethod
+    def install(cls, output_dir: str = 'logs') -> 'StartupProfiler':
+        """Create the profiler and start recording imports and I/O"""
+        global _active_profiler
+        profiler = cls(output_dir)
+        sys.meta_path.insert(0, profiler._finder)
+        profiler._patch_io()
+        _active_profiler = profiler
+        return profiler
+
+    def _elapsed_ms(self, since: float = None) -> float:
+        return (time.perf_counter() - (self.start_time if since is None else since)) * 1000
+
+    # Imports
+
+    def _enter_import(self, name: str):
+        self._import_stack.append([name, time.perf_counter(), 0.0])
+
+    def _importing(self, name: str) -> bool:
+        return bool(self._import_stack) and self._import_stack[-1][0] == name
+
+    def _exit_import(self, name: str):
+        entry_name, start, child_time = self._import_stack.pop()
+        total = time.perf_counter() - start
+        if self._import_stack:
+            self._import_stack[-1][2] += total
+
+        # Attribute the import to the innermost LifAi module that is importing it
+        attributed_to = next(
+            (frame[0] for frame in reversed(self._import_stack) if _is_lifai_module(frame[0])),
+            '__main__'
+        )
+        parent = self._import_stack[-1][0] if self._import_stack else '__main__'
+        self.imports.append({
+            'module': entry_name,
+            'attributed_to': attributed_to,
+            'direct': _is_lifai_module(parent),
+            'cumulative_ms': round(total * 1000, 3),
+            'self_ms': round((total - child_time) * 1000, 3),
+            'start_ms': round((start - self.start_time) * 1000, 3)
+        })
+
+    # Steps
+
+    @contextmanager
+    def step(self, name: str):
+        start = time.perf_counter()
+        self._step_depth += 1
+        try:
+            yield
+        finally:
+            self._step_depth -= 1
+            self.steps.append({
+                'name': name,
+                'depth': self._step_depth,
+                'start_ms': round((start - self.start_time) * 1000, 3),
+                'duration_ms': round(self._elapsed_ms(start), 3)
+            })
+
+    # Blocking I/O
+
+    def _caller(self) -> str:
+        """Innermost LifAi frame that performed the I/O"""
+        frame = sys._getframe(2)
+        while frame is not None:
+            module = frame.f_globals.get('__name__', '')
+            if _is_lifai_module(module) and module != __name__:
+                return f"{module}:{frame.f_lineno}"
+            frame = frame.f_back
+        return 'unknown'
+
+    def _record_io(self, kind: str, target: str, start: float):
+        if threading.get_ident() != self.main_thread or self.finished:
+            return
+        self.io_events.append({
+            'kind': kind,
+            'target': target,
+            'caller': self._caller(),
+            'start_ms': round((start - self.start_time) * 1000, 3),
+            'duration_ms': round(self._elapsed_ms(start), 3)
+        })
+
+    def _patch_io(self):
+        profiler = self
+        self._originals = {
+            'connect': socket.socket.connect,
+            'getaddrinfo': socket.getaddrinfo,
+            'open': builtins.open
+        }
+        original_connect = self._originals['connect']
+        original_getaddrinfo = self._originals['getaddrinfo']
+        original_open = self._originals['open']
+
+        def connect(sock, address):
+            start = time.perf_counter()
+            try:
+                return original_connect(sock, address)
+            finally:
+                profiler._record_io('connect', str(address), start)
+
+        def getaddrinfo(host, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original_getaddrinfo(host, *args, **kwargs)
+            finally:
+                profiler._record_io('dns', str(host), start)
+
+        def open_file(file, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original_open(file, *args, **kwargs)
+            finally:
+                profiler._record_io('open', str(file), start)
+
+        socket.socket.connect = connect
+        socket.getaddrinfo = getaddrinfo
+        builtins.open = open_file
+
+    def _restore_io(self):
+        if self._originals:
+            socket.socket.connect = self._originals['connect']
+            socket.getaddrinfo = self._originals['getaddrinfo']
+            builtins.open = self._originals['open']
+            self._originals = {}
+
+    # First paint
+
+    def watch_first_paint(self, widget):
+        """Record the first paint of the given Qt widget and then finish"""
+        from PyQt6.QtCore import QObject, QEvent, QTimer
+
+        profiler = self
+
+        class _PaintFilter(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Type.Paint and profiler.first_paint_ms is None:
+                    profiler.first_paint_ms = round(profiler._elapsed_ms(), 3)
+                    obj.removeEventFilter(self)
+                    # Let the paint complete before writing the report
+                    QTimer.singleShot(0, profiler.finish)
+                return False
+
+        self._paint_filter = _PaintFilter()
+        widget.installEventFilter(self._paint_filter)
+
+    # Report
+
+    def build_report(self) -> Dict:
+        lifai_modules = {}
+        for entry in self.imports:
+            if _is_lifai_module(entry['module']):
+                lifai_modules.setdefault(entry['module'], {'self_ms': 0.0, 'triggered': []})
+                lifai_modules[entry['module']]['self_ms'] = entry['self_ms']
+
+        for entry in self.imports:
+            if entry['direct'] and not _is_lifai_module(entry['module']):
+                owner = lifai_modules.setdefault(entry['attributed_to'], {'self_ms': 0.0, 'triggered': []})
+                owner['triggered'].append({'module': entry['module'], 'cumulative_ms': entry['cumulative_ms']})
+
+        for owner in lifai_modules.values():
+            owner['triggered'].sort(key=lambda item: item['cumulative_ms'], reverse=True)
+            owner['imports_ms'] = round(sum(item['cumulative_ms'] for item in owner['triggered']), 3)
+
+        return {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': sys.platform,
+            'first_paint_ms': self.first_paint_ms,
+            'total_ms': round(self._elapsed_ms(), 3),
+            'steps': sorted(self.steps, key=lambda item: item['start_ms']),
+            'lifai_modules': lifai_modules,
+            'imports': self.imports,
+            'blocking_io': self.io_events
+        }
+
+    def format_summary(self, report: Dict, limit: int = 10) -> str:
+        lines = ["LifAi startup profile"]
+        first_paint = report['first_paint_ms']
+        lines.append(f"  Time to first paint: {first_paint:.1f} ms" if first_paint is not None
+                     else "  Time to first paint: not recorded")
+
+        lines.append("  Steps:")
+        for step in report['steps']:
+            indent = '  ' * step['depth']
+            lines.append(f"    {indent}{step['name']:<40} {step['duration_ms']:>9.1f} ms")
+
+        lines.append("  Import time by LifAi module (own body + imports it triggered):")
+        ranked = sorted(report['lifai_modules'].items(),
+                        key=lambda item: item[1]['self_ms'] + item[1]['imports_ms'], reverse=True)
+        for name, data in ranked[:limit]:
+            lines.append(f"    {name:<50} {data['self_ms']:>8.1f} ms + {data['imports_ms']:>8.1f} ms")
+            for item in data['triggered'][:3]:
+                lines.append(f"      -> {item['module']:<45} {item['cumulative_ms']:>8.1f} ms")
+
+        io_events = sorted(report['blocking_io'], key=lambda item: item['duration_ms'], reverse=True)
+        lines.append(f"  Blocking I/O on the main thread: {len(io_events)} calls, "
+                     f"{sum(item['duration_ms'] for item in io_events):.1f} ms")
+        for item in io_events[:limit]:
+            lines.append(f"    {item['kind']:<8} {item['target'][:50]:<50} {item['duration_ms']:>8.1f} ms  ({item['caller']})")
+        return '\n'.join(lines)
+
+    def finish(self) -> Dict:
+        """Stop recording and write the JSON report and text summary"""
+        global _active_profiler
+        if self.finished:
+            return {}
+        self.finished = True
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._restore_io()
+        if _active_profiler is self:
+            _active_profiler = None
+
+        report = self.build_report()
+        summary = self.format_summary(report)
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            base = os.path.join(self.output_dir, f'startup_profile_{timestamp}')
+            with open(f'{base}.json', 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            with open(f'{base}.txt', 'w', encoding='utf-8') as f:
+                f.write(summary + '\n')
+            logger.info(f"Startup profile written to {base}.json")
+        except Exception as e:
+            logger.error(f"Failed to write startup profile: {e}")
+
+        print(summary)
+        return report
@@ -0,0 +1,270 @@
+import re
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional
+from lifai.utils.logger_utils import get_module_logger
+
+logger = get_module_logger(__name__)
+
+OK = 'ok'
+WARN = 'warn'
+CHUNK = 'chunk'
+REFUSE = 'refuse'
+
+# Kana, CJK ideographs and Hangul
+CJK = r'\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff'
+# Kinds of text that tokenizers treat differently; each is counted with one C-level scan
+CJK_RE = re.compile(f'[{CJK}]+')
+WORD_RE = re.compile(f'[^\\W\\d_{CJK}]+')
+DIGITS_RE = re.compile(r'\d+')
+NEWLINES_RE = re.compile(r'\n+')
+SPACES_RE = re.compile(r'[^\S\n]{2,}')
+SYMBOL_RE = re.compile(r'[^\w\s]|_')
+
+@dataclass(frozen=True)
+class TokenizerProfile:
+    """Average token cost of each kind of text for a tokenizer family"""
+    chars_per_word_token: float = 4.0      # letters per token beyond a word's first token
+    digits_per_token: int = 3
+    tokens_per_cjk_char: float = 0.8
+
+# Byte-level BPE (GPT-2 style: Qwen, Llama 3, Mistral Nemo...) groups digits and
+# common CJK characters; SentencePiece models (Llama 2, Gemma, Mistral 7B)
+# split digits and fall back to bytes for many CJK characters
+TOKENIZER_PROFILES = {
+    'gpt2': TokenizerProfile(),
+    'llama': TokenizerProfile(chars_per_word_token=3.5, digits_per_token=1, tokens_per_cjk_char=1.3),
+}
+DEFAULT_PROFILE = TokenizerProfile(chars_per_word_token=3.5, digits_per_token=2, tokens_per_cjk_char=1.0)
+
+@lru_cache(maxsize=256)
+def _count(text: str, profile: TokenizerProfile) -> int:
+    words = WORD_RE.findall(text)
+    letters = sum(map(len, words))
+    digit_groups = DIGITS_RE.findall(text)
+    tokens = (
+        # A word's first few letters are one token, longer words take more
+        len(words) + max(letters - 4 * len(words), 0) / profile.chars_per_word_token
+        + len(digit_groups) + max(sum(map(len, digit_groups)) - len(digit_groups), 0) / profile.digits_per_token
+        + sum(map(len, CJK_RE.findall(text))) * profile.tokens_per_cjk_char
+        + len(NEWLINES_RE.findall(text))
+        # Single spaces merge into the following word
+        + len(SPACES_RE.findall(text))
+        + len(SYMBOL_RE.findall(text))
+    )
+    return int(tokens) + 1
+
+@dataclass
+class Preflight:
+    """Outcome of a pre-flight check.
+
+    ``action`` is ``ok``, ``warn`` (fits, but close to the limit), ``chunk``
+    (send ``chunks`` of the text one at a time) or ``refuse``. Requests
+    should be sent with ``context_length`` as the window where the backend
+    allows it.
+    """
+    action: str
+    prompt_tokens: int
+    output_tokens: int
+    context_length: int
+    message: str = ''
+    chunks: List[str] = field(default_factory=list)
+
+class TokenBudget:
+    """Checks that a prompt and its expected reply fit the model before sending.
+
+    Model metadata (context length, tokenizer family) comes from the
+    client's ``get_model_info`` and is cached by the client. Token counts
+    are estimated per kind of text (words, digits, CJK, punctuation) with a
+    profile for the model's tokenizer family, cached per text, and scaled
+    by a per-model correction learned from the prompt token counts the
+    backend reports (``observe``).
+
+    Ollama lets each request choose its window, so the window is sized to
+    the request: at least ``DEFAULT_CONTEXT_LENGTH``, up to the model's
+    limit or ``MAX_CONTEXT_LENGTH``. Ollama reloads the model whenever the
+    window changes, so the window per model only grows: requests reuse the
+    largest one sent so far (``use_window``) and short and long requests
+    can alternate without a reload each. Text that doesn't fit is split
+    into chunks on paragraph and sentence boundaries.
+    """
+    DEFAULT_CONTEXT_LENGTH = 4096
+    # Larger windows make every request slower; longer input is chunked instead
+    MAX_CONTEXT_LENGTH = 16384
+    WARN_RATIO = 0.9
+    # Estimates are approximate until the model has been calibrated
+    SAFETY_MARGIN = 1.1
+    MAX_CHUNKS = 20
+    MIN_OUTPUT_TOKENS = 128
+
+    def __init__(self, client):
+        self.client = client
+        self.corrections: Dict[str, float] = {}
+        self.windows: Dict[str, int] = {}       # model -> largest window sent so far
+        self.lock = threading.Lock()
+
+    def model_info(self, model: str) -> Dict:
+        if hasattr(self.client, 'get_model_info'):
+            return self.client.get_model_info(model) or {}
+        return {'context_length': self.client.get_context_length(model)}
+
+    def profile(self, model: str) -> TokenizerProfile:
+        return TOKENIZER_PROFILES.get(self.model_info(model).get('tokenizer'), DEFAULT_PROFILE)
+
+    def count(self, text: str, model: str) -> int:
+        """Estimated tokens of ``text`` for ``model``"""
+        if not text:
+            return 0
+        correction = self.corrections.get(model)
+        tokens = _count(text, self.profile(model))
+        return int(tokens * correction) if correction else int(tokens * self.SAFETY_MARGIN)
+
+    def observe(self, model: str, prompt: str, stats: Optional[Dict]):
+        """Learn from the prompt token count the backend reported for ``prompt``"""
+        actual = (stats or {}).get('prompt_tokens')
+        if not actual or actual < 64:
+            return
+        ratio = actual / _count(prompt, self.profile(model))
+        if not 0.5 <= ratio <= 2.0:
+            # Prompt caching or a template we don't see; not a tokenizer signal
+            return
+        with self.lock:
+            previous = self.corrections.get(model)
+            self.corrections[model] = ratio if previous is None else previous * 0.7 + ratio * 0.3
+        logger.debug(f"Token estimate correction for {model}: {self.corrections[model]:.2f}")
+
+    def limit(self, model: str) -> int:
+        """The largest window a request to ``model`` may use"""
+        info = self.model_info(model)
+        model_context = info.get('context_length') or self.DEFAULT_CONTEXT_LENGTH
+        if not info.get('resizable'):
+            return model_context
+        return min(model_context, self.MAX_CONTEXT_LENGTH)
+
+    def window(self, model: str, needed: int) -> int:
+        """Window for a request needing ``needed`` tokens: a power of two between the default and the limit"""
+        limit = self.limit(model)
+        if not self.model_info(model).get('resizable'):
+            return limit
+        size = max(self.DEFAULT_CONTEXT_LENGTH, self.windows.get(model, 0))
+        while size < needed and size < limit:
+            size *= 2
+        return min(size, limit)
+
+    def use_window(self, model: str, size: Optional[int]) -> int:
+        """The window to send for a request sized for ``size``: never smaller than
+        one already sent for ``model``, so the backend doesn't reload it"""
+        limit = self.limit(model)
+        with self.lock:
+            size = min(max(size or 0, self.windows.get(model, 0)), limit) or None
+            if size:
+                self.windows[model] = size
+            return size
+
+    def check(self, prompt: str, model: str, output_tokens: Optional[int] = None) -> Preflight:
+        """Check a fully rendered prompt (no chunking possible)"""
+        prompt_tokens = self.count(prompt, model)
+        output_tokens = output_tokens if output_tokens is not None else self.MIN_OUTPUT_TOKENS
+        needed = prompt_tokens + output_tokens
+        limit = self.limit(model)
+        context_length = self.window(model, needed)
+        if needed > limit:
+            return Preflight(REFUSE, prompt_tokens, output_tokens, context_length,
+                             f"The prompt is about {prompt_tokens:,} tokens plus {output_tokens:,} for the reply, "
+                             f"but {model} can use at most {limit:,}")
+        if needed > limit * self.WARN_RATIO:
+            return Preflight(WARN, prompt_tokens, output_tokens, context_length,
+                             f"The prompt uses {needed:,} of {limit:,} tokens; the reply may be cut short")
+        return Preflight(OK, prompt_tokens, output_tokens, context_length)
+
+    def check_template(self, template, text: str, model: str, output_ratio: float = 1.2) -> Preflight:
+        """Check ``template`` (a CompiledPrompt) applied to ``text``.
+
+        The reply is expected to be about ``output_ratio`` times the text,
+        as for rewrites and translations. Text that doesn't fit is chunked.
+        """
+        text_tokens = self.count(text, model)
+        output_tokens = max(int(text_tokens * output_ratio), self.MIN_OUTPUT_TOKENS)
+        overhead = self.count(template.render(text=''), model)
+        prompt_tokens = overhead + text_tokens
+        needed = prompt_tokens + output_tokens
+        limit = self.limit(model)
+        context_length = self.window(model, needed)
+        if needed <= limit * self.WARN_RATIO:
+            return Preflight(OK, prompt_tokens, output_tokens, context_length)
+        if needed <= limit:
+            return Preflight(WARN, prompt_tokens, output_tokens, context_length,
+                             f"The request uses {needed:,} of {limit:,} tokens; the reply may be cut short")
+
+        # Each chunk and its reply have to fit next to the template
+        chunk_budget = int((limit * self.WARN_RATIO - overhead - self.MIN_OUTPUT_TOKENS) / (1 + output_ratio))
+        chunks = []
+        if chunk_budget > 50 and text_tokens <= chunk_budget * self.MAX_CHUNKS:
+            chunks = split_text(text, chunk_budget, lambda piece: self.count(piece, model))
+        if not chunks or len(chunks) > self.MAX_CHUNKS:
+            return Preflight(REFUSE, prompt_tokens, output_tokens, limit,
+                             f"The text is about {text_tokens:,} tokens, too long for {model} "
+                             f"(at most {limit:,} tokens per request, {self.MAX_CHUNKS} parts)")
+        return Preflight(CHUNK, prompt_tokens, output_tokens, limit,
+                         f"The text is too long for one request and will be processed in {len(chunks)} parts",
+                         chunks)
+
+def split_text(text: str, max_tokens: int, count) -> List[str]:
+    """Split ``text`` into pieces of at most ``max_tokens``, preferring paragraph,
+    then sentence, then word boundaries. Separators stay with the text before
+    them, so joining the pieces gives back the text."""
+    boundaries = [r'(?<=\n)\s*\n', r'(?<=[.!?\u3002\uff01\uff1f])\s+', r'\s+']
+
+    def pieces(block: str, level: int) -> List[str]:
+        if count(block) <= max_tokens:
+            return [block]
+        if level == len(boundaries):
+            # A single huge "word" (e.g. base64); fall back to characters
+            size = max(max_tokens * 2, 1)
+            return [block[i:i + size] for i in range(0, len(block), size)]
+        ends = [match.end() for match in re.finditer(boundaries[level], block) if match.end() < len(block)]
+        if not ends:
+            return pieces(block, level + 1)
+        result = []
+        for start, end in zip([0] + ends, ends + [len(block)]):
+            result.extend(pieces(block[start:end], level + 1))
+        return result
+
+    chunks = []
+    current = ''
+    current_tokens = 0
+    for piece in pieces(text.strip(), 0):
+        # Counts are close enough to additive to pack pieces without recounting the chunk
+        piece_tokens = count(piece)
+        if current and current_tokens + piece_tokens > max_tokens:
+            chunks.append(current.strip())
+            current, current_tokens = piece, piece_tokens
+        else:
+            current += piece
+            current_tokens += piece_tokens
+    if current.strip():
+        chunks.append(current.strip())
+    return chunks
+
+_budgets: Dict[int, TokenBudget] = {}
+_budgets_lock = threading.Lock()
+
+def get_token_budget(client) -> TokenBudget:
+    """The shared TokenBudget of a backend client"""
+    with _budgets_lock:
+        budget = _budgets.get(id(client))
+        if budget is None or budget.client is not client:
+            budget = _budgets[id(client)] = TokenBudget(client)
+        return budget
+
+def generate_within(client, prompt: str, model: str, preflight: Preflight) -> Optional[str]:
+    """Generate with the window chosen by the pre-flight check, and learn from the reply's token count"""
+    budget = get_token_budget(client)
+    if budget.model_info(model).get('resizable'):
+        response = client.generate_response(prompt=prompt, model=model,
+                                            num_ctx=budget.use_window(model, preflight.context_length))
+    else:
+        response = client.generate_response(prompt=prompt, model=model)
+    budget.observe(model, prompt, getattr(client, 'last_response_stats', None))
+    return response
@@ -2,11 +2,19 @@
 import os
 import sys
 import ctypes
+import multiprocessing
 
 # Add project root to Python path
 project_root = os.path.abspath(os.path.dirname(__file__))
 sys.path.append(project_root)
 
+# Optional startup profiling: must be installed before the heavy imports below
+profiler = None
+if '--profile-startup' in sys.argv:
+    sys.argv.remove('--profile-startup')
+    from lifai.utils.startup_profiler import StartupProfiler
+    profiler = StartupProfiler.install(os.path.join(project_root, 'logs'))
+
 # Set DPI awareness before creating QApplication
 if sys.platform == 'win32':
     try:
@@ -19,22 +27,34 @@ if sys.platform == 'win32':
         except Exception as e:
             print(f"Failed to set DPI awareness: {e}")
 
+from lifai.utils.startup_profiler import profile_step
+
 # Initialize QApplication before importing any QWidgets
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import Qt
+with profile_step('import PyQt6'):
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import Qt
 
-# Create QApplication with appropriate DPI scaling
-qt_app = QApplication.instance()
-if not qt_app:
-    qt_app = QApplication(sys.argv)
-    # In PyQt6, high DPI scaling is enabled by default
-    # We can adjust the scaling policy if needed
-    QApplication.setHighDpiScaleFactorRoundingPolicy(
-        Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
-    )
+if __name__ == "__main__":
+    # Worker processes (e.g. PDF extraction) re-import this file on Windows;
+    # only the main process creates the application
+    multiprocessing.freeze_support()
 
-from lifai.core.app_hub import LifAiHub
+    # Create QApplication with appropriate DPI scaling
+    with profile_step('QApplication'):
+        qt_app = QApplication.instance()
+        if not qt_app:
+            # In PyQt6, high DPI scaling is enabled by default
+            # We can adjust the scaling policy if needed
+            QApplication.setHighDpiScaleFactorRoundingPolicy(
+                Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
+            )
+            qt_app = QApplication(sys.argv)
 
-if __name__ == "__main__":
-    app = LifAiHub()
-    app.run() 
\ No newline at end of file
+    with profile_step('import lifai.core.app_hub'):
+        from lifai.core.app_hub import LifAiHub
+
+    with profile_step('LifAiHub()'):
+        app = LifAiHub()
+    if profiler:
+        profiler.watch_first_paint(app)
+    sys.exit(app.run())
@@ -0,0 +1,24 @@
+from lifai.modules.agent_workspace.page_fetcher import MainTextParser
+
+ARTICLE = "Real article text that is long enough to count as a block of prose. " * 10
+
+def extract(html: str) -> MainTextParser:
+    parser = MainTextParser()
+    parser.feed(html)
+    parser.close()
+    return parser
+
+def test_unclosed_li_in_nav_does_not_swallow_page():
+    parser = extract(f"<nav><ul><li>Home<li>About</ul></nav><main><p>{ARTICLE}</p></main>")
+    assert parser.skip_depth == 0
+    assert parser.text(10000) == ARTICLE.strip()
+
+def test_unclosed_option_in_select_does_not_swallow_page():
+    parser = extract(f"<form><select><option>One<option>Two</select></form><article><p>{ARTICLE}</p></article>")
+    assert parser.skip_depth == 0
+    assert parser.text(10000) == ARTICLE.strip()
+
+def test_nested_skip_containers_are_balanced():
+    parser = extract(f"<header><nav>Menu<header>Inner</header> still skipped</nav></header><p>{ARTICLE}</p>")
+    assert "skipped" not in parser.text(10000)
+    assert ARTICLE.strip() in parser.text(10000)